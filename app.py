@@ -1,10 +1,29 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+import os
+from dataclasses import replace
+from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
 
+from core.rotacion import calcular_rotacion
+from core.cache import CacheCompartido
+from core.series import SeriesDiarias
+from core.datos import Datasets
+from core.esquema import dimension_tiendas
+from core.filtros import ClaveFiltros
+from core.precarga import Precargador, claves_vecinas
+from core.graficos import reducir_serie, reducir_series, usar_webgl
+from core.fuentes import fuente_desde_entorno
+from core.motores import motor_desde_entorno
+from core.tablas import ordenar_pagina, total_paginas
+from core.vistas import PRODUCTOS_POR_PAGINA, matriz_con_total, ranking_productos, resumen_productos, resumen_tiendas
+from ui.detalle import render_busqueda_codigos, render_tabla_producto
+from ui.exportacion import boton_descarga
+from ui.filtros import render_filtros, render_periodo
+from ui.perfil import cerrar_ejecucion, detener, iniciar_ejecucion, render_panel_perfil, tramo
+from ui.tablas import tabla_paginada
+
 # ============= CONFIGURACIÓN DE PÁGINA =============
 st.set_page_config(
     page_title="Dashboard de Ventas",
@@ -14,171 +33,137 @@ st.set_page_config(
 )
 st.sidebar.title("Filtros")
 st.sidebar.divider()
-st.sidebar.write("Aca van los filtros, por ahora estan desactivados para seguir probando")
-
-st.sidebar.checkbox("Filtro por fecha")
-st.sidebar.checkbox("filtro por categoria")
-st.sidebar.checkbox("Filtro por tienda")
-st.sidebar.checkbox("Filtro por producto")
-
-
-# ============= SIMULACIÓN DE RESPUESTA DEL BACKEND =============
-def get_sales_data(filters):
-    """
-    Simula la respuesta de tu backend con fact_daily_sales
-    """
-    np.random.seed(42)
-    
-    fecha_inicio = datetime.strptime(filters["dates"]["fecha_inicio"], "%Y-%m-%d")
-    fecha_fin = datetime.strptime(filters["dates"]["fecha_fin"], "%Y-%m-%d")
-    
-    productos = filters["products"] if filters["products"] else [
-        "BOLSO EPONA - NAVY/PURPLE - UNICA",
-        "BOLSO EPONA - BLACK/GOLD - UNICA",
-        "CARTERA MINIMAL - BLACK - S",
-        "CARTERA MINIMAL - BLACK - M",
-        "MOCHILA URBAN - GREY - UNICA"
-    ]
-    
-    tiendas = filters["stores"] if filters["stores"] else [101, 201, 301]
-    
-    data = []
-    for producto in productos:
-        for tienda in tiendas:
-            dias = (fecha_fin - fecha_inicio).days + 1
-            for i in range(dias):
-                fecha = fecha_inicio + timedelta(days=i)
-                
-                if np.random.random() > 0.25:
-                    multiplicador = np.random.uniform(0.7, 1.5)
-                    ventas = int(np.random.randint(500, 4000) * multiplicador)
-                    transacciones = int(np.random.randint(2, 30) * multiplicador)
-                    
-                    data.append({
-                        "fecha": fecha.strftime("%Y-%m-%d"),
-                        "producto": producto,
-                        "tienda_id": tienda,
-                        "tienda_nombre": f"Tienda {tienda}",
-                        "ventas": ventas,
-                        "transacciones": transacciones
-                    })
-    
-    return pd.DataFrame(data)
 
 
-def get_inventory_data(filters):
+def render_metricas_cache():
     """
-    Simula la respuesta del backend con datos de inventario actual
+    Uso de los caches de datos, para dimensionar TTL y número de entradas
     """
-    np.random.seed(123)
-    
-    productos = filters["products"] if filters["products"] else [
-        "BOLSO EPONA - NAVY/PURPLE - UNICA",
-        "BOLSO EPONA - BLACK/GOLD - UNICA",
-        "CARTERA MINIMAL - BLACK - S",
-        "CARTERA MINIMAL - BLACK - M",
-        "MOCHILA URBAN - GREY - UNICA"
-    ]
-    
-    tiendas = filters["stores"] if filters["stores"] else [101, 201, 301]
-    
-    data = []
-    for producto in productos:
-        for tienda in tiendas:
-            # Stock actual (algunas tiendas con bajo stock)
-            stock_actual = np.random.randint(0, 50)
-            
-            # Stock mínimo recomendado (varía por producto)
-            stock_minimo = np.random.randint(10, 20)
-            
-            # Stock máximo (capacidad de almacenamiento)
-            stock_maximo = np.random.randint(40, 80)
-            
-            # Costo unitario
-            costo_unitario = np.random.randint(50, 200)
-            
-            data.append({
-                "producto": producto,
-                "tienda_id": tienda,
-                "tienda_nombre": f"Tienda {tienda}",
-                "stock_actual": stock_actual,
-                "stock_minimo": stock_minimo,
-                "stock_maximo": stock_maximo,
-                "costo_unitario": costo_unitario,
-                "valor_inventario": stock_actual * costo_unitario
-            })
-    
-    return pd.DataFrame(data)
+    with st.sidebar.expander("🗄️ Cache de datos", expanded=False):
+        df_cache = pd.DataFrame(
+            [{"cache": nombre, **cache.estadisticas()} for nombre, cache in get_caches().items()]
+        )
+        df_cache["MB"] = (df_cache.pop("bytes") / 1e6).round(2)
+        st.dataframe(
+            df_cache[["cache", "entradas", "max_entradas", "MB", "aciertos", "fallos",
+                      "tasa_aciertos", "expiradas", "desalojadas", "dias_descargados", "esperas", "lecturas_disco"]],
+            hide_index=True,
+            column_config={"tasa_aciertos": st.column_config.NumberColumn("tasa aciertos", format="percent")}
+        )
+        precarga = get_precargador().estadisticas()
+        st.caption(
+            f"Precarga: {precarga['completadas']} completadas, {precarga['pendientes']} pendientes, "
+            f"{precarga['descartadas']} descartadas, {precarga['errores']} con error"
+        )
+        st.caption(f"Motor de agregación: {get_motor().nombre}")
 
 
-# ============= FUNCIONES DE ANÁLISIS DE ROTACIÓN =============
-def calcular_rotacion(df_ventas, df_inventario, dias_periodo):
+# ============= CARGAR DATOS UNA SOLA VEZ =============
+# Límites de los caches: cada combinación de filtros retiene DataFrames completos
+CACHE_TTL_SEGUNDOS = 15 * 60
+CACHE_MAX_ENTRADAS = 16
+# Resultados derivados (rotación, matriz, tablas por variante) compartidos entre sesiones
+CACHE_DERIVADOS_MAX_ENTRADAS = 1024
+CACHE_DERIVADOS_MAX_BYTES = 512 * 1024 ** 2
+# Si está definido, los derivados también se guardan en Parquet en este directorio
+CACHE_DERIVADOS_DIRECTORIO = os.environ.get("DASHBOARD_CACHE_DIR")
+
+
+@st.cache_resource
+def get_fuente():
+    # Una fuente (y su pool de conexiones) por proceso, compartida entre sesiones
+    return fuente_desde_entorno()
+
+@st.cache_resource
+def get_motor():
+    # Motor de las agregaciones del cubo (DASHBOARD_MOTOR; pandas si no hay otro)
+    return motor_desde_entorno()
+
+@st.cache_resource
+def get_datasets():
+    # Ventas e inventario con sus caches de proceso; usable desde hilos
+    return Datasets(get_fuente(), max_entradas=CACHE_MAX_ENTRADAS, ttl=CACHE_TTL_SEGUNDOS)
+
+@st.cache_resource
+def get_caches():
+    # Caches de proceso para los datasets crudos y los derivados, con métricas de uso
+    return {
+        **get_datasets().caches,
+        "derivados": CacheCompartido(
+            max_entradas=CACHE_DERIVADOS_MAX_ENTRADAS,
+            ttl=CACHE_TTL_SEGUNDOS,
+            max_bytes=CACHE_DERIVADOS_MAX_BYTES,
+            directorio=CACHE_DERIVADOS_DIRECTORIO
+        ),
+    }
+
+@st.cache_resource
+def get_precargador():
+    # Calienta en segundo plano los filtros vecinos de los que se están viendo
+    datasets = get_datasets()
+    return Precargador(datasets.precargar, en_cache=datasets.precargada)
+
+def load_data(clave):
+    return get_datasets().ventas(clave)
+
+def esperar_inventario():
     """
-    Calcula métricas de rotación de inventario
+    Inventario de la carga en curso, o None (con aviso) si no llegó a tiempo o
+    falló: la sección se dibuja sin las partes que lo necesitan
     """
-    # Unidades vendidas por producto y tienda
-    df_unidades = df_ventas.groupby(['producto', 'tienda_nombre'])['transacciones'].sum().reset_index()
-    df_unidades.rename(columns={'transacciones': 'unidades_vendidas'}, inplace=True)
-    
-    # Merge con inventario
-    df_rotacion = df_inventario.merge(
-        df_unidades,
-        on=['producto', 'tienda_nombre'],
-        how='left'
-    )
-    
-    df_rotacion['unidades_vendidas'] = df_rotacion['unidades_vendidas'].fillna(0)
-    
-    # Calcular métricas
-    df_rotacion['venta_diaria_promedio'] = (df_rotacion['unidades_vendidas'] / dias_periodo).round(2)
-    
-    # Días de inventario = stock_actual / venta_diaria_promedio
-    df_rotacion['dias_inventario'] = df_rotacion.apply(
-        lambda row: round(row['stock_actual'] / row['venta_diaria_promedio'], 1) 
-        if row['venta_diaria_promedio'] > 0 else 999,
-        axis=1
-    )
-    
-    # Rotación (veces que se vende el inventario en el periodo)
-    df_rotacion['indice_rotacion'] = df_rotacion.apply(
-        lambda row: round(row['unidades_vendidas'] / row['stock_actual'], 2) 
-        if row['stock_actual'] > 0 else 0,
-        axis=1
-    )
-    
-    # Nivel de stock
-    def clasificar_stock(row):
-        if row['stock_actual'] == 0:
-            return "SIN STOCK"
-        elif row['stock_actual'] < row['stock_minimo']:
-            return "CRÍTICO"
-        elif row['stock_actual'] >= row['stock_maximo']:
-            return "EXCESO"
-        else:
-            return "NORMAL"
-    
-    df_rotacion['nivel_stock'] = df_rotacion.apply(clasificar_stock, axis=1)
-    
-    # Cantidad a reponer
-    df_rotacion['cantidad_reponer'] = df_rotacion.apply(
-        lambda row: max(0, row['stock_maximo'] - row['stock_actual']) 
-        if row['nivel_stock'] in ['SIN STOCK', 'CRÍTICO'] else 0,
-        axis=1
+    datasets = get_datasets()
+    try:
+        datasets.esperar(cargas, "inventario")
+        return load_filtrado("inventario", clave_cargada, clave_filtros)
+    except TimeoutError:
+        st.warning(
+            f"⏳ El inventario no respondió en {datasets.timeouts['inventario']:.0f}s. "
+            "Se muestra lo disponible; se completará al recargar"
+        )
+    except Exception as error:
+        st.warning(f"⚠️ No se pudo cargar el inventario: {error}")
+    return None
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRADAS, ttl=CACHE_TTL_SEGUNDOS)
+def get_series(clave_sin_fechas):
+    # Acumulados diarios de una selección de tiendas y productos, para cualquier rango de fechas
+    return SeriesDiarias(get_motor())
+
+def load_indexado(nombre, clave_cargada):
+    # Dataset cargado con sus bitmaps por día, categoría, tienda y producto, en la
+    # misma entrada del cache de Datasets: índice y filas nunca son de cargas distintas
+    return get_datasets().indexado(nombre, clave_cargada)
+
+def load_filtrado(nombre, clave_cargada, clave):
+    # Los filtros de la barra lateral se resuelven sobre lo cargado, sin volver a la fuente
+    return load_indexado(nombre, clave_cargada).filtrar(clave)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRADAS, ttl=CACHE_TTL_SEGUNDOS)
+def load_nombres_tienda(clave_cargada):
+    dim = dimension_tiendas(load_data(clave_cargada))
+    return dict(zip(dim["tienda_id"].tolist(), dim["tienda_nombre"].tolist()))
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRADAS, ttl=CACHE_TTL_SEGUNDOS)
+def load_cubo(clave_cargada, clave):
+    # Las series cubren todo el periodo cargado: cambiar el rango sale de los acumulados
+    series = get_series(clave.sin_fechas())
+    periodo = replace(clave, fecha_inicio=clave_cargada.fecha_inicio, fecha_fin=clave_cargada.fecha_fin)
+    series.cubrir(
+        clave.fecha_inicio, clave.fecha_fin,
+        lambda: (load_filtrado("ventas", clave_cargada, periodo), periodo.fecha_inicio, periodo.fecha_fin)
     )
-    
-    df_rotacion['costo_reposicion'] = df_rotacion['cantidad_reponer'] * df_rotacion['costo_unitario']
-    
-    return df_rotacion
+    return series.cubo(clave.fecha_inicio, clave.fecha_fin)
 
+@st.cache_resource(max_entries=CACHE_MAX_ENTRADAS, ttl=CACHE_TTL_SEGUNDOS)
+def load_resumen_productos(clave_cargada, clave):
+    # Ranking + tendencia de todos los productos en una pasada, para el detalle
+    return resumen_productos(load_cubo(clave_cargada, clave))
 
-# ============= CARGAR DATOS UNA SOLA VEZ =============
-@st.cache_data
-def load_data(filtros):
-    return get_sales_data(filtros)
-
-@st.cache_data
-def load_inventory(filtros):
-    return get_inventory_data(filtros)
+def load_rotacion(clave_cargada, clave, dias_periodo, df_inventario):
+    # Por contenido: filtros distintos con los mismos datos comparten el resultado
+    return get_caches()["derivados"].derivar(
+        "rotacion", calcular_rotacion, load_cubo(clave_cargada, clave).por_producto_tienda, df_inventario, dias_periodo
+    )
 
 
 # ============= FILTROS =============
@@ -195,44 +180,60 @@ filtros = {
     "categories": []
 }
 
+# Medición del rerun: tramos con nombre, memoria y aciertos de los caches
+iniciar_ejecucion(get_caches())
+
+# El rango de fechas decide el periodo cargado; un rango fuera de él lo reemplaza
+with tramo("periodo"):
+    filtros, periodo = render_periodo(filtros)
+clave_cargada = ClaveFiltros.desde_dict({**filtros, "dates": periodo})
+clave_rango = replace(clave_cargada, **filtros["dates"])
+
 # Cargar datos
-with st.spinner("Cargando datos..."):
-    df_raw = load_data(filtros)
-    df_inventory = load_inventory(filtros)
+with st.spinner("Cargando datos..."), tramo("carga"), get_precargador().primer_plano():
+    # Ventas e inventario se piden en paralelo; solo las ventas bloquean el dibujo
+    cargas = get_datasets().cargar(["ventas", "inventario"], clave_cargada)
+    with tramo("ventas"):
+        try:
+            get_datasets().esperar(cargas, "ventas")
+        except TimeoutError:
+            st.error("⏳ Las ventas no respondieron a tiempo. Reintenta en unos segundos")
+            detener()
+    # Una sola entrada del cache en todo el rerun: conteos y filas salen del mismo df
+    ventas_cargadas = load_indexado("ventas", clave_cargada)
+
+# Los filtros de la barra lateral activados acotan lo cargado con el índice de bitmaps
+with tramo("filtros"):
+    filtros, registros_filtrados = render_filtros(
+        filtros, ventas_cargadas.indice, load_nombres_tienda(clave_cargada)
+    )
+if registros_filtrados == 0:
+    st.warning("No se encontraron datos para los filtros seleccionados")
+    detener()
+
+clave_filtros = ClaveFiltros.desde_dict(filtros)
+with tramo("filtrar"):
+    df_raw = ventas_cargadas.filtrar(clave_filtros)
+with tramo("cubo"):
+    cubo = load_cubo(clave_cargada, clave_filtros)
 
 if df_raw.empty:
     st.warning("No se encontraron datos para los filtros seleccionados")
-    st.stop()
+    detener()
 
 # Calcular días del periodo
 fecha_inicio = datetime.strptime(filtros["dates"]["fecha_inicio"], "%Y-%m-%d")
 fecha_fin = datetime.strptime(filtros["dates"]["fecha_fin"], "%Y-%m-%d")
 dias_periodo = (fecha_fin - fecha_inicio).days + 1
 
-# Calcular rotación
-df_rotacion = calcular_rotacion(df_raw, df_inventory, dias_periodo)
-
 # Calcular métricas globales
-total_ventas = df_raw['ventas'].sum()
-total_transacciones = df_raw['transacciones'].sum()
+total_ventas = cubo.total_ventas
+total_transacciones = cubo.total_transacciones
 ticket_promedio = total_ventas / total_transacciones if total_transacciones > 0 else 0
 
 
-# ============= NAVEGACIÓN =============
-st.title("📊 Dashboard de Ventas e Inventario")
-
-# Crear tabs para navegación
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📈 Resumen General",
-    "🔍 Análisis Detallado",
-    "📊 Comparativas",
-    "📦 Inventario y Rotación",
-    "💾 Datos Crudos"
-])
-
-
 # ============= TAB 1: RESUMEN GENERAL =============
-with tab1:
+def render_resumen():
     st.header("Resumen General")
     
     # Mostrar filtros activos
@@ -264,30 +265,23 @@ with tab1:
     # Ranking de productos
     st.subheader("🏆 Ranking de Productos")
     
-    df_productos = df_raw.groupby("producto").agg({
-        "ventas": "sum",
-        "transacciones": "sum"
-    }).reset_index()
-    
-    df_productos['ticket_promedio'] = (df_productos['ventas'] / df_productos['transacciones']).round(2)
-    df_productos['porcentaje'] = (df_productos['ventas'] / total_ventas * 100).round(1)
-    df_productos = df_productos.sort_values("ventas", ascending=False)
-    df_productos['ranking'] = range(1, len(df_productos) + 1)
-    df_productos = df_productos[['ranking', 'producto', 'ventas', 'transacciones', 'ticket_promedio', 'porcentaje']]
+    df_productos = ranking_productos(cubo)
     
     col1, col2 = st.columns([3, 2])
     
     with col1:
-        st.dataframe(
-            df_productos.style.format({
-                "ventas": "${:,.0f}",
-                "transacciones": "{:,}",
-                "ticket_promedio": "${:,.2f}",
-                "porcentaje": "{:.1f}%"
-            }).background_gradient(subset=['ventas'], cmap='YlGn'),
-            use_container_width=True,
-            hide_index=True,
-            height=400
+        tabla_paginada(
+            df_productos,
+            key="ranking",
+            gradiente=['ventas'],
+            cmap='YlGn',
+            height=400,
+            column_config={
+                "ventas": st.column_config.NumberColumn("ventas", format="dollar"),
+                "transacciones": st.column_config.NumberColumn("transacciones", format="localized"),
+                "ticket_promedio": st.column_config.NumberColumn("ticket_promedio", format="dollar"),
+                "porcentaje": st.column_config.NumberColumn("porcentaje", format="%.1f%%")
+            }
         )
     
     with col2:
@@ -300,34 +294,28 @@ with tab1:
         )
         fig_pie.update_traces(textposition='inside', textinfo='percent')
         fig_pie.update_layout(showlegend=False, height=400)
-        st.plotly_chart(fig_pie, use_container_width=True)
+        with tramo("plotly_pie"):
+            st.plotly_chart(fig_pie, use_container_width=True)
     
     st.divider()
     
     # Análisis por tienda
     st.subheader("🏪 Resumen por Tienda")
     
-    df_tiendas = df_raw.groupby("tienda_nombre").agg({
-        "ventas": "sum",
-        "transacciones": "sum"
-    }).reset_index()
-    
-    df_tiendas['ticket_promedio'] = (df_tiendas['ventas'] / df_tiendas['transacciones']).round(2)
-    df_tiendas['porcentaje'] = (df_tiendas['ventas'] / total_ventas * 100).round(1)
-    df_tiendas = df_tiendas.sort_values("ventas", ascending=False)
+    df_tiendas = resumen_tiendas(cubo)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.dataframe(
-            df_tiendas.style.format({
-                "ventas": "${:,.0f}",
-                "transacciones": "{:,}",
-                "ticket_promedio": "${:,.2f}",
-                "porcentaje": "{:.1f}%"
-            }),
-            use_container_width=True,
-            hide_index=True
+        tabla_paginada(
+            df_tiendas,
+            key="tiendas",
+            column_config={
+                "ventas": st.column_config.NumberColumn("ventas", format="dollar"),
+                "transacciones": st.column_config.NumberColumn("transacciones", format="localized"),
+                "ticket_promedio": st.column_config.NumberColumn("ticket_promedio", format="dollar"),
+                "porcentaje": st.column_config.NumberColumn("porcentaje", format="%.1f%%")
+            }
         )
     
     with col2:
@@ -339,20 +327,20 @@ with tab1:
             title='Ventas por Tienda'
         )
         fig_bar.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
-        st.plotly_chart(fig_bar, use_container_width=True)
+        with tramo("plotly_bar"):
+            st.plotly_chart(fig_bar, use_container_width=True)
     
     st.divider()
     
     # Evolución temporal general
     st.subheader("📈 Evolución Temporal")
     
-    df_temporal_general = df_raw.groupby("fecha").agg({
-        "ventas": "sum",
-        "transacciones": "sum"
-    }).reset_index()
+    # Submuestreo antes de armar la figura: el payload queda acotado con cualquier rango
+    df_temporal_general = reducir_serie(cubo.por_fecha, 'fecha', 'ventas')
+    traza = go.Scattergl if usar_webgl(len(df_temporal_general)) else go.Scatter
     
     fig_evol = go.Figure()
-    fig_evol.add_trace(go.Scatter(
+    fig_evol.add_trace(traza(
         x=df_temporal_general['fecha'],
         y=df_temporal_general['ventas'],
         mode='lines+markers',
@@ -370,32 +358,48 @@ with tab1:
         height=400
     )
     
-    st.plotly_chart(fig_evol, use_container_width=True)
+    with tramo("plotly_evol"):
+        st.plotly_chart(fig_evol, use_container_width=True)
 
 # ============= TAB 2: ANÁLISIS DETALLADO =============
-with tab2:
+def render_detalle():
     st.header("Análisis Detallado por Producto")
     
-    productos_ordenados = df_productos['producto'].tolist()
-    
-    for idx, producto in enumerate(productos_ordenados, 1):
-        df_producto = df_raw[df_raw['producto'] == producto]
+    with tramo("inventario"):
+        df_inventory = esperar_inventario()
+    with tramo("rotacion"):
+        df_rotacion = (
+            load_rotacion(clave_cargada, clave_filtros, dias_periodo, df_inventory) if df_inventory is not None else None
+        )
+    df_resumen_productos = load_resumen_productos(clave_cargada, clave_filtros)
+    
+    if df_rotacion is not None:
+        render_busqueda_codigos(df_rotacion, df_resumen_productos, PRODUCTOS_POR_PAGINA, get_caches()["derivados"])
+    
+    # Solo se dibujan los expanders de la página visible
+    paginas = total_paginas(len(df_resumen_productos), PRODUCTOS_POR_PAGINA)
+    if paginas > 1:
+        col_pagina, col_info = st.columns([1, 5])
+        with col_pagina:
+            pagina = st.number_input("Página", min_value=1, max_value=paginas, step=1, key="detalle_pagina")
+        df_pagina = ordenar_pagina(df_resumen_productos, pagina=pagina, tamano=PRODUCTOS_POR_PAGINA)
+        with col_info:
+            st.caption(
+                f"Productos {df_pagina['ranking'].iloc[0]:,}–{df_pagina['ranking'].iloc[-1]:,} "
+                f"de {len(df_resumen_productos):,}"
+            )
+    else:
+        df_pagina = df_resumen_productos
+    
+    for fila in df_pagina.itertuples(index=False):
+        idx, producto = fila.ranking, fila.producto
+        df_tiendas_prod = cubo.tiendas_producto(producto)
+        df_temporal_prod = cubo.serie_producto(producto)
         
-        ventas_producto = df_producto['ventas'].sum()
-        transacciones_producto = df_producto['transacciones'].sum()
+        ventas_producto = fila.ventas
+        transacciones_producto = fila.transacciones
         ticket_prom = ventas_producto / transacciones_producto if transacciones_producto > 0 else 0
-        
-        # Calcular tendencia
-        df_temporal_prod = df_producto.groupby('fecha')['ventas'].sum().reset_index()
-        if len(df_temporal_prod) > 1:
-            mid_point = len(df_temporal_prod) // 2
-            ventas_primera = df_temporal_prod.iloc[:mid_point]['ventas'].sum()
-            ventas_segunda = df_temporal_prod.iloc[mid_point:]['ventas'].sum()
-            tendencia = ((ventas_segunda - ventas_primera) / ventas_primera * 100) if ventas_primera > 0 else 0
-            tendencia_emoji = "📈" if tendencia > 5 else "📉" if tendencia < -5 else "➡️"
-        else:
-            tendencia = 0
-            tendencia_emoji = "➡️"
+        tendencia_emoji = "📈" if fila.tendencia > 5 else "📉" if fila.tendencia < -5 else "➡️"
         
         with st.expander(
             f"**#{idx} - {producto}** | ${ventas_producto:,.0f} | {transacciones_producto:,} trans. | Ticket: ${ticket_prom:,.2f} {tendencia_emoji}",
@@ -418,191 +422,47 @@ with tab2:
             subtab1, subtab2, subtab3 = st.tabs(["🏪 Por Tienda", "📅 Evolución", "📊 Stats"])
             
             with subtab1:
-                # Obtener datos de inventario y rotación para este producto
-                df_rotacion_prod = df_rotacion[df_rotacion['producto'] == producto].copy()
-                
-                # Agregar datos de ventas por tienda
-                df_tiendas_prod = df_producto.groupby(["tienda_id", "tienda_nombre"]).agg({
-                    "transacciones": "sum",
-                    "ventas": "sum"
-                }).reset_index()
-                
-                # Merge con datos de rotación/inventario
-                df_tabla_base = df_rotacion_prod.merge(
-                    df_tiendas_prod,
-                    on=["tienda_nombre"],
-                    how="left"
-                )
-                
-                # EXPANDIR CADA FILA EN 3 VARIANTES (SIZES)
-                filas_expandidas = []
-                
-                for _, row in df_tabla_base.iterrows():
-                    # Extraer número de tienda
-                    tienda_nombre = row['tienda_nombre']
-                    tienda_num = int(tienda_nombre.split()[-1]) if tienda_nombre.split()[-1].isdigit() else 0
-                    
-                    # Crear 3 variantes por cada tienda
-                    for variante in range(3):
-                        # Generar código único: PRODUCTO-TIENDA-VARIANTE
-                        codigo = f"{idx:03d}{tienda_num % 100:02d}{variante}"
-                        
-                        # Distribuir las métricas entre las 3 variantes (simulado)
-                        # En producción, estos datos vendrían directamente de la BD
-                        np.random.seed(int(codigo))  # Para resultados consistentes
-                        
-                        # Distribuir stock (la suma de las 3 variantes = stock total)
-                        pesos = np.random.dirichlet(np.ones(3))
-                        stock_variante = int(row['stock_actual'] * pesos[variante])
-                        
-                        # Distribuir ventas en unidades
-                        ventas_variante = int(row['transacciones'] * pesos[variante])
-                        
-                        # Distribuir ventas en dinero
-                        ventas_dinero_variante = int(row['ventas'] * pesos[variante])
-                        
-                        # Distribuir compras (unidades_vendidas)
-                        compras_variante = int(row['unidades_vendidas'] * pesos[variante])
-                        
-                        # Rotación se mantiene similar (pequeña variación)
-                        rotacion_variante = row['indice_rotacion'] * np.random.uniform(0.8, 1.2)
-                        
-                        filas_expandidas.append({
-                            'Código Producto': codigo,
-                            'Tienda': tienda_nombre,
-                            'Nombre Producto': row['producto'],
-                            'Compras': compras_variante,
-                            'Ventas': ventas_variante,
-                            'Ventas $': ventas_dinero_variante,
-                            'Stock': stock_variante,
-                            'Porcentaje Rotación': rotacion_variante
-                        })
-                
-                # Crear DataFrame expandido con índice nuevo
-                df_tabla_detallada = pd.DataFrame(filas_expandidas)
-                df_tabla_detallada = df_tabla_detallada.reset_index(drop=True)
-                
-                # Ordenar por tienda y código
-                df_tabla_detallada = df_tabla_detallada.sort_values(['Tienda', 'Código Producto'], ascending=[True, True])
-                df_tabla_detallada = df_tabla_detallada.reset_index(drop=True)
-      # ================= FILTROS TABLA DETALLADA =================
-                st.markdown("### Filtros")
-
-                colf1, colf2 = st.columns(2)
-
-                with colf1:
-                    tiendas_disponibles = sorted(df_tabla_detallada["Tienda"].unique())
-                    tiendas_seleccionadas = st.multiselect(
-                        "Filtrar por Tienda",
-                        options=tiendas_disponibles,
-                        default=tiendas_disponibles,
-                        key=f"tiendas_filter_{idx}_{producto}"  # Key única por producto
-                    )
-
-                with colf2:
-                    codigo_busqueda = st.text_input(
-                        "Filtrar por Código",
-                        placeholder="Ej: 001010",
-                        key=f"codigo_filter_{idx}_{producto}"  # Key única por producto
-                    )
-
-                # Aplicar filtros
-                df_filtrado = df_tabla_detallada.copy()
-
-                if tiendas_seleccionadas:
-                    df_filtrado = df_filtrado[
-                        df_filtrado["Tienda"].isin(tiendas_seleccionadas)
-                    ]
-
-                if codigo_busqueda:
-                    df_filtrado = df_filtrado[
-                        df_filtrado["Código Producto"]
-                        .astype(str)
-                        .str.contains(codigo_busqueda.strip(), case=False, na=False)
-                    ]
-
-                # Reordenar luego del filtro
-                df_filtrado = df_filtrado.sort_values(
-                    ['Tienda', 'Código Producto'],
-                    ascending=[True, True]
-                ).reset_index(drop=True)
-
-                # Mostrar tabla CON EL DATAFRAME FILTRADO
-                st.dataframe(
-                    df_filtrado.style.format({  # CAMBIAR df_tabla_detallada por df_filtrado
-                        "Compras": "{:,}",
-                        "Ventas": "{:,}",
-                        "Ventas $": "${:,.0f}",
-                        "Stock": "{:,}",
-                        "Porcentaje Rotación": "{:.2f}"
-                    }).background_gradient(subset=['Ventas $'], cmap='YlGn'),
-                    use_container_width=True,
-                    hide_index=True,
-                    column_config={
-                        'Código Producto': st.column_config.TextColumn(
-                            'Código Producto',
-                            width='small'
-                        ),
-                        'Tienda': st.column_config.TextColumn(
-                            'Tienda',
-                            width='small'
-                        ),
-                        'Nombre Producto': st.column_config.TextColumn(
-                            'Nombre Producto',
-                            width='large'
-                        ),
-                        'Compras': st.column_config.NumberColumn(
-                            'Compras',
-                            help='Unidades compradas/recibidas',
-                            format='%d'
-                        ),
-                        'Ventas': st.column_config.NumberColumn(
-                            'Ventas',
-                            help='Unidades vendidas',
-                            format='%d'
-                        ),
-                        'Ventas $': st.column_config.NumberColumn(
-                            'Ventas $',
-                            help='Monto en dinero',
-                            format='$%d'
-                        ),
-                        'Stock': st.column_config.NumberColumn(
-                            'Stock',
-                            format='%d'
-                        ),
-                        'Porcentaje Rotación': st.column_config.NumberColumn(
-                            '% Rotación',
-                            format='%.2f'
-                        )
-                    }
+                if df_rotacion is not None:
+                    render_tabla_producto(idx, producto, df_rotacion, df_tiendas_prod, get_caches()["derivados"])
+                else:
+                    st.info("La tabla por tienda necesita el inventario, que todavía no está disponible")
+            
+            with subtab2:
+                df_evolucion_prod = reducir_serie(df_temporal_prod, 'fecha', 'ventas')
+                traza = go.Scattergl if usar_webgl(len(df_evolucion_prod)) else go.Scatter
+                fig_prod = go.Figure(traza(
+                    x=df_evolucion_prod['fecha'],
+                    y=df_evolucion_prod['ventas'],
+                    mode='lines+markers',
+                    name='Ventas'
+                ))
+                fig_prod.update_layout(
+                    title=f'Evolución Diaria - {producto}',
+                    xaxis_title='Fecha',
+                    yaxis_title='Ventas ($)',
+                    hovermode='x unified',
+                    height=350
                 )
-
+                with tramo(f"plotly_evolucion_{idx}"):
+                    st.plotly_chart(fig_prod, use_container_width=True, key=f"evolucion_{idx}_{producto}")
  
 
 # ============= TAB 3: COMPARATIVAS =============
-with tab3:
+def render_comparativas():
     st.header("Análisis Comparativo")
     
     # Matriz productos x tiendas
     st.subheader("📊 Matriz: Productos x Tiendas")
     
-    df_matriz = df_raw.pivot_table(
-        index='producto',
-        columns='tienda_nombre',
-        values='ventas',
-        aggfunc='sum',
-        fill_value=0
-    ).reset_index()
-    
-    df_matriz['TOTAL'] = df_matriz.iloc[:, 1:].sum(axis=1)
-    df_matriz = df_matriz.sort_values('TOTAL', ascending=False)
-    
-    st.dataframe(
-        df_matriz.style.format(
-            {col: "${:,.0f}" for col in df_matriz.columns if col != 'producto'}
-        ).background_gradient(subset=[col for col in df_matriz.columns if col != 'producto'], cmap='YlGnBu'),
-        use_container_width=True,
-        hide_index=True
+    df_matriz = get_caches()["derivados"].derivar("matriz", matriz_con_total, cubo.matriz)
+    
+    columnas_ventas = [col for col in df_matriz.columns if col != 'producto']
+    tabla_paginada(
+        df_matriz,
+        key="matriz",
+        gradiente=columnas_ventas,
+        cmap='YlGnBu',
+        column_config={col: st.column_config.NumberColumn(col, format="dollar") for col in columnas_ventas}
     )
     
     st.divider()
@@ -610,13 +470,7 @@ with tab3:
     # Heatmap
     st.subheader("🔥 Mapa de Calor")
     
-    df_heatmap = df_raw.pivot_table(
-        index='producto',
-        columns='tienda_nombre',
-        values='ventas',
-        aggfunc='sum',
-        fill_value=0
-    )
+    df_heatmap = cubo.matriz
     
     fig_heatmap = px.imshow(
         df_heatmap,
@@ -627,32 +481,37 @@ with tab3:
         aspect="auto"
     )
     fig_heatmap.update_layout(height=500)
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+    with tramo("plotly_heatmap"):
+        st.plotly_chart(fig_heatmap, use_container_width=True)
     
     st.divider()
     
     # Evolución comparativa
     st.subheader("📈 Evolución Temporal Comparativa")
     
-    df_temporal_all = df_raw.groupby(['fecha', 'producto'])['ventas'].sum().reset_index()
+    # Top-N productos + "Otros" y submuestreo por serie antes de armar la figura
+    df_temporal_all = reducir_series(cubo.por_fecha_producto, 'fecha', 'ventas', 'producto')
+    webgl = usar_webgl(len(df_temporal_all))
     
     fig_comp = px.line(
         df_temporal_all,
         x='fecha',
         y='ventas',
         color='producto',
-        markers=True,
+        markers=not webgl,
+        render_mode='webgl' if webgl else 'auto',
         title='Comparación de Ventas por Producto'
     )
     fig_comp.update_layout(height=500, hovermode='x unified')
-    st.plotly_chart(fig_comp, use_container_width=True)
+    with tramo("plotly_comp"):
+        st.plotly_chart(fig_comp, use_container_width=True)
     
     st.divider()
     
     # Comparación de tiendas
     st.subheader("🏪 Ventas por Tienda y Producto")
     
-    df_tienda_producto = df_raw.groupby(['tienda_nombre', 'producto'])['ventas'].sum().reset_index()
+    df_tienda_producto = cubo.por_tienda_producto
     
     fig_grouped = px.bar(
         df_tienda_producto,
@@ -665,14 +524,20 @@ with tab3:
     )
     fig_grouped.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
     fig_grouped.update_layout(height=500)
-    st.plotly_chart(fig_grouped, use_container_width=True)
+    with tramo("plotly_grouped"):
+        st.plotly_chart(fig_grouped, use_container_width=True)
 
 
 # ============= TAB 4: INVENTARIO Y ROTACIÓN =============
-with tab4:
+def render_inventario():
     st.write("INVENTARIO Y ROTACIÓN")
     # st.header("📦 Gestión de Inventario y Rotación")
     
+    # df_inventory = esperar_inventario()
+    # if df_inventory is None:
+    #     return
+    # df_rotacion = load_rotacion(clave_cargada, clave_filtros, dias_periodo, df_inventory)
+    
     # # Métricas globales de inventario
     # st.subheader("📊 Resumen de Inventario")
     
@@ -745,16 +610,14 @@ with tab4:
     #     with col2:
     #         st.info(f"💰 **Costo total de reposición:** ${costo_total_reposicion:,.0f}")
         
-    #     # Botón de descarga de orden de compra
-    #     csv_reposicion = df_alertas[[
-    #         'producto', 'tienda_nombre', 'stock_actual', 'cantidad_reponer', 'costo_unitario', 'costo_reposicion'
-    #     ]].to_csv(index=False).encode('utf-8')
-        
-    #     st.download_button(
-    #         label="📥 Descargar Orden de Compra",
-    #         data=csv_reposicion,
-    #         file_name=f"orden_compra_{datetime.now().strftime('%Y%m%d')}.csv",
-    #         mime="text/csv",
+    #     # Botón de descarga de orden de compra (se genera solo al hacer clic)
+    #     boton_descarga(
+    #         df_alertas[[
+    #             'producto', 'tienda_nombre', 'stock_actual', 'cantidad_reponer', 'costo_unitario', 'costo_reposicion'
+    #         ]],
+    #         nombre=f"orden_compra_{datetime.now().strftime('%Y%m%d')}",
+    #         key="orden_compra",
+    #         label="📥 Descargar Orden de Compra"
     #     )
     # else:
     #     st.success("✅ No hay productos que requieran reposición urgente")
@@ -918,11 +781,24 @@ with tab4:
 
 
 # ============= TAB 5: DATOS CRUDOS =============
-with tab5:
+def render_datos_crudos():
     st.header("Datos Crudos")
     
     st.info("💡 Aquí puedes explorar y exportar los datos completos")
     
+    # Ventas ya cargadas para los filtros de la barra lateral: se exportan sin recalcular
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        boton_descarga(
+            df_raw,
+            nombre=f"ventas_{filtros['dates']['fecha_inicio']}_{filtros['dates']['fecha_fin']}",
+            key="ventas_cargadas",
+            label="📥 Descargar Ventas"
+        )
+    with col2:
+        st.write(f"**Registros:** {len(df_raw):,}")
+        st.write("**Formato:** CSV (UTF-8), CSV gzip o Parquet")
+    
     # # Selector de dataset
     # dataset_seleccionado = st.radio(
     #     "Seleccionar dataset",
@@ -969,7 +845,8 @@ with tab5:
     #         )
     
     # # Aplicar filtros
-    # df_filtrado = df_mostrar.copy()
+    # # Cada filtro genera un DataFrame nuevo: no hace falta copiar el original
+    # df_filtrado = df_mostrar
     
     # if productos_filter:
     #     df_filtrado = df_filtrado[df_filtrado['producto'].isin(productos_filter)]
@@ -1023,12 +900,12 @@ with tab5:
     # col1, col2, col3 = st.columns(3)
     
     # with col1:
-    #     csv = df_filtrado.to_csv(index=False).encode('utf-8')
-    #     st.download_button(
-    #         label=f"📥 Descargar {dataset_seleccionado}",
-    #         data=csv,
-    #         file_name=f"{dataset_seleccionado.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-    #         mime="text/csv",
+    #     # Se exporta el mismo df_filtrado que se muestra, solo al hacer clic
+    #     boton_descarga(
+    #         df_filtrado,
+    #         nombre=f"{dataset_seleccionado.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+    #         key="datos_crudos",
+    #         label=f"📥 Descargar {dataset_seleccionado}"
     #     )
     
     # with col2:
@@ -1036,5 +913,57 @@ with tab5:
     #     st.write(f"**Registros:** {len(df_filtrado):,}")
     
     # with col3:
-    #     st.write("**Formato:** CSV (UTF-8)")
-    #     st.write(f"**Fecha:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
\ No newline at end of file
+    #     st.write("**Formato:** CSV (UTF-8), CSV gzip o Parquet")
+    #     st.write(f"**Fecha:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+
+# ============= NAVEGACIÓN =============
+# Solo se ejecuta la sección visible; las demás no calculan nada en el rerun
+SECCIONES = {
+    "📈 Resumen General": render_resumen,
+    "🔍 Análisis Detallado": render_detalle,
+    "📊 Comparativas": render_comparativas,
+    "📦 Inventario y Rotación": render_inventario,
+    "💾 Datos Crudos": render_datos_crudos
+}
+
+# Prefijos de las keys de widgets que deben sobrevivir al cambio de sección
+PREFIJOS_ESTADO = ("tiendas_filter_", "codigo_filter_", "filter_", "tabla_", "descarga_", "detalle_")
+
+
+def conservar_estado_widgets():
+    """
+    Streamlit borra el estado de los widgets que no se dibujan en un rerun.
+    Reasignarlo lo marca como propio y lo conserva al cambiar de sección
+    """
+    for key in list(st.session_state.keys()):
+        if isinstance(key, str) and key.startswith(PREFIJOS_ESTADO):
+            st.session_state[key] = st.session_state[key]
+
+
+conservar_estado_widgets()
+
+st.title("📊 Dashboard de Ventas e Inventario")
+
+seccion = st.segmented_control(
+    "Sección",
+    options=list(SECCIONES),
+    default=next(iter(SECCIONES)),
+    key="seccion",
+    label_visibility="collapsed"
+)
+
+# Al deseleccionar la sección activa se vuelve a la primera
+render_seccion = SECCIONES.get(seccion, render_resumen)
+with tramo(render_seccion.__name__.removeprefix("render_")):
+    render_seccion()
+
+cerrar_ejecucion()
+
+# Con la página ya dibujada, precargar el rango anterior y el siguiente: al
+# moverse a ellos el periodo cargado sale de las particiones diarias ya calientes
+# (las tiendas sueltas no hacen falta, se filtran sobre lo cargado)
+get_precargador().programar(claves_vecinas(clave_rango, por_tienda=False))
+
+render_metricas_cache()
+render_panel_perfil()
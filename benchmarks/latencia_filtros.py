@@ -0,0 +1,92 @@
+"""
+Latencia por interacción del filtro "Filtrar por Código" del detalle por producto.
+
+- rerun completo: cada cambio del filtro re-ejecuta todo app.py (comportamiento
+  sin fragmentos)
+- fragmento: cada cambio solo re-ejecuta render_tabla_producto para un producto
+
+Uso:
+    python benchmarks/latencia_filtros.py --repeticiones 20
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+BUSQUEDAS = ["0", "00", "001", "0010", "00101", ""]
+
+
+def _pagina_fragmento():
+    import streamlit as st
+
+    from core.cubo import construir_cubo
+    from core.rotacion import calcular_rotacion
+    from core.simulador import get_inventory_data, get_sales_data
+    from ui.detalle import render_tabla_producto
+
+    @st.cache_resource
+    def datos():
+        filtros = {
+            "dates": {"fecha_inicio": "2026-02-01", "fecha_fin": "2026-02-10"},
+            "stores": [],
+            "products": [],
+            "categories": []
+        }
+        cubo = construir_cubo(get_sales_data(filtros))
+        return cubo, calcular_rotacion(cubo.por_producto_tienda, get_inventory_data(filtros), 10)
+
+    cubo, df_rotacion = datos()
+    producto = cubo.por_producto["producto"].iloc[0]
+    render_tabla_producto(1, producto, df_rotacion, cubo.tiendas_producto(producto))
+
+
+def _medir(at, repeticiones):
+    key = next(t.key for t in at.text_input if t.key.startswith("codigo_filter_1_"))
+    tiempos = []
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        at.text_input(key=key).input(BUSQUEDAS[i % len(BUSQUEDAS)]).run()
+        tiempos.append(time.perf_counter() - inicio)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+    return tiempos
+
+
+def medir_rerun_completo(repeticiones):
+    at = AppTest.from_file(str(RAIZ / "app.py"), default_timeout=300).run()
+    at.button_group(key="seccion").set_value("🔍 Análisis Detallado").run()
+    return _medir(at, repeticiones)
+
+
+def medir_fragmento(repeticiones):
+    at = AppTest.from_function(_pagina_fragmento, default_timeout=300).run()
+    return _medir(at, repeticiones)
+
+
+def _resumen(nombre, tiempos):
+    ordenados = sorted(tiempos)
+    p95 = ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.95))]
+    return f"{nombre:<16} mediana {statistics.median(tiempos) * 1000:8.1f} ms | p95 {p95 * 1000:8.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=12)
+    args = parser.parse_args()
+
+    completo = medir_rerun_completo(args.repeticiones)
+    fragmento = medir_fragmento(args.repeticiones)
+
+    print(_resumen("rerun completo", completo))
+    print(_resumen("fragmento", fragmento))
+    print(f"mejora: x{statistics.median(completo) / statistics.median(fragmento):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Reporte de memoria de los DataFrames de ventas e inventario antes y después de
+normalizar el esquema (core/esquema.py).
+
+Uso:
+    python benchmarks/memoria_esquema.py --productos 500 --tiendas 20 --dias 90
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.esquema import normalizar_inventario, normalizar_ventas, reporte_memoria  # noqa: E402
+from core.simulador import catalogo_sintetico, get_inventory_data, get_sales_data  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--productos", type=int, default=500)
+    parser.add_argument("--tiendas", type=int, default=20)
+    parser.add_argument("--dias", type=int, default=90)
+    args = parser.parse_args()
+
+    productos, tiendas = catalogo_sintetico(args.productos, args.tiendas)
+    inicio = date(2026, 1, 1)
+    filtros = {
+        "dates": {
+            "fecha_inicio": inicio.isoformat(),
+            "fecha_fin": (inicio + timedelta(days=args.dias - 1)).isoformat()
+        },
+        "stores": tiendas,
+        "products": productos,
+        "categories": []
+    }
+
+    with pd.option_context("display.width", 120, "display.max_columns", 10):
+        df_ventas = get_sales_data(filtros)
+        print(f"Ventas ({len(df_ventas):,} filas)")
+        print(reporte_memoria(df_ventas, normalizar_ventas(df_ventas)))
+        print()
+
+        df_inventario = get_inventory_data(filtros)
+        print(f"Inventario ({len(df_inventario):,} filas)")
+        print(reporte_memoria(df_inventario, normalizar_inventario(df_inventario)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Benchmark headless del pipeline de datos del dashboard (sin Streamlit), por
+escala productos x tiendas x días:
+
+- simulador de ventas e inventario
+- normalización de esquema y cubo de agregaciones
+- series acumuladas: construcción y cubo de media ventana desde ellas
+- calcular_rotacion
+- agregaciones del resumen (tab1) y de las comparativas (tab3)
+- resumen por producto y variantes de una página del detalle (tab2)
+
+Reporta tiempo (mediana de las repeticiones), memoria pico (tracemalloc, en
+una corrida aparte) y filas/s, y compara contra una línea base guardada:
+una etapa es regresión si su tiempo o su memoria supera la base en más de la
+tolerancia (y de un margen absoluto de ruido). Los tiempos se comparan
+relativos a una etapa de calibración (una carga fija de numpy/pandas que no
+usa código del dashboard) medida en la misma corrida, así la base sirve en
+otra máquina; la memoria de tracemalloc no depende de la máquina y se
+compara directa. La base guarda la máquina y el commit en que se generó.
+
+Uso:
+    python benchmarks/pipeline.py --escalas 50x10x30 500x20x90
+    python benchmarks/pipeline.py --motor arrow
+    python benchmarks/pipeline.py --guardar-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.cubo import construir_cubo  # noqa: E402
+from core.esquema import normalizar_inventario, normalizar_ventas  # noqa: E402
+from core.motores import MOTORES, crear_motor  # noqa: E402
+from core.graficos import reducir_serie, reducir_series  # noqa: E402
+from core.rotacion import calcular_rotacion  # noqa: E402
+from core.series import SeriesDiarias  # noqa: E402
+from core.simulador import catalogo_sintetico, get_inventory_data, get_sales_data  # noqa: E402
+from core.variantes import tabla_detallada_producto  # noqa: E402
+from core.vistas import (  # noqa: E402
+    PRODUCTOS_POR_PAGINA, matriz_con_total, ranking_productos, resumen_productos, resumen_tiendas
+)
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+ESCALAS_DEFAULT = ["50x10x30", "500x20x90"]
+# Diferencias absolutas por debajo de estas se consideran ruido de medición
+RUIDO = {"ms": 5.0, "mb_pico": 1.0}
+REPETICIONES_CALIBRACION = 7
+
+
+# ============= CALIBRACIÓN =============
+def calibracion():
+    """
+    Carga fija del mismo tipo que las etapas (ordenar, agrupar, categorizar)
+    que no depende del código del repo: mide la velocidad de la máquina
+    """
+    rng = np.random.default_rng(0)
+    valores = rng.random(1_000_000)
+    claves = rng.integers(0, 10_000, 1_000_000)
+    np.sort(valores)
+    pd.DataFrame({"clave": claves, "valor": valores}).groupby("clave")["valor"].sum()
+    pd.Series(claves[:200_000].astype(str)).astype("category")
+
+
+def maquina():
+    """
+    Dónde se generó una medición (se guarda con la línea base)
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "commit": commit,
+    }
+
+
+# ============= ETAPAS =============
+def _filtros(n_productos, n_tiendas, n_dias):
+    productos, tiendas = catalogo_sintetico(n_productos, n_tiendas)
+    inicio = date(2026, 1, 1)
+    return {
+        "dates": {
+            "fecha_inicio": inicio.isoformat(),
+            "fecha_fin": (inicio + timedelta(days=n_dias - 1)).isoformat()
+        },
+        "stores": tiendas,
+        "products": productos,
+        "categories": []
+    }
+
+
+def _tab1(cubo):
+    ranking_productos(cubo)
+    resumen_tiendas(cubo)
+    reducir_serie(cubo.por_fecha, "fecha", "ventas")
+
+
+def _tab3(cubo):
+    matriz_con_total(cubo.matriz)
+    reducir_series(cubo.por_fecha_producto, "fecha", "ventas", "producto")
+
+
+def _tab2(cubo, df_rotacion):
+    # Un rerun del detalle: resumen de todos los productos y variantes de la primera página
+    df_pagina = resumen_productos(cubo).head(PRODUCTOS_POR_PAGINA)
+    for fila in df_pagina.itertuples(index=False):
+        df_tiendas_prod = cubo.tiendas_producto(fila.producto)
+        tabla_detallada_producto(df_rotacion, fila.producto, df_tiendas_prod, fila.ranking)
+
+
+def etapas(filtros, n_dias, motor):
+    """
+    Lista (nombre, función, filas de entrada) en el orden del dashboard. Las
+    entradas de cada etapa se calculan una vez fuera de la medición
+    """
+    ventas_crudas = get_sales_data(filtros)
+    inventario_crudo = get_inventory_data(filtros)
+    ventas = normalizar_ventas(ventas_crudas)
+    inventario = normalizar_inventario(inventario_crudo)
+    cubo = construir_cubo(ventas, motor)
+    fechas = filtros["dates"]
+    series = SeriesDiarias(motor)
+    series.extender(ventas, fechas["fecha_inicio"], fechas["fecha_fin"])
+    # Cambio de rango dentro de lo cargado: la segunda mitad del periodo
+    mitad = (date.fromisoformat(fechas["fecha_inicio"]) + timedelta(days=n_dias // 2)).isoformat()
+    df_rotacion = calcular_rotacion(cubo.por_producto_tienda, inventario, n_dias)
+    return [
+        ("simulador_ventas", lambda: get_sales_data(filtros), len(ventas_crudas)),
+        ("simulador_inventario", lambda: get_inventory_data(filtros), len(inventario_crudo)),
+        ("normalizar", lambda: (normalizar_ventas(ventas_crudas), normalizar_inventario(inventario_crudo)),
+         len(ventas_crudas) + len(inventario_crudo)),
+        ("cubo", lambda: construir_cubo(ventas, motor), len(ventas)),
+        ("series_construir", lambda: SeriesDiarias(motor).extender(
+            ventas, fechas["fecha_inicio"], fechas["fecha_fin"]), len(ventas)),
+        ("series_cubo_rango", lambda: series.cubo(mitad, fechas["fecha_fin"]), len(ventas) // 2),
+        ("rotacion", lambda: calcular_rotacion(cubo.por_producto_tienda, inventario, n_dias),
+         len(cubo.por_producto_tienda)),
+        ("tab1_resumen", lambda: _tab1(cubo), len(cubo.base)),
+        ("tab3_comparativas", lambda: _tab3(cubo), len(cubo.base)),
+        ("tab2_detalle", lambda: _tab2(cubo, df_rotacion), len(cubo.por_fecha_producto)),
+    ]
+
+
+# ============= MEDICIÓN =============
+def medir(funcion, filas, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    segundos = statistics.median(tiempos)
+
+    # La memoria se mide aparte: tracemalloc hace más lenta la ejecución
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ms": round(segundos * 1000, 2),
+        "mb_pico": round(pico / 1e6, 2),
+        "filas_s": round(filas / segundos) if segundos > 0 else None,
+    }
+
+
+def comparar(actual, base, tolerancia, escala_tiempo=1.0):
+    """
+    Motivos de regresión de una etapa frente a la línea base (lista vacía si no
+    hay). escala_tiempo lleva los ms de la base a esta máquina: calibración
+    actual / calibración de la base
+    """
+    if not base:
+        return []
+    referencia = {"ms": base.get("ms", 0) * escala_tiempo, "mb_pico": base.get("mb_pico", 0)}
+    motivos = []
+    for metrica in ("ms", "mb_pico"):
+        limite = max(referencia[metrica] * (1 + tolerancia), referencia[metrica] + RUIDO[metrica])
+        if referencia[metrica] and actual[metrica] > limite:
+            motivos.append(f"{metrica} {actual[metrica] / referencia[metrica] - 1:+.0%}")
+    return motivos
+
+
+def _escala(texto):
+    try:
+        productos, tiendas, dias = (int(parte) for parte in texto.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Escala inválida '{texto}', se espera PRODUCTOSxTIENDASxDIAS")
+    return texto.lower(), (productos, tiendas, dias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", nargs="+", type=_escala, default=[_escala(e) for e in ESCALAS_DEFAULT],
+                        help=f"PRODUCTOSxTIENDASxDIAS (por defecto {' '.join(ESCALAS_DEFAULT)})")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Aumento relativo admitido antes de marcar regresión (0.25 = 25%%)")
+    parser.add_argument("--motor", choices=["auto", *MOTORES], default="pandas",
+                        help="Motor de agregación del cubo (la línea base es de pandas)")
+    parser.add_argument("--guardar-baseline", action="store_true",
+                        help="Guarda los resultados como nueva línea base")
+    args = parser.parse_args()
+
+    motor = crear_motor(args.motor)
+    print(f"Motor de agregación: {motor.nombre}")
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    resultados = {}
+    regresiones = 0
+
+    calibracion_ms = medir(calibracion, 0, REPETICIONES_CALIBRACION)["ms"]
+    calibracion_base = baseline.get("_calibracion_ms")
+    print(f"Calibración: {calibracion_ms:,.1f} ms", end="")
+    if calibracion_base:
+        escala_tiempo = calibracion_ms / calibracion_base
+        base_maquina = baseline.get("_maquina", {})
+        print(f" (base {calibracion_base:,.1f} ms en {base_maquina.get('procesador')}, "
+              f"commit {base_maquina.get('commit')}: tiempos de la base x{escala_tiempo:.2f})")
+    else:
+        # Una base sin calibración no dice en qué máquina se midió: solo se compara la memoria
+        escala_tiempo = None
+        print(" (la base no tiene calibración: no se comparan tiempos)" if baseline else "")
+
+    for nombre_escala, (n_productos, n_tiendas, n_dias) in args.escalas:
+        print(f"\nEscala {nombre_escala} ({n_productos} productos x {n_tiendas} tiendas x {n_dias} días)")
+        print(f"{'etapa':<22}{'ms':>11}{'MB pico':>10}{'filas/s':>14}  base")
+        resultados[nombre_escala] = {}
+        for nombre, funcion, filas in etapas(_filtros(n_productos, n_tiendas, n_dias), n_dias, motor):
+            actual = medir(funcion, filas, args.repeticiones)
+            resultados[nombre_escala][nombre] = actual
+            base = baseline.get(nombre_escala, {}).get(nombre)
+            if base and escala_tiempo is None:
+                base = {"mb_pico": base.get("mb_pico")}
+            motivos = comparar(actual, base, args.tolerancia, escala_tiempo or 1.0)
+            regresiones += bool(motivos)
+            estado = "sin base" if nombre not in baseline.get(nombre_escala, {}) else (
+                "REGRESIÓN " + ", ".join(motivos) if motivos else "ok"
+            )
+            print(f"{nombre:<22}{actual['ms']:>11,.1f}{actual['mb_pico']:>10,.1f}{actual['filas_s'] or 0:>14,}  {estado}")
+
+    if args.guardar_baseline:
+        # La base entera queda con la calibración de esta corrida: las escalas
+        # no medidas ahora se descartan en lugar de mezclar máquinas
+        args.baseline.write_text(json.dumps(
+            {"_maquina": maquina(), "_calibracion_ms": calibracion_ms, **resultados}, indent=2
+        ) + "\n")
+        print(f"\nLínea base guardada en {args.baseline}")
+    elif regresiones:
+        print(f"\n{regresiones} etapa(s) con regresión (tolerancia {args.tolerancia:.0%})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Lógica de cálculo del dashboard, independiente de Streamlit
+"""
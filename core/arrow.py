@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow es opcional: sin él se usa el camino pandas de siempre
+    pa = pc = None
+
+
+# Filas leídas del cursor por lote cuando el driver no entrega Arrow nativo
+FILAS_POR_LOTE = 50_000
+
+
+def arrow_disponible():
+    return pa is not None
+
+
+# ============= CURSOR -> ARROW =============
+def tabla_desde_cursor(cursor, filas_por_lote=FILAS_POR_LOTE):
+    """
+    Resultado de un cursor DB-API ya ejecutado como pyarrow.Table. Los drivers
+    con salida Arrow (ADBC, DuckDB) la entregan sin pasar por objetos Python;
+    el resto se lee por lotes y se convierte columna a columna, de modo que
+    nunca existen a la vez todas las tuplas del resultado
+    """
+    if hasattr(cursor, "fetch_arrow_table"):
+        return cursor.fetch_arrow_table()
+    columnas = [descripcion[0] for descripcion in cursor.description]
+    lotes = []
+    while True:
+        filas = cursor.fetchmany(filas_por_lote)
+        if not filas:
+            break
+        lotes.append(pa.table([pa.array(valores) for valores in zip(*filas)], names=columnas))
+    if not lotes:
+        return pa.table({columna: pa.array([], type=pa.null()) for columna in columnas})
+    # Un lote con una columna toda nula infiere otro tipo: se unifican al concatenar
+    return pa.concat_tables(lotes, promote_options="default")
+
+
+# ============= ARROW -> ESQUEMA COMPACTO =============
+def _categorica(columna):
+    """
+    Categorical con categorías ordenadas a partir del diccionario de Arrow:
+    cada string se decodifica una sola vez (por valor distinto, no por fila)
+    """
+    if pa.types.is_null(columna.type):
+        columna = columna.cast(pa.string())
+    diccionario = pc.dictionary_encode(columna).combine_chunks()
+    categorias = np.asarray(diccionario.dictionary.to_pylist(), dtype=object)
+    orden = np.argsort(categorias, kind="stable")
+    rango = np.empty(len(orden), dtype=np.int32)
+    rango[orden] = np.arange(len(orden), dtype=np.int32)
+    indices = diccionario.indices.fill_null(-1).to_numpy().astype(np.int32)
+    codigos = np.where(indices >= 0, rango[np.maximum(indices, 0)], -1) if len(rango) else indices
+    return pd.Categorical.from_codes(codigos, categories=pd.Index(categorias[orden], dtype="str"))
+
+
+def _fecha(columna):
+    if pa.types.is_string(columna.type) or pa.types.is_large_string(columna.type):
+        columna = pc.strptime(columna, format="%Y-%m-%d", unit="s")
+    return pd.to_datetime(columna.cast(pa.timestamp("us")).to_numpy())
+
+
+def a_pandas_compacto(tabla, fechas=(), categoricas=()):
+    """
+    DataFrame con los tipos compactos de core/esquema directo desde Arrow:
+    categóricos con categorías ordenadas, fechas datetime64 y enteros con el
+    menor tamaño que los contiene (normalizar_* lo devuelve sin cambios)
+    """
+    columnas = {}
+    for nombre in tabla.column_names:
+        columna = tabla.column(nombre)
+        if nombre in categoricas:
+            columnas[nombre] = _categorica(columna)
+        elif nombre in fechas:
+            columnas[nombre] = _fecha(columna)
+        elif pa.types.is_integer(columna.type) and columna.null_count == 0:
+            columnas[nombre] = pd.to_numeric(columna.to_numpy(), downcast="integer")
+        elif pa.types.is_null(columna.type) and len(columna) == 0:
+            # Resultado vacío sin tipos: mismo entero mínimo que normalizar_* da a un frame vacío
+            columnas[nombre] = pd.to_numeric(np.empty(0, dtype=np.int64), downcast="integer")
+        else:
+            columnas[nombre] = columna.to_pandas()
+    return pd.DataFrame(columnas)
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+# Mayor code point: cota superior de los sufijos que empiezan con un texto
+_ULTIMO_CARACTER = "\U0010FFFF"
+
+
+# ============= ÍNDICE DE CÓDIGOS =============
+class IndiceCodigos:
+    """
+    Arreglo de sufijos de una columna de códigos: buscar un texto dentro de
+    los códigos es una búsqueda binaria por prefijo sobre los sufijos
+    ordenados, sin recorrer la tabla. Devuelve posiciones de fila ordenadas,
+    así el resultado conserva el orden de la tabla sin volver a ordenar.
+    Las búsquedas no distinguen mayúsculas y no usan regex
+    """
+
+    def __init__(self, codigos):
+        codigos = [str(codigo).casefold() for codigo in codigos]
+        self.n_filas = len(codigos)
+        sufijos = [codigo[inicio:] for codigo in codigos for inicio in range(len(codigo))]
+        filas = np.repeat(np.arange(self.n_filas, dtype=np.int32), [len(codigo) for codigo in codigos])
+        # Un carácter más que el código más largo: la cota superior de la búsqueda
+        # cabe sin que numpy tenga que convertir el arreglo a un ancho mayor
+        self._ancho = max((len(codigo) for codigo in codigos), default=0) + 1
+        sufijos = np.array(sufijos, dtype=f"<U{self._ancho}")
+        orden = np.argsort(sufijos, kind="stable")
+        self._sufijos = sufijos[orden]
+        self._filas = filas[orden]
+
+    def buscar(self, texto):
+        """
+        Posiciones (ordenadas) de las filas cuyo código contiene el texto
+        """
+        texto = (texto or "").strip().casefold()
+        if not texto:
+            return np.arange(self.n_filas)
+        if len(texto) >= self._ancho:
+            return np.arange(0)
+        inicio = np.searchsorted(self._sufijos, texto, side="left")
+        fin = np.searchsorted(self._sufijos, texto + _ULTIMO_CARACTER, side="left")
+        # Un código puede coincidir en varios sufijos: se marcan sus filas una vez
+        coincide = np.zeros(self.n_filas, dtype=bool)
+        coincide[self._filas[inicio:fin]] = True
+        return np.flatnonzero(coincide)
+
+    @property
+    def nbytes(self):
+        return self._sufijos.nbytes + self._filas.nbytes
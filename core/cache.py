@@ -0,0 +1,355 @@
+import hashlib
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from core.esquema import concatenar
+
+
+def tamano_bytes(valor):
+    """
+    Memoria aproximada de un valor cacheado
+    """
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(deep=True))
+    # Índices y otras estructuras propias que exponen su tamaño
+    return int(getattr(valor, "nbytes", 0))
+
+
+# ============= CACHE ACOTADO (TTL + LRU) =============
+class CacheLRU:
+    """
+    Cache en memoria con expiración por tiempo (ttl, en segundos) y desalojo LRU
+    por número de entradas y, opcionalmente, por bytes. Los valores se comparten
+    sin copiar: quien los recibe debe tratarlos como solo lectura
+    """
+
+    def __init__(self, max_entradas=16, ttl=None, max_bytes=None, reloj=time.monotonic):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._reloj = reloj
+        self._entradas = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.expiradas = 0
+        self.desalojadas = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return self.obtener(clave, contar=False) is not None
+
+    def _quitar(self, clave):
+        _, _, tamano = self._entradas.pop(clave)
+        self._bytes -= tamano
+
+    def obtener(self, clave, contar=True):
+        """
+        Valor cacheado o None si no existe o expiró
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and self.ttl is not None and self._reloj() >= entrada[0]:
+                self._quitar(clave)
+                self.expiradas += 1
+                entrada = None
+            if entrada is None:
+                if contar:
+                    self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            if contar:
+                self.aciertos += 1
+            return entrada[1]
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            if clave in self._entradas:
+                self._quitar(clave)
+            expira = self._reloj() + self.ttl if self.ttl is not None else None
+            tamano = tamano_bytes(valor)
+            self._entradas[clave] = (expira, valor, tamano)
+            self._bytes += tamano
+            # Desalojar las menos usadas recientemente (nunca la recién guardada)
+            while len(self._entradas) > 1 and (
+                len(self._entradas) > self.max_entradas
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                self._quitar(next(iter(self._entradas)))
+                self.desalojadas += 1
+
+    def obtener_o_calcular(self, clave, calcular):
+        valor = self.obtener(clave)
+        if valor is None:
+            valor = calcular()
+            self.guardar(clave, valor)
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "bytes": self._bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "expiradas": self.expiradas,
+                "desalojadas": self.desalojadas,
+            }
+
+
+# ============= CACHE PARTICIONADO POR DÍA =============
+def _dias_del_rango(fecha_inicio, fecha_fin):
+    inicio, fin = date.fromisoformat(fecha_inicio), date.fromisoformat(fecha_fin)
+    return [(inicio + timedelta(days=i)).isoformat() for i in range((fin - inicio).days + 1)]
+
+
+def _rangos_contiguos(dias):
+    """
+    Agrupa días ordenados en rangos contiguos: [d1, d2, d3, d7] -> [(d1, d3), (d7, d7)]
+    """
+    rangos = []
+    for dia in dias:
+        if rangos and date.fromisoformat(dia) - date.fromisoformat(rangos[-1][1]) == timedelta(days=1):
+            rangos[-1][1] = dia
+        else:
+            rangos.append([dia, dia])
+    return [tuple(rango) for rango in rangos]
+
+
+class CacheDiario:
+    """
+    Cache de ventas particionado por día. Para un rango nuevo solo se piden a la
+    fuente los días que faltan (agrupados en rangos contiguos) y se concatenan
+    con las particiones ya cacheadas: mover una ventana móvil un día cuesta un día
+    """
+
+    def __init__(self, cargar, max_particiones=4096, ttl=None):
+        self._cargar = cargar
+        self.particiones = CacheLRU(max_entradas=max_particiones, ttl=ttl)
+        self.dias_descargados = 0
+        self.consultas_fuente = 0
+
+    def obtener(self, clave):
+        """
+        Ventas del rango de clave (ClaveFiltros), reutilizando los días cacheados
+        """
+        dias = _dias_del_rango(clave.fecha_inicio, clave.fecha_fin)
+        if not dias:
+            return self._cargar(clave)
+
+        # Las particiones se identifican por los filtros sin fechas + el día
+        base = clave.sin_fechas()
+        partes = {dia: self.particiones.obtener((base, dia)) for dia in dias}
+        faltantes = [dia for dia, parte in partes.items() if parte is None]
+
+        for inicio, fin in _rangos_contiguos(faltantes):
+            df = self._cargar(replace(clave, fecha_inicio=inicio, fecha_fin=fin))
+            self.consultas_fuente += 1
+            por_dia = {
+                pd.Timestamp(fecha).strftime("%Y-%m-%d"): parte
+                for fecha, parte in df.groupby("fecha", sort=False, observed=True)
+            }
+            for dia in _dias_del_rango(inicio, fin):
+                # Los días sin ventas también se guardan (vacíos) para no volver a pedirlos
+                parte = por_dia.get(dia, df.iloc[0:0]).reset_index(drop=True)
+                self.particiones.guardar((base, dia), parte)
+                partes[dia] = parte
+                self.dias_descargados += 1
+
+        return concatenar(partes[dia] for dia in dias)
+
+    def contiene(self, clave):
+        """
+        True si todos los días del rango de clave ya están cacheados
+        """
+        base = clave.sin_fechas()
+        dias = _dias_del_rango(clave.fecha_inicio, clave.fecha_fin)
+        return bool(dias) and all((base, dia) in self.particiones for dia in dias)
+
+    def estadisticas(self):
+        return {
+            **self.particiones.estadisticas(),
+            "dias_descargados": self.dias_descargados,
+            "consultas_fuente": self.consultas_fuente,
+        }
+
+
+# ============= CACHE COMPARTIDO ENTRE SESIONES =============
+# Huella de cada DataFrame/Series ya calculada, por objeto (id -> (weakref, huella))
+_huellas_objetos = {}
+_lock_huellas = threading.Lock()
+_TIPOS_SIMPLES = (str, int, float, bool, type(None), date, tuple)
+
+
+def _huella_pandas(obj):
+    with _lock_huellas:
+        memo = _huellas_objetos.get(id(obj))
+        if memo is not None and memo[0]() is obj:
+            return memo[1]
+    h = hashlib.blake2b(digest_size=16)
+    h.update(type(obj).__name__.encode())
+    columnas = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+    h.update(repr(list(columnas)).encode())
+    h.update(repr([str(dtype) for dtype in (obj.dtypes if isinstance(obj, pd.DataFrame) else [obj.dtype])]).encode())
+    h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    resultado = h.digest()
+    clave = id(obj)
+    with _lock_huellas:
+        _huellas_objetos[clave] = (weakref.ref(obj, lambda _: _huellas_objetos.pop(clave, None)), resultado)
+    return resultado
+
+
+def huella(*partes):
+    """
+    Hash del contenido de las partes (DataFrames, Series y valores simples).
+    La huella de un DataFrame se memoriza mientras el objeto vive: los datos
+    cacheados son de solo lectura, así que hashearlos una vez alcanza
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for parte in partes:
+        if isinstance(parte, (pd.DataFrame, pd.Series)):
+            h.update(_huella_pandas(parte))
+        elif isinstance(parte, _TIPOS_SIMPLES):
+            h.update(f"{type(parte).__name__}:{parte!r}".encode())
+        else:
+            # El repr de otros objetos no garantiza reflejar su contenido
+            raise TypeError(f"huella() no soporta {type(parte).__name__}")
+        h.update(b"|")
+    return h.hexdigest()
+
+
+class CacheCompartido:
+    """
+    Cache de proceso para resultados derivados, con clave por huella de
+    contenido de las entradas: las sesiones que ven los mismos datos comparten
+    el resultado aunque lleguen por filtros distintos.
+    Single-flight: si varias sesiones piden a la vez una clave que falta, una
+    la calcula y las demás esperan ese resultado; si el cálculo falla, una de
+    las que esperaban pasa a calcular y el resto sigue esperando. Con
+    directorio, los DataFrames también se guardan en Parquet (si pyarrow está
+    instalado) y sobreviven a reinicios; al cambiar un cálculo hay que vaciar
+    el directorio
+    """
+
+    def __init__(self, max_entradas=256, ttl=None, max_bytes=None, directorio=None, reloj=time.monotonic):
+        self.memoria = CacheLRU(max_entradas=max_entradas, ttl=ttl, max_bytes=max_bytes, reloj=reloj)
+        self.directorio = Path(directorio) if directorio else None
+        self._en_curso = {}
+        self._lock = threading.Lock()
+        self.esperas = 0
+        self.lecturas_disco = 0
+
+    @property
+    def aciertos(self):
+        return self.memoria.aciertos
+
+    @property
+    def fallos(self):
+        return self.memoria.fallos
+
+    def derivar(self, nombre, funcion, *entradas):
+        """
+        funcion(*entradas), calculada una sola vez por contenido de las entradas
+        """
+        return self.obtener_o_calcular(huella(nombre, *entradas), lambda: funcion(*entradas))
+
+    def obtener_o_calcular(self, clave, calcular):
+        valor = self.memoria.obtener(clave)
+        if valor is not None:
+            return valor
+
+        while True:
+            with self._lock:
+                evento = self._en_curso.get(clave)
+                lider = evento is None
+                if lider:
+                    evento = self._en_curso[clave] = threading.Event()
+            if lider:
+                break
+
+            evento.wait()
+            with self._lock:
+                self.esperas += 1
+            valor = self.memoria.obtener(clave, contar=False)
+            if valor is not None:
+                return valor
+            # El cálculo del líder falló: los que esperaban vuelven a competir y
+            # uno solo reintenta, sin lanzar todos a la vez contra la fuente
+
+        try:
+            # Otro líder pudo terminar entre la primera consulta y tomar el lock
+            valor = self.memoria.obtener(clave, contar=False)
+            return valor if valor is not None else self._calcular(clave, calcular)
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
+            evento.set()
+
+    def _calcular(self, clave, calcular):
+        valor = self._leer_disco(clave)
+        if valor is None:
+            valor = calcular()
+            self._escribir_disco(clave, valor)
+        self.memoria.guardar(clave, valor)
+        return valor
+
+    def _ruta(self, clave):
+        return self.directorio / f"{clave}.parquet"
+
+    def _leer_disco(self, clave):
+        if self.directorio is None or not self._ruta(clave).exists():
+            return None
+        try:
+            valor = pd.read_parquet(self._ruta(clave))
+        except (ImportError, OSError, ValueError, TypeError):
+            return None
+        with self._lock:
+            self.lecturas_disco += 1
+        return valor
+
+    def _escribir_disco(self, clave, valor):
+        """
+        Solo DataFrames; si no se pueden persistir el resultado queda en memoria
+        """
+        if self.directorio is None or not isinstance(valor, pd.DataFrame):
+            return
+        temporal = self._ruta(clave).with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            valor.to_parquet(temporal)
+            # Renombrado atómico: otro proceso nunca lee un archivo a medio escribir
+            os.replace(temporal, self._ruta(clave))
+        except (ImportError, OSError, ValueError, TypeError):
+            temporal.unlink(missing_ok=True)
+
+    def limpiar(self):
+        self.memoria.limpiar()
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                **self.memoria.estadisticas(),
+                "esperas": self.esperas,
+                "lecturas_disco": self.lecturas_disco,
+            }
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+from core.motores import MotorPandas
+
+
+METRICAS = ["ventas", "transacciones"]
+
+# Rollups del cubo (nombre -> dimensiones), todos sobre la tabla base. Se
+# definen una vez y los ejecuta el motor configurado (core/motores)
+ROLLUPS = {
+    "por_producto": ["producto"],
+    "por_tienda": ["tienda_nombre"],
+    "por_fecha": ["fecha"],
+    "por_fecha_producto": ["producto", "fecha"],
+    "por_tienda_producto": ["tienda_nombre", "producto"],
+    "por_producto_tienda": ["producto", "tienda_id", "tienda_nombre"],
+}
+DIMENSIONES_BASE = ["fecha", "producto", "tienda_id", "tienda_nombre"]
+
+
+# ============= CUBO DE AGREGACIONES =============
+@dataclass(frozen=True)
+class CuboVentas:
+    """
+    Agregados fecha x producto x tienda calculados una sola vez.
+    Los DataFrames son compartidos entre reruns: tratarlos como solo lectura
+    """
+    base: pd.DataFrame
+    por_producto: pd.DataFrame
+    por_tienda: pd.DataFrame
+    por_fecha: pd.DataFrame
+    por_fecha_producto: pd.DataFrame
+    por_tienda_producto: pd.DataFrame
+    por_producto_tienda: pd.DataFrame
+    matriz: pd.DataFrame
+
+    @property
+    def total_ventas(self):
+        return self.por_producto["ventas"].sum()
+
+    @property
+    def total_transacciones(self):
+        return self.por_producto["transacciones"].sum()
+
+    def serie_producto(self, producto):
+        """
+        Ventas diarias de un producto
+        """
+        return _filas_producto(self.por_fecha_producto, producto)[["fecha", "ventas"]]
+
+    def tiendas_producto(self, producto):
+        """
+        Ventas y transacciones por tienda de un producto
+        """
+        return _filas_producto(self.por_producto_tienda, producto)[["tienda_id", "tienda_nombre"] + METRICAS]
+
+
+def _filas_producto(df, producto):
+    # df viene ordenado por producto: búsqueda binaria en lugar de una máscara completa
+    productos = df["producto"]
+    inicio = productos.searchsorted(producto, side="left")
+    fin = productos.searchsorted(producto, side="right")
+    return df.iloc[inicio:fin].reset_index(drop=True)
+
+
+def construir_cubo(df_ventas, motor=None):
+    """
+    Agrega las ventas al grano fecha x producto x tienda y precalcula los
+    rollups que consumen los tabs (con pandas si no se indica otro motor)
+    """
+    motor = motor or MotorPandas()
+    base = motor.sumar(df_ventas, DIMENSIONES_BASE, METRICAS)
+    rollups = {nombre: motor.sumar(base, dimensiones, METRICAS) for nombre, dimensiones in ROLLUPS.items()}
+
+    return CuboVentas(base=base, matriz=matriz_ventas(rollups["por_tienda_producto"]), **rollups)
+
+
+def matriz_ventas(por_tienda_producto):
+    """
+    Matriz productos x tiendas de ventas. El pivot parte de un rollup ya chico:
+    queda en pandas con cualquier motor
+    """
+    return por_tienda_producto.pivot_table(
+        index="producto",
+        columns="tienda_nombre",
+        values="ventas",
+        aggfunc="sum",
+        fill_value=0,
+        observed=True
+    )
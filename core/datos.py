@@ -0,0 +1,133 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.cache import CacheDiario, CacheLRU, tamano_bytes
+from core.esquema import normalizar_inventario, normalizar_ventas
+from core.filtros import filtrar, indice_filtros
+
+
+# Espera máxima por dataset antes de dibujar sin él (la carga sigue en segundo plano)
+TIMEOUTS_SEGUNDOS = {"ventas": 60.0, "inventario": 30.0}
+CARGAS_MAX_HILOS = 4
+# Subconjuntos filtrados que retiene cada dataset cargado
+FILTRADOS_MAX_ENTRADAS = 4
+
+
+# ============= DATASET CARGADO + ÍNDICE =============
+class DatasetIndexado:
+    """
+    Un dataset cargado junto con su IndiceFiltros y sus subconjuntos
+    filtrados, en la misma entrada del cache: las posiciones del índice
+    siempre corresponden a este df, nunca a una carga anterior o posterior.
+    El índice se arma la primera vez que se pide
+    """
+
+    def __init__(self, df, clave):
+        self.df = df
+        self.clave = clave
+        self._indice = None
+        self._filtrados = CacheLRU(max_entradas=FILTRADOS_MAX_ENTRADAS)
+        self._lock = threading.Lock()
+        # Tamaño al guardarse en el cache (el índice llega después)
+        self.nbytes = tamano_bytes(df)
+
+    @property
+    def indice(self):
+        with self._lock:
+            if self._indice is None:
+                self._indice = indice_filtros(self.df)
+            return self._indice
+
+    def filtrar(self, clave):
+        """
+        Filas del dataset que cumplen clave (ClaveFiltros dentro de lo cargado)
+        """
+        if clave == self.clave:
+            return self.df
+        return self._filtrados.obtener_o_calcular(clave, lambda: filtrar(self.df, self.indice, clave))
+
+
+# ============= DATASETS CRUDOS =============
+class Datasets:
+    """
+    Ventas e inventario de una fuente, normalizados y con sus caches de proceso.
+    No usa Streamlit: se puede llamar desde hilos (precarga, cargas concurrentes)
+    """
+
+    def __init__(self, fuente, max_entradas=16, ttl=None, timeouts=None, max_hilos=CARGAS_MAX_HILOS):
+        self.fuente = fuente
+        self.timeouts = {**TIMEOUTS_SEGUNDOS, **(timeouts or {})}
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="datasets")
+        self._en_curso = {}
+        # Reentrante: el callback de un Future ya terminado corre dentro de cargar()
+        self._lock = threading.RLock()
+        self.caches = {
+            "ventas": CacheLRU(max_entradas=max_entradas, ttl=ttl),
+            # Debajo del cache por filtros: particiones diarias para no repetir días ya cargados
+            "ventas_dias": CacheDiario(
+                lambda clave: normalizar_ventas(fuente.ventas(clave.a_dict())),
+                ttl=ttl
+            ),
+            "inventario": CacheLRU(max_entradas=max_entradas, ttl=ttl),
+        }
+        self._cargar_fuente = {
+            "ventas": lambda clave: self.caches["ventas_dias"].obtener(clave),
+            "inventario": lambda clave: normalizar_inventario(self.fuente.inventario(clave.a_dict())),
+        }
+        # Datasets que se pueden pedir por nombre (agregar aquí categorías, compras, ...)
+        self.cargadores = {"ventas": self.ventas, "inventario": self.inventario}
+
+    def indexado(self, nombre, clave):
+        """
+        DatasetIndexado de ventas o inventario para la clave: el df y su índice
+        comparten entrada, expiran y se desalojan juntos
+        """
+        return self.caches[nombre].obtener_o_calcular(
+            clave, lambda: DatasetIndexado(self._cargar_fuente[nombre](clave), clave)
+        )
+
+    def ventas(self, clave):
+        return self.indexado("ventas", clave).df
+
+    def inventario(self, clave):
+        return self.indexado("inventario", clave).df
+
+    def precargar(self, clave):
+        """
+        Calienta las particiones diarias de ventas y el inventario. No ocupa el
+        cache de ventas por filtros, que queda para lo pedido en primer plano
+        """
+        if not self.caches["ventas_dias"].contiene(clave):
+            self.caches["ventas_dias"].obtener(clave)
+        self.inventario(clave)
+
+    def precargada(self, clave):
+        return self.caches["ventas_dias"].contiene(clave) and clave in self.caches["inventario"]
+
+    # ============= CARGAS CONCURRENTES =============
+    def cargar(self, nombres, clave):
+        """
+        Lanza en paralelo la carga de cada dataset y devuelve {nombre: Future}.
+        Si la misma carga ya está en curso (otra sesión) se comparte su Future
+        """
+        futuros = {}
+        with self._lock:
+            for nombre in nombres:
+                futuro = self._en_curso.get((nombre, clave))
+                if futuro is None:
+                    futuro = self._pool.submit(self.cargadores[nombre], clave)
+                    self._en_curso[(nombre, clave)] = futuro
+                    futuro.add_done_callback(lambda _, llave=(nombre, clave): self._terminar(llave))
+                futuros[nombre] = futuro
+        return futuros
+
+    def _terminar(self, llave):
+        with self._lock:
+            self._en_curso.pop(llave, None)
+
+    def esperar(self, futuros, nombre):
+        """
+        Resultado de un dataset lanzado con cargar(); TimeoutError si supera su
+        timeout. La carga no se cancela: al terminar queda en el cache
+        """
+        return futuros[nombre].result(timeout=self.timeouts.get(nombre))
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+# ============= DIMENSIONES =============
+def dimension_tiendas(df):
+    """
+    Tabla tienda_id -> tienda_nombre, una fila por tienda (ordenada por nombre).
+    Si la fuente no trae el nombre se deriva del id
+    """
+    if "tienda_nombre" in df.columns:
+        dim = df[["tienda_id", "tienda_nombre"]].drop_duplicates("tienda_id")
+        dim = dim.assign(tienda_nombre=dim["tienda_nombre"].astype(str))
+    else:
+        ids = pd.unique(df["tienda_id"])
+        dim = pd.DataFrame({"tienda_id": ids, "tienda_nombre": [f"Tienda {tienda}" for tienda in ids]})
+    return dim.sort_values("tienda_nombre", kind="stable").reset_index(drop=True)
+
+
+def dimension_productos(*dfs):
+    """
+    Tabla producto_id -> producto con ids densos (0..n-1) en orden alfabético,
+    con los productos de todas las tablas recibidas
+    """
+    productos = pd.Index([], dtype="str")
+    for df in dfs:
+        columna = df["producto"]
+        if isinstance(columna.dtype, pd.CategoricalDtype):
+            productos = productos.union(columna.cat.categories)
+        else:
+            productos = productos.union(pd.Index(pd.unique(columna.dropna())))
+    return pd.DataFrame({"producto_id": np.arange(len(productos), dtype=np.int32), "producto": productos})
+
+
+def ids_productos(columna, dim):
+    """
+    producto_id de cada fila (-1 si no está en la dimensión). Con categóricos
+    se resuelve una vez por categoría y se expande por códigos
+    """
+    indice = pd.Index(dim["producto"])
+    if isinstance(columna.dtype, pd.CategoricalDtype):
+        por_codigo = np.append(indice.get_indexer(columna.cat.categories), -1)
+        return por_codigo[columna.cat.codes.to_numpy()]
+    return indice.get_indexer(columna)
+
+
+def claves_producto_tienda(df, dim_productos, tiendas):
+    """
+    Clave entera densa de cada fila producto x tienda: producto_id * n_tiendas
+    + posición de su tienda_id en tiendas. -1 si alguna de las dos no existe
+    """
+    producto_id = ids_productos(df["producto"], dim_productos).astype(np.int64)
+    tienda = pd.Index(tiendas).get_indexer(df["tienda_id"].to_numpy())
+    return np.where((producto_id >= 0) & (tienda >= 0), producto_id * len(tiendas) + tienda, -1)
+
+
+def categoria_producto(producto):
+    """
+    Categoría de cada producto: la primera palabra del nombre
+    ("BOLSO EPONA - BLACK/GOLD - UNICA" -> "BOLSO"). Con categóricos se
+    calcula por categoría
+    """
+    if isinstance(producto.dtype, pd.CategoricalDtype):
+        categorias = producto.cat.categories.str.split().str[0]
+        return pd.Series(
+            categorias.take(producto.cat.codes.to_numpy(), allow_fill=True, fill_value=np.nan),
+            index=producto.index
+        )
+    return producto.str.split().str[0]
+
+
+def _nombre_tienda(tienda_id, dim):
+    """
+    Columna tienda_nombre categórica construida desde la dimensión por códigos,
+    sin repetir un string por fila
+    """
+    categorias = pd.Index(pd.unique(dim["tienda_nombre"]))
+    codigo_por_id = pd.Series(categorias.get_indexer(dim["tienda_nombre"]), index=dim["tienda_id"].to_numpy())
+    codigos = codigo_por_id.reindex(tienda_id.to_numpy()).fillna(-1).astype(np.int32).to_numpy()
+    return pd.Categorical.from_codes(codigos, categories=categorias)
+
+
+# ============= NORMALIZACIÓN DE ESQUEMA =============
+def _categoria(columna):
+    return columna.astype(pd.CategoricalDtype(sorted(pd.unique(columna.dropna()))))
+
+
+def _entero_compacto(columna):
+    return pd.to_numeric(columna, downcast="integer")
+
+
+def normalizar_ventas(df):
+    """
+    Tipos compactos para las ventas: fecha datetime64, producto y tienda_nombre
+    categóricos y métricas enteras con el menor tamaño que las contiene
+    """
+    if isinstance(df["producto"].dtype, pd.CategoricalDtype) and df["fecha"].dtype.kind == "M":
+        return df
+    dim = dimension_tiendas(df)
+    return pd.DataFrame({
+        "fecha": pd.to_datetime(df["fecha"], format="%Y-%m-%d"),
+        "producto": _categoria(df["producto"]),
+        "tienda_id": _entero_compacto(df["tienda_id"]),
+        "tienda_nombre": _nombre_tienda(df["tienda_id"], dim),
+        "ventas": _entero_compacto(df["ventas"]),
+        "transacciones": _entero_compacto(df["transacciones"]),
+    })
+
+
+def normalizar_inventario(df):
+    """
+    Tipos compactos para el inventario actual
+    """
+    if isinstance(df["producto"].dtype, pd.CategoricalDtype):
+        return df
+    dim = dimension_tiendas(df)
+    normalizado = pd.DataFrame({
+        "producto": _categoria(df["producto"]),
+        "tienda_id": _entero_compacto(df["tienda_id"]),
+        "tienda_nombre": _nombre_tienda(df["tienda_id"], dim),
+    })
+    for columna in ["stock_actual", "stock_minimo", "stock_maximo", "costo_unitario", "valor_inventario"]:
+        normalizado[columna] = _entero_compacto(df[columna])
+    return normalizado
+
+
+def concatenar(partes):
+    """
+    pd.concat que conserva las columnas categóricas aunque cada parte tenga
+    categorías distintas (pd.concat las convertiría a object)
+    """
+    partes = list(partes)
+    if not partes:
+        return pd.DataFrame()
+    columnas = partes[0].columns
+    categoricas = [c for c in columnas if isinstance(partes[0][c].dtype, pd.CategoricalDtype)]
+    resultado = pd.concat([parte.drop(columns=categoricas) for parte in partes], ignore_index=True)
+    for columna in categoricas:
+        resultado[columna] = union_categoricals([parte[columna] for parte in partes], sort_categories=True)
+    return resultado[columnas]
+
+
+# ============= REPORTE DE MEMORIA =============
+def reporte_memoria(antes, despues):
+    """
+    Memoria por columna antes y después de normalizar, en MB
+    """
+    mb_antes = antes.memory_usage(deep=True, index=False) / 1e6
+    mb_despues = despues.memory_usage(deep=True, index=False) / 1e6
+    reporte = pd.DataFrame({
+        "dtype_antes": antes.dtypes.astype(str),
+        "dtype_despues": despues.dtypes.astype(str),
+        "mb_antes": mb_antes,
+        "mb_despues": mb_despues,
+    })
+    reporte.loc["TOTAL"] = ["", "", mb_antes.sum(), mb_despues.sum()]
+    reporte["ahorro_pct"] = (1 - reporte["mb_despues"] / reporte["mb_antes"]) * 100
+    return reporte.round(2)
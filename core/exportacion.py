@@ -0,0 +1,102 @@
+import gzip
+import io
+import tempfile
+
+
+# Filas serializadas por bloque: acota la memoria de la escritura a un bloque
+FILAS_POR_BLOQUE = 50_000
+FORMATOS = {
+    "CSV": {"extension": ".csv", "mime": "text/csv"},
+    "CSV (gzip)": {"extension": ".csv.gz", "mime": "application/gzip"},
+    "Parquet": {"extension": ".parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+
+# ============= ESCRITURA POR BLOQUES =============
+def _bloques(df, filas_por_bloque):
+    for inicio in range(0, len(df), filas_por_bloque):
+        yield df.iloc[inicio:inicio + filas_por_bloque]
+
+
+def escribir_csv(df, destino, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    CSV UTF-8 escrito bloque a bloque en un archivo binario: nunca existe el
+    texto completo en memoria. El encabezado va solo con el primer bloque
+    """
+    texto = io.TextIOWrapper(destino, encoding="utf-8", newline="", write_through=True)
+    try:
+        if df.empty:
+            df.to_csv(texto, index=False)
+        for i, bloque in enumerate(_bloques(df, filas_por_bloque)):
+            bloque.to_csv(texto, index=False, header=i == 0)
+    finally:
+        # Se separa el wrapper para que cerrarlo no cierre el destino
+        texto.detach()
+
+
+def escribir_csv_gzip(df, destino, filas_por_bloque=FILAS_POR_BLOQUE):
+    with gzip.GzipFile(fileobj=destino, mode="wb") as comprimido:
+        escribir_csv(df, comprimido, filas_por_bloque)
+
+
+def escribir_parquet(df, destino, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Parquet con un row group por bloque (requiere pyarrow)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    esquema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for bloque in _bloques(df, filas_por_bloque):
+            escritor.write_table(pa.Table.from_pandas(bloque, schema=esquema, preserve_index=False))
+
+
+ESCRITORES = {
+    "CSV": escribir_csv,
+    "CSV (gzip)": escribir_csv_gzip,
+    "Parquet": escribir_parquet,
+}
+
+
+def formatos_disponibles():
+    """
+    Formatos de exportación que se pueden generar con las dependencias instaladas
+    """
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return [formato for formato in FORMATOS if formato != "Parquet"]
+    return list(FORMATOS)
+
+
+def exportar(df, formato, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Serializa df en un archivo temporal en disco y lo devuelve sin buffer y
+    posicionado al inicio. Se borra al cerrarse
+    """
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato de exportación no soportado: {formato}")
+    archivo = tempfile.TemporaryFile(buffering=0)
+    try:
+        escritura = io.BufferedWriter(archivo)
+        ESCRITORES[formato](df, escritura, filas_por_bloque)
+        escritura.flush()
+        escritura.detach()
+    except Exception:
+        archivo.close()
+        raise
+    archivo.seek(0)
+    return archivo
+
+
+def exportar_bytes(df, formato, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Contenido del archivo exportado, leído una vez del temporal (que se
+    cierra y se borra). Es lo que necesita st.download_button: Streamlit
+    guarda la descarga completa en memoria, así que el pico es el tamaño del
+    archivo final (menor con gzip o Parquet) más un bloque, no el texto CSV
+    completo más su copia codificada
+    """
+    with exportar(df, formato, filas_por_bloque) as archivo:
+        return archivo.read()
@@ -0,0 +1,179 @@
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from core.esquema import categoria_producto
+
+
+# Dimensiones de los filtros de la barra lateral, en el orden en que se muestran
+DIMENSIONES_FILTRO = ["fecha", "categoria", "tienda_id", "producto"]
+
+
+# ============= CLAVE CANÓNICA DE FILTROS =============
+@dataclass(frozen=True)
+class ClaveFiltros:
+    """
+    Versión inmutable y canónica del dict de filtros: dos combinaciones
+    equivalentes (mismas tiendas en otro orden, duplicados) dan la misma clave.
+    Ordenar no cambia los datos: las fuentes responden por identidad de
+    producto y tienda, no por posición en la lista
+    """
+    fecha_inicio: str
+    fecha_fin: str
+    tiendas: tuple = ()
+    productos: tuple = ()
+    categorias: tuple = ()
+
+    @classmethod
+    def desde_dict(cls, filtros):
+        return cls(
+            fecha_inicio=filtros["dates"]["fecha_inicio"],
+            fecha_fin=filtros["dates"]["fecha_fin"],
+            tiendas=tuple(sorted(set(filtros.get("stores") or []))),
+            productos=tuple(sorted(set(filtros.get("products") or []))),
+            categorias=tuple(sorted(set(filtros.get("categories") or []))),
+        )
+
+    def a_dict(self):
+        """
+        Dict con la forma que esperan las fuentes de datos
+        """
+        return {
+            "dates": {"fecha_inicio": self.fecha_inicio, "fecha_fin": self.fecha_fin},
+            "stores": list(self.tiendas),
+            "products": list(self.productos),
+            "categories": list(self.categorias),
+        }
+
+    def seleccion(self):
+        """
+        La clave como selección de IndiceFiltros: el rango de fechas es un
+        slice inclusivo sobre los días y las listas vacías no filtran
+        """
+        return {
+            "fecha": slice(self.fecha_inicio or None, self.fecha_fin or None),
+            "categoria": self.categorias,
+            "tienda_id": self.tiendas,
+            "producto": self.productos,
+        }
+
+    def sin_fechas(self):
+        """
+        La misma selección de tiendas, productos y categorías para cualquier rango
+        """
+        return replace(self, fecha_inicio="", fecha_fin="")
+
+
+# ============= ÍNDICE DE FILTROS (BITMAPS) =============
+def _bitmaps_por_valor(codigos, n_valores, n_filas):
+    """
+    Un bitmap (palabras uint64, bit i = fila i) por valor: la fila queda
+    marcada en el bitmap de su código
+    """
+    bitmaps = np.zeros((n_valores, (n_filas + 63) // 64), dtype=np.uint64)
+    filas = np.flatnonzero(codigos >= 0)
+    bits = np.left_shift(np.uint64(1), (filas & 63).astype(np.uint64))
+    np.bitwise_or.at(bitmaps, (codigos[filas], filas >> 6), bits)
+    return bitmaps
+
+
+def _sin_filtro(valores):
+    if isinstance(valores, slice):
+        return valores.start is None and valores.stop is None
+    return valores is None or not len(valores)
+
+
+class IndiceFiltros:
+    """
+    Bitmaps precalculados por valor de cada dimensión de una tabla (tienda,
+    producto, categoría, día...). Una combinación de filtros se evalúa con
+    OR de los valores elegidos dentro de cada dimensión y AND entre
+    dimensiones, sobre palabras de 64 filas; los conteos por opción son
+    popcounts. La selección es un dict dimensión -> valores (vacío o None:
+    sin filtrar esa dimensión) o slice(desde, hasta) inclusivo sobre los
+    valores ordenados, que es como se pide un rango de fechas. Las
+    dimensiones que la tabla no indexa se ignoran (el inventario no tiene fecha)
+    """
+
+    def __init__(self, df, dimensiones):
+        self.n_filas = len(df)
+        self.valores = {}
+        self._bitmaps = {}
+        for dimension in dimensiones:
+            codigos, valores = pd.factorize(df[dimension], sort=True)
+            self.valores[dimension] = pd.Index(valores)
+            self._bitmaps[dimension] = _bitmaps_por_valor(codigos, len(valores), self.n_filas)
+        # Todas las filas: unos salvo los bits sobrantes de la última palabra
+        self._todas = np.full((self.n_filas + 63) // 64, np.iinfo(np.uint64).max, dtype=np.uint64)
+        if self.n_filas % 64:
+            self._todas[-1] = np.uint64((1 << (self.n_filas % 64)) - 1)
+
+    def _mascara_dimension(self, dimension, valores):
+        if isinstance(valores, slice):
+            # Valores ordenados: un rango es un tramo contiguo de bitmaps
+            bitmaps = self._bitmaps[dimension][self.valores[dimension].slice_indexer(valores.start, valores.stop)]
+        else:
+            posiciones = self.valores[dimension].get_indexer(list(valores))
+            bitmaps = self._bitmaps[dimension][posiciones[posiciones >= 0]]
+        if not len(bitmaps):
+            return np.zeros_like(self._todas)
+        return np.bitwise_or.reduce(bitmaps, axis=0)
+
+    def mascara(self, seleccion, excepto=None):
+        """
+        Bitmap de las filas que cumplen la selección (ignorando la dimensión excepto)
+        """
+        resultado = self._todas.copy()
+        for dimension, valores in seleccion.items():
+            if dimension != excepto and dimension in self._bitmaps and not _sin_filtro(valores):
+                resultado &= self._mascara_dimension(dimension, valores)
+        return resultado
+
+    def contar(self, seleccion):
+        return int(np.bitwise_count(self.mascara(seleccion)).sum())
+
+    def posiciones(self, seleccion):
+        """
+        Posiciones (ordenadas) de las filas que cumplen la selección
+        """
+        bytes_ = self.mascara(seleccion).astype("<u8", copy=False).view(np.uint8)
+        return np.flatnonzero(np.unpackbits(bytes_, bitorder="little")[:self.n_filas])
+
+    def conteos(self, seleccion):
+        """
+        Filas por opción de cada dimensión, con los filtros de las demás
+        dimensiones aplicados: lo que quedaría al elegir esa opción
+        """
+        return {
+            dimension: pd.Series(
+                np.bitwise_count(bitmaps & self.mascara(seleccion, excepto=dimension)).sum(axis=1),
+                index=self.valores[dimension]
+            )
+            for dimension, bitmaps in self._bitmaps.items()
+        }
+
+    @property
+    def nbytes(self):
+        return sum(bitmaps.nbytes for bitmaps in self._bitmaps.values()) + self._todas.nbytes
+
+
+def indice_filtros(df):
+    """
+    IndiceFiltros de ventas o inventario con las dimensiones de la barra
+    lateral que tenga la tabla; la categoría se deriva del producto
+    """
+    df = df.assign(categoria=categoria_producto(df["producto"]))
+    return IndiceFiltros(df, [dimension for dimension in DIMENSIONES_FILTRO if dimension in df.columns])
+
+
+def filtrar(df, indice, clave):
+    """
+    Filas de df (la tabla indexada) que cumplen la clave, en su orden, con
+    las categorías que no quedaron descartadas para no arrastrar opciones vacías
+    """
+    df = df.take(indice.posiciones(clave.seleccion())).reset_index(drop=True)
+    for columna in df.columns:
+        if isinstance(df[columna].dtype, pd.CategoricalDtype):
+            df[columna] = df[columna].cat.remove_unused_categories()
+    return df
@@ -0,0 +1,218 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+from core.arrow import a_pandas_compacto, arrow_disponible, tabla_desde_cursor
+from core.esquema import categoria_producto
+from core.simulador import get_inventory_data, get_sales_data
+
+
+# Variable de entorno que elige la fuente: "simulada" o "sqlite:///ruta/a/base.db"
+VARIABLE_FUENTE = "DASHBOARD_FUENTE"
+
+COLUMNAS_VENTAS = ["fecha", "producto", "tienda_id", "tienda_nombre", "ventas", "transacciones"]
+COLUMNAS_INVENTARIO = [
+    "producto", "tienda_id", "tienda_nombre", "stock_actual", "stock_minimo",
+    "stock_maximo", "costo_unitario", "valor_inventario"
+]
+
+
+# ============= FUENTE SIMULADA =============
+class FuenteSimulada:
+    """
+    Fuente de datos que usa los simuladores locales
+    """
+
+    def ventas(self, filtros):
+        return get_sales_data(filtros)
+
+    def inventario(self, filtros):
+        return get_inventory_data(filtros)
+
+
+# ============= POOL DE CONEXIONES =============
+class PoolConexiones:
+    """
+    Pool de conexiones DB-API reutilizables (keep-alive) y seguro entre hilos
+    """
+
+    def __init__(self, conectar, tamano=4):
+        self._conectar = conectar
+        self._libres = queue.LifoQueue(maxsize=tamano)
+        self._semaforo = threading.BoundedSemaphore(tamano)
+
+    @contextmanager
+    def conexion(self):
+        self._semaforo.acquire()
+        try:
+            try:
+                conexion = self._libres.get_nowait()
+            except queue.Empty:
+                conexion = self._conectar()
+            try:
+                yield conexion
+            except Exception:
+                # La conexión puede haber quedado en mal estado: se descarta
+                conexion.close()
+                raise
+            else:
+                self._libres.put_nowait(conexion)
+        finally:
+            self._semaforo.release()
+
+    def cerrar(self):
+        while True:
+            try:
+                self._libres.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# ============= FUENTE SQL =============
+class FuenteSQL:
+    """
+    Fuente de datos sobre un backend SQL (fact_daily_sales e inventario_actual).
+    Los filtros se traducen a WHERE y la agregación se hace con GROUP BY en el
+    servidor, de modo que a pandas solo llegan filas ya agregadas.
+
+    paramstyle: "qmark" (sqlite3, duckdb) o "format" (psycopg, pymysql)
+    """
+
+    def __init__(self, pool, paramstyle="qmark"):
+        self.pool = pool
+        self._marcador = "?" if paramstyle == "qmark" else "%s"
+
+    def _where(self, filtros, con_fechas=True):
+        condiciones, parametros = [], []
+        if con_fechas:
+            condiciones.append(f"fecha BETWEEN {self._marcador} AND {self._marcador}")
+            parametros += [filtros["dates"]["fecha_inicio"], filtros["dates"]["fecha_fin"]]
+        for columna, valores in (
+            ("tienda_id", filtros.get("stores")),
+            ("producto", filtros.get("products")),
+            ("categoria", filtros.get("categories")),
+        ):
+            if valores:
+                marcadores = ", ".join([self._marcador] * len(valores))
+                condiciones.append(f"{columna} IN ({marcadores})")
+                parametros += list(valores)
+        where = " AND ".join(condiciones) if condiciones else "1 = 1"
+        return where, parametros
+
+    def consultar(self, sql, parametros=()):
+        if arrow_disponible():
+            return self.consultar_arrow(sql, parametros).to_pandas()
+        with self.pool.conexion() as conexion:
+            cursor = conexion.cursor()
+            try:
+                cursor.execute(sql, parametros)
+                columnas = [descripcion[0] for descripcion in cursor.description]
+                return pd.DataFrame.from_records(cursor.fetchall(), columns=columnas)
+            finally:
+                cursor.close()
+
+    def consultar_arrow(self, sql, parametros=()):
+        """
+        Resultado como pyarrow.Table (requiere pyarrow)
+        """
+        with self.pool.conexion() as conexion:
+            cursor = conexion.cursor()
+            try:
+                cursor.execute(sql, parametros)
+                return tabla_desde_cursor(cursor)
+            finally:
+                cursor.close()
+
+    def _consultar_compacto(self, sql, parametros, columnas, fechas=()):
+        # Con Arrow las filas se decodifican directo al esquema compacto de core/esquema
+        if not arrow_disponible():
+            return self.consultar(sql, parametros)[columnas]
+        tabla = self.consultar_arrow(sql, parametros).select(columnas)
+        return a_pandas_compacto(tabla, fechas=fechas, categoricas=["producto", "tienda_nombre"])
+
+    def ventas(self, filtros):
+        where, parametros = self._where(filtros)
+        sql = f"""
+            SELECT fecha, producto, tienda_id, tienda_nombre,
+                   SUM(ventas) AS ventas, SUM(transacciones) AS transacciones
+            FROM fact_daily_sales
+            WHERE {where}
+            GROUP BY fecha, producto, tienda_id, tienda_nombre
+            ORDER BY producto, tienda_id, fecha
+        """
+        return self._consultar_compacto(sql, parametros, COLUMNAS_VENTAS, fechas=["fecha"])
+
+    def inventario(self, filtros):
+        where, parametros = self._where(filtros, con_fechas=False)
+        sql = f"""
+            SELECT producto, tienda_id, tienda_nombre, stock_actual, stock_minimo,
+                   stock_maximo, costo_unitario, stock_actual * costo_unitario AS valor_inventario
+            FROM inventario_actual
+            WHERE {where}
+            ORDER BY producto, tienda_id
+        """
+        return self._consultar_compacto(sql, parametros, COLUMNAS_INVENTARIO)
+
+    def agregar(self, filtros, dimensiones):
+        """
+        Suma ventas y transacciones por las dimensiones pedidas en el servidor
+        """
+        permitidas = {"fecha", "producto", "categoria", "tienda_id", "tienda_nombre"}
+        if not set(dimensiones) <= permitidas:
+            raise ValueError(f"Dimensiones no soportadas: {sorted(set(dimensiones) - permitidas)}")
+        columnas = ", ".join(dimensiones)
+        where, parametros = self._where(filtros)
+        sql = f"""
+            SELECT {columnas}, SUM(ventas) AS ventas, SUM(transacciones) AS transacciones
+            FROM fact_daily_sales
+            WHERE {where}
+            GROUP BY {columnas}
+            ORDER BY {columnas}
+        """
+        return self.consultar(sql, parametros)
+
+
+# ============= BASE LOCAL DE PRUEBA =============
+def conectar_sqlite(ruta):
+    """
+    Fábrica de conexiones SQLite utilizables desde los hilos de Streamlit
+    """
+    def conectar():
+        return sqlite3.connect(ruta, check_same_thread=False)
+    return conectar
+
+
+def crear_base_demo(ruta, filtros):
+    """
+    Crea una base SQLite con el esquema del backend, poblada con los simuladores
+    """
+    df_ventas = get_sales_data(filtros)
+    df_inventario = get_inventory_data(filtros)
+    for df in (df_ventas, df_inventario):
+        df["categoria"] = categoria_producto(df["producto"])
+
+    with sqlite3.connect(ruta) as conexion:
+        df_ventas.to_sql("fact_daily_sales", conexion, if_exists="replace", index=False)
+        df_inventario.drop(columns="valor_inventario").to_sql(
+            "inventario_actual", conexion, if_exists="replace", index=False
+        )
+        conexion.execute(
+            "CREATE INDEX IF NOT EXISTS ix_ventas_fecha ON fact_daily_sales (fecha, tienda_id, producto)"
+        )
+    return ruta
+
+
+def fuente_desde_entorno():
+    """
+    Construye la fuente configurada en DASHBOARD_FUENTE (simulada por defecto)
+    """
+    configuracion = os.environ.get(VARIABLE_FUENTE, "simulada")
+    if configuracion == "simulada":
+        return FuenteSimulada()
+    if configuracion.startswith("sqlite:///"):
+        return FuenteSQL(PoolConexiones(conectar_sqlite(configuracion[len("sqlite:///"):])))
+    raise ValueError(f"{VARIABLE_FUENTE} no reconocida: {configuracion!r}")
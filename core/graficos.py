@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+
+# Presupuesto de puntos por serie y umbral de puntos totales para usar WebGL
+MAX_PUNTOS_SERIE = 1000
+UMBRAL_WEBGL = 2000
+# Series que se dibujan por separado; el resto se agrupa en "Otros"
+TOP_SERIES = 10
+ETIQUETA_OTROS = "Otros"
+
+
+# ============= REDUCCIÓN DE PUNTOS =============
+def _a_numero(x):
+    x = pd.Series(x)
+    if x.dtype.kind == "M":
+        return x.astype("int64").to_numpy(dtype="float64")
+    return pd.to_numeric(x, errors="coerce").to_numpy(dtype="float64")
+
+
+def indices_lttb(x, y, n_salida):
+    """
+    Largest-Triangle-Three-Buckets: elige n_salida puntos que conservan la forma
+    visual de la serie. x debe venir ordenado
+    """
+    n = len(y)
+    if n_salida >= n or n_salida < 3:
+        return np.arange(n)
+    x = _a_numero(x)
+    y = np.asarray(y, dtype="float64")
+
+    # Cubetas interiores (el primer y el último punto se conservan siempre)
+    bordes = np.linspace(1, n - 1, n_salida - 1).astype(np.int64)
+    seleccion = np.empty(n_salida, dtype=np.int64)
+    seleccion[0], seleccion[-1] = 0, n - 1
+    anterior = 0
+    for i in range(n_salida - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        # Promedio de la cubeta siguiente como tercer vértice del triángulo
+        sig_inicio, sig_fin = fin, bordes[i + 2] if i + 2 < len(bordes) else n
+        x_prom = x[sig_inicio:sig_fin].mean()
+        y_prom = y[sig_inicio:sig_fin].mean()
+        areas = np.abs(
+            (x[anterior] - x_prom) * (y[inicio:fin] - y[anterior])
+            - (x[anterior] - x[inicio:fin]) * (y_prom - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        seleccion[i + 1] = anterior
+    return seleccion
+
+
+def indices_minmax(y, n_salida):
+    """
+    Conserva el mínimo y el máximo de cada cubeta (picos incluidos), vectorizado
+    """
+    n = len(y)
+    if n_salida >= n or n_salida < 2:
+        return np.arange(n)
+    y = np.asarray(y, dtype="float64")
+    bordes = np.linspace(0, n, n_salida // 2 + 1).astype(np.int64)[:-1]
+    cubeta = np.repeat(np.arange(len(bordes)), np.diff(np.append(bordes, n)))
+    orden = np.lexsort((y, cubeta))
+    primero = np.searchsorted(cubeta[orden], np.arange(len(bordes)), side="left")
+    ultimo = np.searchsorted(cubeta[orden], np.arange(len(bordes)), side="right") - 1
+    return np.unique(np.concatenate([orden[primero], orden[ultimo]]))
+
+
+def reducir_serie(df, x, y, max_puntos=MAX_PUNTOS_SERIE, metodo="lttb"):
+    """
+    Submuestrea una serie (ordenada por x) si supera el presupuesto de puntos
+    """
+    if len(df) <= max_puntos:
+        return df
+    df = df.sort_values(x, kind="stable")
+    if metodo == "minmax":
+        posiciones = indices_minmax(df[y].to_numpy(), max_puntos)
+    else:
+        posiciones = indices_lttb(df[x].to_numpy(), df[y].to_numpy(), max_puntos)
+    return df.iloc[posiciones]
+
+
+def top_n_con_otros(df, x, y, color, n=TOP_SERIES, etiqueta=ETIQUETA_OTROS):
+    """
+    Mantiene las n series con mayor total de y y suma el resto en una sola
+    serie "Otros" por cada x
+    """
+    totales = df.groupby(color, observed=True)[y].sum().sort_values(ascending=False)
+    if len(totales) <= n:
+        return df[[x, color, y]]
+    principales = totales.index[:n]
+    es_principal = df[color].isin(principales)
+    otros = df.loc[~es_principal].groupby(x, observed=True, as_index=False)[y].sum()
+    otros[color] = etiqueta
+    return pd.concat(
+        [df.loc[es_principal, [x, color, y]].astype({color: str}), otros[[x, color, y]]],
+        ignore_index=True
+    )
+
+
+def reducir_series(df, x, y, color, max_puntos=MAX_PUNTOS_SERIE, top=TOP_SERIES, metodo="lttb"):
+    """
+    Prepara un gráfico multi-serie: top-N + "Otros" y luego submuestreo por serie
+    """
+    df = top_n_con_otros(df, x, y, color, n=top)
+    puntos_por_serie = df.groupby(color, observed=True).size()
+    if puntos_por_serie.empty or puntos_por_serie.max() <= max_puntos:
+        return df
+    partes = [
+        reducir_serie(parte, x, y, max_puntos=max_puntos, metodo=metodo)
+        for _, parte in df.groupby(color, observed=True, sort=False)
+    ]
+    return pd.concat(partes, ignore_index=True)
+
+
+def usar_webgl(n_puntos, umbral=UMBRAL_WEBGL):
+    return n_puntos > umbral
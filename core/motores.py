@@ -0,0 +1,181 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # motores opcionales: sin ellos se usa pandas
+    duckdb = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+# Variable de entorno que elige el motor: "auto" (el primero disponible de
+# MOTORES_PREFERIDOS), "duckdb", "polars", "arrow" o "pandas"
+VARIABLE_MOTOR = "DASHBOARD_MOTOR"
+MOTORES_PREFERIDOS = ["duckdb", "polars", "arrow", "pandas"]
+
+
+# ============= CÓDIGOS DE CATEGÓRICOS =============
+# Los motores columnares agrupan por los códigos enteros de los categóricos:
+# agrupar enteros es más barato que strings y ordenar por código respeta el
+# orden de las categorías, igual que groupby(sort=True) de pandas
+
+
+def _a_codigos(df, dimensiones, metricas):
+    """
+    Columnas necesarias con los categóricos reemplazados por sus códigos y
+    las filas con alguna dimensión nula descartadas (como hace groupby)
+    """
+    columnas, categorias = {}, {}
+    validas = np.ones(len(df), dtype=bool)
+    for nombre in dimensiones:
+        columna = df[nombre]
+        if isinstance(columna.dtype, pd.CategoricalDtype):
+            categorias[nombre] = columna.cat.categories
+            columnas[nombre] = columna.cat.codes.to_numpy()
+            validas &= columnas[nombre] >= 0
+        else:
+            columnas[nombre] = columna.to_numpy()
+            validas &= columna.notna().to_numpy()
+    for nombre in metricas:
+        columnas[nombre] = df[nombre].to_numpy()
+    tabla = pd.DataFrame(columnas)
+    return (tabla if validas.all() else tabla[validas]), categorias
+
+
+def _desde_codigos(resultado, referencia, categorias, metricas):
+    """
+    Devuelve a cada dimensión el tipo de la tabla original y compacta las métricas
+    """
+    columnas = {}
+    for nombre in resultado.columns:
+        if nombre in categorias:
+            codigos = resultado[nombre].to_numpy().astype(np.int32)
+            columnas[nombre] = pd.Categorical.from_codes(
+                codigos, dtype=referencia[nombre].dtype
+            )
+        elif nombre in metricas:
+            columnas[nombre] = pd.to_numeric(resultado[nombre], downcast="integer").to_numpy()
+        else:
+            columnas[nombre] = resultado[nombre].astype(referencia[nombre].dtype).to_numpy()
+    return pd.DataFrame(columnas)
+
+
+# ============= MOTORES =============
+class MotorPandas:
+    """
+    groupby de pandas en el proceso de Streamlit (siempre disponible)
+    """
+    nombre = "pandas"
+
+    def sumar(self, df, dimensiones, metricas):
+        return df.groupby(dimensiones, observed=True, sort=True)[metricas].sum().reset_index()
+
+
+class _MotorColumnar:
+    """
+    Base de los motores columnares: traduce categóricos a códigos, delega la
+    agregación en _agrupar y restaura los tipos del resultado
+    """
+    nombre = None
+
+    def sumar(self, df, dimensiones, metricas):
+        tabla, categorias = _a_codigos(df, dimensiones, metricas)
+        resultado = self._agrupar(tabla, dimensiones, metricas)
+        return _desde_codigos(resultado, df, categorias, metricas)
+
+    def _agrupar(self, tabla, dimensiones, metricas):
+        """
+        Suma de metricas por dimensiones, ordenada por dimensiones, como DataFrame
+        """
+        raise NotImplementedError
+
+
+class MotorDuckDB(_MotorColumnar):
+    """
+    GROUP BY de DuckDB sobre el DataFrame sin copiarlo, con todos los núcleos
+    """
+    nombre = "duckdb"
+
+    def _agrupar(self, tabla, dimensiones, metricas):
+        columnas = ", ".join(f'"{nombre}"' for nombre in dimensiones)
+        sumas = ", ".join(f'SUM("{nombre}")::BIGINT AS "{nombre}"' for nombre in metricas)
+        # Una conexión en memoria por consulta: las sesiones de Streamlit corren en hilos distintos
+        with duckdb.connect() as conexion:
+            conexion.register("tabla", tabla)
+            return conexion.execute(
+                f"SELECT {columnas}, {sumas} FROM tabla GROUP BY {columnas} ORDER BY {columnas}"
+            ).df()
+
+
+class MotorPolars(_MotorColumnar):
+    """
+    group_by de un LazyFrame de Polars (multihilo)
+    """
+    nombre = "polars"
+
+    def _agrupar(self, tabla, dimensiones, metricas):
+        return (
+            pl.from_pandas(tabla).lazy()
+            .group_by(dimensiones)
+            .agg([pl.col(nombre).sum().cast(pl.Int64) for nombre in metricas])
+            .sort(dimensiones)
+            .collect()
+            .to_pandas()
+        )
+
+
+class MotorArrow(_MotorColumnar):
+    """
+    group_by de pyarrow (motor Acero, multihilo)
+    """
+    nombre = "arrow"
+
+    def _agrupar(self, tabla, dimensiones, metricas):
+        resultado = (
+            pa.Table.from_pandas(tabla, preserve_index=False)
+            .group_by(dimensiones)
+            .aggregate([(nombre, "sum") for nombre in metricas])
+            .rename_columns(list(dimensiones) + list(metricas))
+            .sort_by([(nombre, "ascending") for nombre in dimensiones])
+        )
+        return resultado.to_pandas()
+
+
+MOTORES = {
+    "duckdb": (MotorDuckDB, lambda: duckdb is not None),
+    "polars": (MotorPolars, lambda: pl is not None),
+    "arrow": (MotorArrow, lambda: pa is not None),
+    "pandas": (MotorPandas, lambda: True),
+}
+
+
+def motores_disponibles():
+    return [nombre for nombre in MOTORES_PREFERIDOS if MOTORES[nombre][1]()]
+
+
+def crear_motor(nombre="auto"):
+    """
+    Motor por nombre; "auto" elige el primero instalado. Un motor pedido que
+    no está instalado cae a pandas
+    """
+    if nombre == "auto":
+        nombre = motores_disponibles()[0]
+    if nombre not in MOTORES:
+        raise ValueError(f"{VARIABLE_MOTOR} no reconocido: {nombre!r}")
+    clase, disponible = MOTORES[nombre]
+    return clase() if disponible() else MotorPandas()
+
+
+def motor_desde_entorno():
+    return crear_motor(os.environ.get(VARIABLE_MOTOR, "auto"))
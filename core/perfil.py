@@ -0,0 +1,172 @@
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+
+EJECUCIONES_HISTORIAL = 20
+_BYTES_PAGINA = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# ============= MEDICIONES =============
+def memoria_rss():
+    """
+    Memoria residente del proceso en bytes (Linux). Es de todo el proceso: con
+    varias sesiones a la vez el delta de una etapa incluye las demás
+    """
+    try:
+        with open("/proc/self/statm") as archivo:
+            return int(archivo.read().split()[1]) * _BYTES_PAGINA
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _contadores(caches):
+    return {
+        nombre: {"aciertos": cache.aciertos, "fallos": cache.fallos}
+        for nombre, cache in (caches or {}).items()
+        if hasattr(cache, "aciertos")
+    }
+
+
+# ============= EJECUCIÓN (UN RERUN) =============
+class Ejecucion:
+    """
+    Tramos con nombre de un rerun: duración, delta de memoria y aciertos/fallos
+    de los caches entre el inicio y el cierre
+    """
+
+    def __init__(self, tipo="rerun", caches=None, reloj=time.perf_counter, memoria=memoria_rss):
+        self.tipo = tipo
+        self.inicio = datetime.now().isoformat(timespec="milliseconds")
+        self.tramos = []
+        self.cache = {}
+        self.ms_total = None
+        self.mb_delta = None
+        self._caches = caches
+        self._contadores_inicio = _contadores(caches)
+        self._reloj = reloj
+        self._memoria = memoria
+        self._pila = []  # (registro, t0, m0) de los tramos abiertos
+        self._t0 = reloj()
+        self._m0 = memoria()
+
+    @property
+    def cerrada(self):
+        return self.ms_total is not None
+
+    @contextmanager
+    def tramo(self, nombre):
+        """
+        Mide el bloque; los tramos anidados se registran como "padre/hijo"
+        """
+        # Se registra al abrirse para que los tramos queden en orden de ejecución
+        ruta = f"{self._pila[-1][0]['tramo']}/{nombre}" if self._pila else nombre
+        registro = {"tramo": ruta, "nivel": len(self._pila), "ms": None, "mb_delta": None}
+        self.tramos.append(registro)
+        abierto = (registro, self._reloj(), self._memoria())
+        self._pila.append(abierto)
+        try:
+            yield
+        finally:
+            self._pila.remove(abierto)
+            # Si la ejecución se cerró antes (st.stop dentro del tramo) ya quedó medido
+            if registro["ms"] is None:
+                self._terminar_tramo(*abierto)
+
+    def _terminar_tramo(self, registro, t0, m0):
+        registro["ms"] = (self._reloj() - t0) * 1000
+        registro["mb_delta"] = _delta_mb(m0, self._memoria())
+
+    def cerrar(self):
+        """
+        Cierra la medición; los tramos todavía abiertos se miden hasta aquí
+        """
+        if self.cerrada:
+            return self
+        for abierto in self._pila:
+            self._terminar_tramo(*abierto)
+        self.ms_total = (self._reloj() - self._t0) * 1000
+        self.mb_delta = _delta_mb(self._m0, self._memoria())
+        fin = _contadores(self._caches)
+        self.cache = {
+            nombre: {
+                contador: fin[nombre][contador] - inicio[contador]
+                for contador in ("aciertos", "fallos")
+            }
+            for nombre, inicio in self._contadores_inicio.items()
+        }
+        return self
+
+    def a_dict(self):
+        return {
+            "inicio": self.inicio,
+            "tipo": self.tipo,
+            "ms_total": self.ms_total,
+            "mb_delta": self.mb_delta,
+            "cache": self.cache,
+            "tramos": self.tramos,
+        }
+
+
+def _delta_mb(antes, despues):
+    if antes is None or despues is None:
+        return None
+    return (despues - antes) / 1e6
+
+
+# ============= HISTORIAL =============
+class HistorialPerfil:
+    """
+    Últimas N ejecuciones cerradas, con vistas tabulares y exportación JSON lines
+    """
+
+    def __init__(self, max_ejecuciones=EJECUCIONES_HISTORIAL):
+        self.ejecuciones = deque(maxlen=max_ejecuciones)
+
+    def agregar(self, ejecucion):
+        self.ejecuciones.append(ejecucion.cerrar())
+
+    def resumen(self):
+        """
+        Una fila por ejecución (la más reciente primero)
+        """
+        filas = []
+        for ejecucion in reversed(self.ejecuciones):
+            fila = {
+                "inicio": ejecucion.inicio[11:],
+                "tipo": ejecucion.tipo,
+                "ms": ejecucion.ms_total,
+                "MB": ejecucion.mb_delta,
+            }
+            for nombre, contadores in ejecucion.cache.items():
+                fila[f"{nombre} aciertos/fallos"] = f"{contadores['aciertos']}/{contadores['fallos']}"
+            filas.append(fila)
+        return pd.DataFrame(filas)
+
+    def tramos(self, posicion=-1):
+        """
+        Tramos de una ejecución, ordenados como se abrieron
+        """
+        if not self.ejecuciones:
+            return pd.DataFrame(columns=["tramo", "ms", "mb_delta"])
+        return pd.DataFrame(self.ejecuciones[posicion].tramos, columns=["tramo", "ms", "mb_delta"])
+
+    def a_jsonl(self):
+        return "".join(linea_jsonl(ejecucion) for ejecucion in self.ejecuciones)
+
+
+def linea_jsonl(ejecucion):
+    return json.dumps(ejecucion.a_dict(), ensure_ascii=False) + "\n"
+
+
+def guardar_jsonl(ejecucion, ruta):
+    """
+    Agrega la ejecución como una línea JSON al archivo (para el monitoreo)
+    """
+    with open(ruta, "a", encoding="utf-8") as archivo:
+        archivo.write(linea_jsonl(ejecucion))
@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import date, timedelta
+
+
+# Hilos de precarga y tareas en espera como máximo: lo que exceda se descarta
+PRECARGA_MAX_HILOS = 2
+PRECARGA_MAX_PENDIENTES = 16
+
+
+# ============= COMBINACIONES PROBABLES =============
+def claves_vecinas(clave, por_tienda=True):
+    """
+    Filtros que probablemente se pidan después: el periodo anterior y el
+    siguiente (del mismo largo) y, con por_tienda, cada tienda por separado
+    """
+    vecinas = []
+    if clave.fecha_inicio and clave.fecha_fin:
+        inicio, fin = date.fromisoformat(clave.fecha_inicio), date.fromisoformat(clave.fecha_fin)
+        largo = fin - inicio + timedelta(days=1)
+        for desplazamiento in (-largo, largo):
+            vecinas.append(replace(
+                clave,
+                fecha_inicio=(inicio + desplazamiento).isoformat(),
+                fecha_fin=(fin + desplazamiento).isoformat()
+            ))
+    if por_tienda and len(clave.tiendas) > 1:
+        vecinas.extend(replace(clave, tiendas=(tienda,)) for tienda in clave.tiendas)
+    return vecinas
+
+
+# ============= PRECARGA EN SEGUNDO PLANO =============
+class Precargador:
+    """
+    Calienta caches en un pool de hilos chico. Cede ante el primer plano: una
+    tarea no empieza mientras haya una carga de primer plano en curso, y si ya
+    hay max_pendientes tareas en espera las nuevas se descartan
+    """
+
+    def __init__(self, cargar, en_cache=None, max_hilos=PRECARGA_MAX_HILOS,
+                 max_pendientes=PRECARGA_MAX_PENDIENTES):
+        self._cargar = cargar
+        self._en_cache = en_cache or (lambda clave: False)
+        self.max_pendientes = max_pendientes
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="precarga")
+        self._pendientes = set()
+        self._cargas_primer_plano = 0
+        self._condicion = threading.Condition()
+        self.programadas = 0
+        self.completadas = 0
+        self.descartadas = 0
+        self.errores = 0
+
+    @contextmanager
+    def primer_plano(self):
+        """
+        Marca una carga pedida por el usuario: la precarga espera a que termine
+        """
+        with self._condicion:
+            self._cargas_primer_plano += 1
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._cargas_primer_plano -= 1
+                self._condicion.notify_all()
+
+    def programar(self, claves):
+        for clave in claves:
+            with self._condicion:
+                if clave in self._pendientes or self._en_cache(clave):
+                    continue
+                if len(self._pendientes) >= self.max_pendientes:
+                    self.descartadas += 1
+                    continue
+                self._pendientes.add(clave)
+                self.programadas += 1
+            self._pool.submit(self._ejecutar, clave)
+
+    def _ejecutar(self, clave):
+        try:
+            with self._condicion:
+                self._condicion.wait_for(lambda: self._cargas_primer_plano == 0)
+            self._cargar(clave)
+            with self._condicion:
+                self.completadas += 1
+        except Exception:
+            # La precarga es best-effort: el primer plano volverá a intentarlo
+            with self._condicion:
+                self.errores += 1
+        finally:
+            with self._condicion:
+                self._pendientes.discard(clave)
+
+    def cerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def estadisticas(self):
+        with self._condicion:
+            return {
+                "pendientes": len(self._pendientes),
+                "programadas": self.programadas,
+                "completadas": self.completadas,
+                "descartadas": self.descartadas,
+                "errores": self.errores,
+            }
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from core.esquema import claves_producto_tienda, dimension_productos
+
+
+# Días de inventario cuando no hubo ventas en el periodo
+DIAS_SIN_VENTAS = 999
+
+# Orden de los niveles de stock (de más urgente a menos urgente)
+NIVELES_STOCK = ["SIN STOCK", "CRÍTICO", "NORMAL", "EXCESO"]
+
+
+# ============= FUNCIONES DE ANÁLISIS DE ROTACIÓN =============
+def _redondear(valores, decimales):
+    """
+    Redondeo vectorizado con el mismo resultado que round() de Python.
+    np.round difiere en los valores cercanos a un empate (x.x5), que se
+    recalculan uno a uno; son muy pocos
+    """
+    resultado = np.round(valores, decimales)
+    escalado = valores * 10 ** decimales
+    fraccion = np.abs(escalado - np.floor(escalado) - 0.5)
+    dudosos = np.flatnonzero(np.isfinite(valores) & (fraccion < 1e-6))
+    for i in dudosos:
+        resultado[i] = round(float(valores[i]), decimales)
+    return resultado
+
+
+def clasificar_stock(stock_actual, stock_minimo, stock_maximo):
+    """
+    Clasifica el nivel de stock de cada fila de forma vectorizada
+    """
+    condiciones = [
+        stock_actual == 0,
+        stock_actual < stock_minimo,
+        stock_actual >= stock_maximo,
+    ]
+    niveles = np.select(condiciones, ["SIN STOCK", "CRÍTICO", "EXCESO"], default="NORMAL")
+    return pd.Categorical(niveles, categories=NIVELES_STOCK)
+
+
+def unidades_por_fila(df_ventas, df_inventario):
+    """
+    Unidades vendidas (transacciones) de cada fila del inventario, 0 si no
+    vendió. Ventas e inventario se unen por claves enteras producto x tienda:
+    las ventas se suman por clave ordenada y cada fila del inventario se
+    ubica con una búsqueda binaria, sin comparar nombres
+    """
+    dim_productos = dimension_productos(df_ventas, df_inventario)
+    tiendas = np.union1d(df_ventas['tienda_id'].to_numpy(), df_inventario['tienda_id'].to_numpy())
+    clave_ventas = claves_producto_tienda(df_ventas, dim_productos, tiendas)
+    clave_inventario = claves_producto_tienda(df_inventario, dim_productos, tiendas)
+
+    validas = clave_ventas >= 0
+    claves, posicion = np.unique(clave_ventas[validas], return_inverse=True)
+    unidades = np.bincount(
+        posicion, weights=df_ventas['transacciones'].to_numpy()[validas], minlength=len(claves)
+    ).astype(np.int64)
+
+    if not len(claves):
+        return np.zeros(len(df_inventario), dtype=np.int64)
+    encontradas = np.minimum(np.searchsorted(claves, clave_inventario), len(claves) - 1)
+    coincide = (clave_inventario >= 0) & (claves[encontradas] == clave_inventario)
+    return np.where(coincide, unidades[encontradas], 0)
+
+
+def calcular_rotacion(df_ventas, df_inventario, dias_periodo):
+    """
+    Calcula métricas de rotación de inventario
+    """
+    df_rotacion = df_inventario.copy()
+    df_rotacion['unidades_vendidas'] = unidades_por_fila(df_ventas, df_inventario)
+
+    # Calcular métricas
+    df_rotacion['venta_diaria_promedio'] = (df_rotacion['unidades_vendidas'] / dias_periodo).round(2)
+
+    stock_actual = df_rotacion['stock_actual'].to_numpy(dtype="float64")
+    stock_minimo = df_rotacion['stock_minimo'].to_numpy(dtype="float64")
+    stock_maximo = df_rotacion['stock_maximo'].to_numpy(dtype="float64")
+    unidades = df_rotacion['unidades_vendidas'].to_numpy(dtype="float64")
+    venta_diaria = df_rotacion['venta_diaria_promedio'].to_numpy(dtype="float64")
+
+    # Días de inventario = stock_actual / venta_diaria_promedio
+    con_ventas = venta_diaria > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dias = _redondear(stock_actual / venta_diaria, 1)
+    df_rotacion['dias_inventario'] = np.where(con_ventas, dias, DIAS_SIN_VENTAS)
+
+    # Rotación (veces que se vende el inventario en el periodo)
+    con_stock = stock_actual > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rotacion = _redondear(unidades / stock_actual, 2)
+    df_rotacion['indice_rotacion'] = np.where(con_stock, rotacion, 0)
+
+    # Nivel de stock
+    df_rotacion['nivel_stock'] = clasificar_stock(stock_actual, stock_minimo, stock_maximo)
+
+    # Cantidad a reponer
+    requiere_reposicion = np.asarray(df_rotacion['nivel_stock'].isin(["SIN STOCK", "CRÍTICO"]))
+    df_rotacion['cantidad_reponer'] = np.where(
+        requiere_reposicion,
+        np.maximum(0, df_rotacion['stock_maximo'].astype(np.int64) - df_rotacion['stock_actual']),
+        0
+    )
+
+    # En int64: las columnas de inventario pueden venir con enteros compactos (int8/int16)
+    df_rotacion['costo_reposicion'] = df_rotacion['cantidad_reponer'].astype(np.int64) * df_rotacion['costo_unitario']
+
+    return df_rotacion
@@ -0,0 +1,279 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from core.cubo import DIMENSIONES_BASE, METRICAS, ROLLUPS, CuboVentas, matriz_ventas
+from core.motores import MotorPandas
+
+
+# Una serie por (producto, tienda); "filas" cuenta los días con registro
+CLAVES_SERIE = ["producto", "tienda_id", "tienda_nombre"]
+ACUMULADOS = METRICAS + ["filas"]
+
+
+@dataclass(frozen=True)
+class _Estado:
+    claves: pd.DataFrame  # una fila por serie, ordenadas por CLAVES_SERIE
+    inicio: np.datetime64  # día de la columna 0
+    cargados: np.ndarray  # bool por día: si ese día ya se agregó
+    acumulado: dict  # métrica -> array (series, días + 1), columna 0 en cero
+
+    @property
+    def fin(self):
+        return self.inicio + np.timedelta64(len(self.cargados) - 1, "D")
+
+
+def _dia(fecha):
+    return np.datetime64(fecha, "D")
+
+
+def _compacto(valores):
+    return pd.to_numeric(valores, downcast="integer")
+
+
+def _categorica(valores):
+    codigos, categorias = pd.factorize(valores, sort=True)
+    return pd.Categorical.from_codes(codigos, categories=pd.Index(categorias))
+
+
+# ============= SUMAS ACUMULADAS POR SERIE =============
+class SeriesDiarias:
+    """
+    Ventas diarias de cada serie producto x tienda guardadas como sumas
+    acumuladas sobre el eje de fechas: la suma de cualquier rango de días es
+    la resta de dos columnas, para todas las series a la vez. Se construye una
+    vez por selección de tiendas y productos y se extiende con los días que
+    van llegando; solo esos días pasan por el motor de agregación
+    """
+
+    def __init__(self, motor=None):
+        self.motor = motor or MotorPandas()
+        self._estado = None
+        self._tipo_fecha = None
+        # Reentrante: cubrir() extiende sin soltar el lock con el que comprobó
+        self._lock = threading.RLock()
+
+    def cubre(self, fecha_inicio, fecha_fin):
+        """
+        True si todos los días del rango ya están agregados
+        """
+        estado = self._estado
+        if estado is None or _dia(fecha_inicio) < estado.inicio or _dia(fecha_fin) > estado.fin:
+            return False
+        i, j = self._indices(estado, fecha_inicio, fecha_fin)
+        return bool(estado.cargados[i:j].all())
+
+    def extender(self, df_ventas, fecha_inicio, fecha_fin):
+        """
+        Agrega las ventas normalizadas del rango (ignorando los días que ya
+        estaban). Los días sin ventas del rango quedan cargados en cero
+        """
+        with self._lock:
+            estado = self._estado
+            if estado is not None:
+                dias = df_ventas["fecha"].to_numpy().astype("datetime64[D]")
+                posiciones = (dias - estado.inicio).astype(np.int64)
+                dentro = (posiciones >= 0) & (posiciones < len(estado.cargados))
+                ya_cargados = np.zeros(len(dias), dtype=bool)
+                ya_cargados[dentro] = estado.cargados[posiciones[dentro]]
+                df_ventas = df_ventas[~ya_cargados]
+            if self._tipo_fecha is None:
+                self._tipo_fecha = df_ventas["fecha"].dtype
+            base = self.motor.sumar(df_ventas, DIMENSIONES_BASE, METRICAS)
+            self._estado = _agregar(estado, base, _dia(fecha_inicio), _dia(fecha_fin))
+
+    def cubrir(self, fecha_inicio, fecha_fin, cargar):
+        """
+        Si el rango no está cubierto extiende con cargar() -> (df_ventas,
+        desde, hasta). Comprobar y extender van bajo el mismo lock: dos
+        sesiones que piden el mismo rango no lo cargan dos veces
+        """
+        with self._lock:
+            if not self.cubre(fecha_inicio, fecha_fin):
+                self.extender(*cargar())
+
+    def totales(self, fecha_inicio, fecha_fin):
+        """
+        Ventas y transacciones del rango por serie (las que tienen registros),
+        ordenadas por producto y tienda: una resta por serie
+        """
+        estado = self._estado
+        return self._totales(estado, *self._indices(estado, fecha_inicio, fecha_fin))
+
+    def _totales(self, estado, i, j):
+        sumas = {m: estado.acumulado[m][:, j] - estado.acumulado[m][:, i] for m in ACUMULADOS}
+        activas = sumas["filas"] > 0
+        claves = estado.claves[activas]
+        return pd.DataFrame({
+            "producto": _categorica(claves["producto"].to_numpy()),
+            "tienda_id": claves["tienda_id"].to_numpy(),
+            "tienda_nombre": _categorica(claves["tienda_nombre"].to_numpy()),
+            **{m: _compacto(sumas[m][activas]) for m in METRICAS},
+        })
+
+    def cubo(self, fecha_inicio, fecha_fin):
+        """
+        CuboVentas del rango sin volver a agrupar las ventas crudas: los totales
+        salen de restas de acumulados y las series diarias de sus diferencias.
+        El estado se lee una vez: un extender concurrente no mueve las columnas
+        """
+        estado = self._estado
+        i, j = self._indices(estado, fecha_inicio, fecha_fin)
+        por_producto_tienda = self._totales(estado, i, j)
+
+        activas = estado.acumulado["filas"][:, j] > estado.acumulado["filas"][:, i]
+        diario = {m: np.diff(estado.acumulado[m][activas, i:j + 1], axis=1) for m in ACUMULADOS}
+        dias = (estado.inicio + np.arange(i, j)).astype(self._tipo_fecha or "datetime64[us]")
+        producto = por_producto_tienda["producto"].cat.codes.to_numpy()
+
+        # Grano fecha x serie: celdas con registro, en orden fecha, producto, tienda
+        columna_dia, fila = np.nonzero(diario["filas"].T > 0)
+        base = pd.DataFrame({
+            "fecha": dias[columna_dia],
+            **{c: por_producto_tienda[c].take(fila).reset_index(drop=True) for c in CLAVES_SERIE},
+            **{m: _compacto(diario[m][fila, columna_dia]) for m in METRICAS},
+        })
+
+        # Series por producto: las series vienen agrupadas por producto, basta reduceat
+        inicios = np.flatnonzero(np.r_[True, producto[1:] != producto[:-1]]) if len(producto) else producto
+        por_producto_dia = {
+            m: np.add.reduceat(diario[m], inicios, axis=0) if len(inicios) else diario[m] for m in ACUMULADOS
+        }
+        fila_producto, columna_dia = np.nonzero(por_producto_dia["filas"] > 0)
+        categorias = por_producto_tienda["producto"].cat.categories
+        por_fecha_producto = pd.DataFrame({
+            "producto": pd.Categorical.from_codes(fila_producto, categories=categorias),
+            "fecha": dias[columna_dia],
+            **{m: _compacto(por_producto_dia[m][fila_producto, columna_dia]) for m in METRICAS},
+        })
+
+        con_registros = diario["filas"].sum(axis=0) > 0
+        por_fecha = pd.DataFrame({
+            "fecha": dias[con_registros],
+            **{m: _compacto(diario[m].sum(axis=0)[con_registros]) for m in METRICAS},
+        })
+
+        # El resto de los rollups parte de la tabla por serie, que ya es chica
+        rollups = {
+            nombre: self.motor.sumar(por_producto_tienda, ROLLUPS[nombre], METRICAS)
+            for nombre in ("por_producto", "por_tienda", "por_tienda_producto")
+        }
+        return CuboVentas(
+            base=base,
+            por_fecha=por_fecha,
+            por_fecha_producto=por_fecha_producto,
+            por_producto_tienda=por_producto_tienda,
+            matriz=matriz_ventas(rollups["por_tienda_producto"]),
+            **rollups
+        )
+
+    def _indices(self, estado, fecha_inicio, fecha_fin):
+        """
+        Columnas de los acumulados que delimitan el rango: suma = acumulado[j] - acumulado[i]
+        """
+        i = int((_dia(fecha_inicio) - estado.inicio).astype(np.int64))
+        j = int((_dia(fecha_fin) - estado.inicio).astype(np.int64)) + 1
+        if i < 0 or j > len(estado.cargados) or i > j:
+            raise KeyError(f"Rango {fecha_inicio} a {fecha_fin} fuera de las series cargadas")
+        return i, j
+
+    @property
+    def nbytes(self):
+        estado = self._estado
+        return 0 if estado is None else sum(a.nbytes for a in estado.acumulado.values())
+
+
+def _fila_serie(base, claves):
+    """
+    Índice en claves de la serie de cada fila de base. Se compara por códigos:
+    los categóricos se traducen por categoría, no fila a fila
+    """
+    niveles = {c: pd.Index(pd.unique(claves[c])) for c in CLAVES_SERIE}
+
+    def codigos(df, c):
+        columna = df[c]
+        if isinstance(columna.dtype, pd.CategoricalDtype):
+            return niveles[c].get_indexer(columna.cat.categories)[columna.cat.codes.to_numpy()]
+        return niveles[c].get_indexer(columna.to_numpy())
+
+    series = pd.MultiIndex.from_arrays([codigos(claves, c) for c in CLAVES_SERIE])
+    return series.get_indexer(pd.MultiIndex.from_arrays([codigos(base, c) for c in CLAVES_SERIE]))
+
+
+def _valores_diarios(base, claves, inicio, n_dias):
+    """
+    Arrays (series, días) con las métricas de base, que viene al grano fecha x serie
+    """
+    fila = _fila_serie(base, claves)
+    columna = (base["fecha"].to_numpy().astype("datetime64[D]") - inicio).astype(np.int64)
+    diario = {}
+    for m in ACUMULADOS:
+        diario[m] = np.zeros((len(claves), n_dias), dtype=np.int64)
+        diario[m][fila, columna] = 1 if m == "filas" else base[m].to_numpy()
+    return diario
+
+
+def _claves(base):
+    # Series distintas de base, con los nombres como strings (las categorías cambian entre cargas)
+    claves = base[CLAVES_SERIE].drop_duplicates()
+    return pd.DataFrame({c: np.asarray(claves[c], dtype=object) if c != "tienda_id" else claves[c].to_numpy()
+                         for c in CLAVES_SERIE})
+
+
+def _acumular(diario, desde=None):
+    """
+    Sumas acumuladas por fila; con desde (última columna de acumulados
+    previos) continúan a partir de ahí, sin la columna inicial en cero
+    """
+    if desde is None:
+        return np.concatenate([np.zeros((len(diario), 1), dtype=np.int64), np.cumsum(diario, axis=1)], axis=1)
+    return desde[:, None] + np.cumsum(diario, axis=1)
+
+
+def _agregar(estado, base, inicio, fin):
+    """
+    Estado nuevo con los días [inicio, fin] de base incorporados
+    """
+    nuevas = _claves(base)
+    if estado is not None and inicio > estado.fin:
+        if _fila_serie(nuevas, estado.claves).min(initial=0) >= 0:
+            # Caso habitual (llegan días nuevos de las mismas series): se anexan columnas
+            n_dias = int((fin - estado.fin).astype(np.int64))
+            diario = _valores_diarios(base, estado.claves, estado.fin + np.timedelta64(1, "D"), n_dias)
+            cargados = np.zeros(n_dias, dtype=bool)
+            cargados[-int((fin - inicio).astype(np.int64)) - 1:] = True
+            return _Estado(
+                claves=estado.claves,
+                inicio=estado.inicio,
+                cargados=np.concatenate([estado.cargados, cargados]),
+                acumulado={
+                    m: np.concatenate([a, _acumular(diario[m], desde=a[:, -1])], axis=1)
+                    for m, a in estado.acumulado.items()
+                },
+            )
+
+    # Series o días previos nuevos: se reconstruye desde los valores diarios
+    claves = nuevas if estado is None else pd.concat([estado.claves, nuevas]).drop_duplicates()
+    claves = claves.sort_values(CLAVES_SERIE, kind="stable").reset_index(drop=True)
+    primero = inicio if estado is None else min(estado.inicio, inicio)
+    ultimo = fin if estado is None else max(estado.fin, fin)
+    n_dias = int((ultimo - primero).astype(np.int64)) + 1
+
+    diario = _valores_diarios(base, claves, primero, n_dias)
+    cargados = np.zeros(n_dias, dtype=bool)
+    cargados[int((inicio - primero).astype(np.int64)):int((fin - primero).astype(np.int64)) + 1] = True
+    if estado is not None:
+        fila = _fila_serie(estado.claves, claves)
+        desplazamiento = int((estado.inicio - primero).astype(np.int64))
+        columnas = slice(desplazamiento, desplazamiento + len(estado.cargados))
+        for m in ACUMULADOS:
+            diario[m][fila, columnas] += np.diff(estado.acumulado[m], axis=1)
+        cargados[columnas] |= estado.cargados
+    return _Estado(
+        claves=claves,
+        inicio=primero,
+        cargados=cargados,
+        acumulado={m: _acumular(diario[m]) for m in ACUMULADOS},
+    )
@@ -0,0 +1,155 @@
+import zlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+PRODUCTOS_DEFAULT = [
+    "BOLSO EPONA - NAVY/PURPLE - UNICA",
+    "BOLSO EPONA - BLACK/GOLD - UNICA",
+    "CARTERA MINIMAL - BLACK - S",
+    "CARTERA MINIMAL - BLACK - M",
+    "MOCHILA URBAN - GREY - UNICA"
+]
+
+TIENDAS_DEFAULT = [101, 201, 301]
+
+
+# ============= CATÁLOGOS =============
+def catalogo_sintetico(n_productos, n_tiendas):
+    """
+    Genera listas de productos y tiendas para pruebas de carga
+    """
+    productos = [f"PRODUCTO {i:05d} - UNICA" for i in range(1, n_productos + 1)]
+    tiendas = [100 * i + 1 for i in range(1, n_tiendas + 1)]
+    return productos, tiendas
+
+
+def _productos_y_tiendas(filters):
+    productos = filters["products"] if filters["products"] else PRODUCTOS_DEFAULT
+    tiendas = filters["stores"] if filters["stores"] else TIENDAS_DEFAULT
+    return productos, tiendas
+
+
+# ============= ALEATORIOS POR IDENTIDAD =============
+# Cada celda se genera a partir de (producto, tienda, día) y no de su posición
+# en la lista pedida: el mismo producto da los mismos valores sin importar el
+# orden de los filtros ni qué más esté seleccionado
+_DORADO = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mezclar(x):
+    """
+    splitmix64 sobre un array uint64 (la aritmética da la vuelta sin avisos)
+    """
+    x = x + _DORADO
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _llaves_celdas(productos, tiendas, seed):
+    """
+    Llave uint64 de cada celda producto x tienda, en orden producto -> tienda
+    """
+    llave_producto = np.array([zlib.crc32(str(producto).encode()) for producto in productos], dtype=np.uint64)
+    llave_tienda = np.asarray(tiendas, dtype=np.int64).astype(np.uint64)
+    llave_producto = _mezclar(llave_producto + np.uint64(seed))
+    return _mezclar(llave_producto[:, None] ^ _mezclar(llave_tienda)[None, :]).ravel()
+
+
+def _uniforme(llaves, sorteo):
+    """
+    Uniforme en [0, 1) del sorteo número `sorteo` de cada llave
+    """
+    desplazamiento = np.uint64(sorteo * int(_DORADO) % 2 ** 64)
+    return (_mezclar(llaves + desplazamiento) >> np.uint64(11)) * 2.0 ** -53
+
+
+def _enteros(llaves, sorteo, bajo, alto):
+    # Como rng.integers(bajo, alto): alto excluido
+    return bajo + (_uniforme(llaves, sorteo) * (alto - bajo)).astype(np.int64)
+
+
+# ============= SIMULACIÓN DE RESPUESTA DEL BACKEND =============
+def get_sales_data(filters, seed=42):
+    """
+    Simula la respuesta de tu backend con fact_daily_sales.
+    Genera todas las celdas producto x tienda de cada día en bloque, columna por
+    columna. Los valores de cada celda dependen solo de (producto, tienda, día):
+    un día simulado es el mismo sin importar el rango de fechas pedido, y un
+    producto el mismo sin importar el resto de la selección
+    """
+    fecha_inicio = np.datetime64(datetime.strptime(filters["dates"]["fecha_inicio"], "%Y-%m-%d").date())
+    fecha_fin = np.datetime64(datetime.strptime(filters["dates"]["fecha_fin"], "%Y-%m-%d").date())
+    fechas = np.arange(fecha_inicio, fecha_fin + 1)
+
+    productos, tiendas = _productos_y_tiendas(filters)
+    llaves = _llaves_celdas(productos, tiendas, seed)
+
+    celdas, dias, ventas, transacciones = [], [], [], []
+    for i, fecha in enumerate(fechas):
+        llaves_dia = _mezclar(llaves ^ _mezclar(np.array([fecha.astype(np.int64)], dtype=np.uint64)))
+
+        # Celdas producto x tienda con venta ese día (~75%)
+        con_venta = np.flatnonzero(_uniforme(llaves_dia, 0) > 0.25)
+        llaves_dia = llaves_dia[con_venta]
+        n = len(con_venta)
+
+        multiplicador = 0.7 + 0.8 * _uniforme(llaves_dia, 1)
+        celdas.append(con_venta)
+        dias.append(np.full(n, i, dtype=np.int32))
+        ventas.append((_enteros(llaves_dia, 2, 500, 4000) * multiplicador).astype(np.int64))
+        transacciones.append((_enteros(llaves_dia, 3, 2, 30) * multiplicador).astype(np.int64))
+
+    # Orden producto -> tienda -> día (los días ya vienen en orden)
+    celdas = np.concatenate(celdas) if celdas else np.empty(0, dtype=np.int64)
+    orden = np.argsort(celdas, kind="stable")
+    idx_producto, idx_tienda = np.divmod(celdas[orden], max(len(tiendas), 1))
+    idx_dia = np.concatenate(dias)[orden] if dias else np.empty(0, dtype=np.int32)
+
+    fechas_texto = fechas.astype(str).astype(object)
+    tiendas_id = np.asarray(tiendas, dtype=np.int64)
+    tiendas_nombre = np.array([f"Tienda {tienda}" for tienda in tiendas], dtype=object)
+
+    return pd.DataFrame({
+        "fecha": fechas_texto[idx_dia],
+        "producto": np.asarray(productos, dtype=object)[idx_producto],
+        "tienda_id": tiendas_id[idx_tienda],
+        "tienda_nombre": tiendas_nombre[idx_tienda],
+        "ventas": np.concatenate(ventas)[orden] if ventas else np.empty(0, dtype=np.int64),
+        "transacciones": np.concatenate(transacciones)[orden] if transacciones else np.empty(0, dtype=np.int64)
+    })
+
+
+def get_inventory_data(filters, seed=123):
+    """
+    Simula la respuesta del backend con datos de inventario actual. Como en
+    las ventas, cada celda depende solo de su producto y su tienda
+    """
+    productos, tiendas = _productos_y_tiendas(filters)
+    llaves = _llaves_celdas(productos, tiendas, seed)
+
+    # Stock actual (algunas tiendas con bajo stock)
+    stock_actual = _enteros(llaves, 0, 0, 50)
+
+    # Stock mínimo recomendado (varía por producto)
+    stock_minimo = _enteros(llaves, 1, 10, 20)
+
+    # Stock máximo (capacidad de almacenamiento)
+    stock_maximo = _enteros(llaves, 2, 40, 80)
+
+    # Costo unitario
+    costo_unitario = _enteros(llaves, 3, 50, 200)
+
+    return pd.DataFrame({
+        "producto": np.repeat(np.asarray(productos, dtype=object), len(tiendas)),
+        "tienda_id": np.tile(np.asarray(tiendas, dtype=np.int64), len(productos)),
+        "tienda_nombre": np.tile(np.array([f"Tienda {tienda}" for tienda in tiendas], dtype=object), len(productos)),
+        "stock_actual": stock_actual,
+        "stock_minimo": stock_minimo,
+        "stock_maximo": stock_maximo,
+        "costo_unitario": costo_unitario,
+        "valor_inventario": stock_actual * costo_unitario
+    })
@@ -0,0 +1,44 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+
+# ============= PAGINACIÓN EN EL SERVIDOR =============
+def filtrar_texto(df, texto):
+    """
+    Filas donde alguna columna de texto contiene el texto buscado (sin regex)
+    """
+    texto = (texto or "").strip()
+    if not texto:
+        return df
+    mascara = np.zeros(len(df), dtype=bool)
+    for columna in df.columns:
+        serie = df[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            # Se evalúa sobre las categorías y se expande por códigos
+            coincide = serie.cat.categories.astype(str).str.contains(texto, case=False, regex=False)
+            codigos = serie.cat.codes.to_numpy()
+            mascara |= (codigos >= 0) & np.append(coincide, False)[codigos]
+        elif pd.api.types.is_string_dtype(serie.dtype) or serie.dtype == object:
+            mascara |= serie.astype(str).str.contains(texto, case=False, regex=False).to_numpy()
+    return df[mascara]
+
+
+def total_paginas(n_filas, tamano):
+    return max(1, math.ceil(n_filas / tamano))
+
+
+def ordenar_pagina(df, columna=None, ascendente=True, pagina=1, tamano=25):
+    """
+    Devuelve solo las filas de la página pedida. Se ordena una sola columna para
+    obtener posiciones y se materializan únicamente las filas visibles
+    """
+    pagina = min(max(int(pagina), 1), total_paginas(len(df), tamano))
+    inicio, fin = (pagina - 1) * tamano, pagina * tamano
+    if columna is None:
+        return df.iloc[inicio:fin]
+    orden = df[columna].reset_index(drop=True).sort_values(
+        ascending=ascendente, kind="stable", na_position="last"
+    ).index.to_numpy()
+    return df.iloc[orden[inicio:fin]]
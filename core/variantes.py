@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+
+# Variantes (tallas) en que se expande cada fila producto x tienda
+VARIANTES_DEFAULT = 3
+
+
+# ============= EXPANSIÓN EN VARIANTES (SIZES) =============
+def _numero_tienda(tienda_nombre):
+    """
+    Extrae el número de tienda del nombre ("Tienda 101" -> 101), 0 si no tiene
+    """
+    numero = tienda_nombre.astype(str).str.extract(r"(?:^|\s)(\d+)$", expand=False)
+    return numero.fillna(0).astype(np.int64).to_numpy()
+
+
+def repartir(totales, pesos):
+    """
+    Reparte cada total entero entre sus variantes según los pesos, de forma que
+    la suma de las variantes sea exactamente el total (método del mayor resto)
+    """
+    totales = np.asarray(totales, dtype=np.int64)
+    bruto = totales[:, None] * pesos
+    base = np.floor(bruto).astype(np.int64)
+    faltante = totales - base.sum(axis=1)
+    # Las unidades sobrantes van a las variantes con mayor parte decimal
+    orden = np.argsort(base - bruto, axis=1, kind="stable")
+    posicion = np.argsort(orden, axis=1, kind="stable")
+    return base + (posicion < faltante[:, None])
+
+
+def codigos_variantes(indices, tienda_nombre, n_variantes=VARIANTES_DEFAULT):
+    """
+    Códigos de las variantes de cada fila producto x tienda, fila por fila:
+    {idx:03d}{tienda%100:02d}{variante}
+    """
+    prefijos = [f"{idx:03d}{numero % 100:02d}" for idx, numero in zip(indices, _numero_tienda(tienda_nombre))]
+    return [f"{prefijo}{variante}" for prefijo in prefijos for variante in range(n_variantes)]
+
+
+def catalogo_codigos(df_rotacion, df_productos, n_variantes=VARIANTES_DEFAULT):
+    """
+    Código de cada variante de todos los productos del detalle (los de
+    df_productos, con su ranking), con su tienda y producto, ordenado por código
+    """
+    base = df_rotacion[['producto', 'tienda_nombre']].merge(df_productos[['producto', 'ranking']], on='producto')
+    df_catalogo = pd.DataFrame({
+        'Código Producto': codigos_variantes(base['ranking'].to_numpy(), base['tienda_nombre'], n_variantes),
+        'Tienda': np.repeat(base['tienda_nombre'].to_numpy(), n_variantes),
+        'Nombre Producto': np.repeat(base['producto'].to_numpy(), n_variantes),
+        'ranking': np.repeat(base['ranking'].to_numpy(), n_variantes),
+    })
+    return df_catalogo.sort_values(['Código Producto', 'Tienda'], kind="stable").reset_index(drop=True)
+
+
+def tabla_base_producto(df_rotacion, producto, df_tiendas_prod):
+    """
+    Filas de rotación/inventario de un producto con sus ventas por tienda
+    """
+    df_rotacion_prod = df_rotacion[df_rotacion['producto'] == producto]
+    # Unión por tienda_id (entero) alineando índices, sin comparar nombres de tienda
+    ventas_tienda = df_tiendas_prod.set_index('tienda_id')[['ventas', 'transacciones']].reindex(
+        df_rotacion_prod['tienda_id'].to_numpy()
+    )
+    return df_rotacion_prod.assign(
+        ventas=ventas_tienda['ventas'].to_numpy(),
+        transacciones=ventas_tienda['transacciones'].to_numpy()
+    ).reset_index(drop=True)
+
+
+def tabla_detallada_producto(df_rotacion, producto, df_tiendas_prod, idx):
+    """
+    Tabla por tienda y variante de un producto (base + expansión)
+    """
+    return expandir_variantes(tabla_base_producto(df_rotacion, producto, df_tiendas_prod), idx)
+
+
+def expandir_variantes(df_tabla_base, idx, n_variantes=VARIANTES_DEFAULT):
+    """
+    Expande cada fila tienda de un producto en n variantes (simulado).
+    En producción, estos datos vendrían directamente de la BD.
+    Código de variante: {idx:03d}{tienda%100:02d}{variante}
+    """
+    columnas = ['Código Producto', 'Tienda', 'Nombre Producto', 'Compras',
+                'Ventas', 'Ventas $', 'Stock', 'Porcentaje Rotación']
+    if df_tabla_base.empty:
+        return pd.DataFrame(columns=columnas)
+
+    # Orden estable por tienda para que los pesos no dependan del orden de entrada
+    base = df_tabla_base.sort_values('tienda_nombre', kind="stable").reset_index(drop=True)
+    n_filas = len(base)
+
+    # Un generador por fila sembrado con (producto, tienda): el reparto de una
+    # tienda no depende de qué otras tiendas estén en la tabla
+    pesos = np.empty((n_filas, n_variantes))
+    variacion_rotacion = np.empty((n_filas, n_variantes))
+    for fila, tienda_id in enumerate(base['tienda_id'].to_numpy()):
+        rng = np.random.default_rng((int(idx), int(tienda_id)))
+        pesos[fila] = rng.dirichlet(np.ones(n_variantes))
+        variacion_rotacion[fila] = rng.uniform(0.8, 1.2, size=n_variantes)
+
+    def _columna(nombre):
+        return base[nombre].fillna(0).to_numpy()
+
+    # Distribuir stock, ventas (unidades y dinero) y compras entre las variantes
+    stock = repartir(_columna('stock_actual'), pesos)
+    ventas = repartir(_columna('transacciones'), pesos)
+    ventas_dinero = repartir(_columna('ventas'), pesos)
+    compras = repartir(_columna('unidades_vendidas'), pesos)
+
+    # Rotación se mantiene similar (pequeña variación)
+    rotacion = _columna('indice_rotacion')[:, None] * variacion_rotacion
+
+    df_tabla_detallada = pd.DataFrame({
+        'Código Producto': codigos_variantes(np.full(n_filas, idx), base['tienda_nombre'], n_variantes),
+        'Tienda': np.repeat(base['tienda_nombre'].to_numpy(), n_variantes),
+        'Nombre Producto': np.repeat(base['producto'].to_numpy(), n_variantes),
+        'Compras': compras.ravel(),
+        'Ventas': ventas.ravel(),
+        'Ventas $': ventas_dinero.ravel(),
+        'Stock': stock.ravel(),
+        'Porcentaje Rotación': rotacion.ravel()
+    })
+
+    # Ordenar por tienda y código
+    return df_tabla_detallada.sort_values(['Tienda', 'Código Producto'], ascending=[True, True]).reset_index(drop=True)
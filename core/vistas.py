@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+
+# Productos (expanders) por página en el detalle
+PRODUCTOS_POR_PAGINA = 20
+
+
+# ============= TABLAS DERIVADAS DEL CUBO =============
+# Cálculos de los tabs separados de Streamlit: app.py solo los dibuja y los
+# benchmarks los ejecutan sin levantar la interfaz
+
+
+def ranking_productos(cubo):
+    """
+    Ranking de productos por ventas (compartido por el resumen y el detalle)
+    """
+    df_productos = cubo.por_producto.copy()
+
+    df_productos['ticket_promedio'] = (df_productos['ventas'] / df_productos['transacciones']).round(2)
+    df_productos['porcentaje'] = (df_productos['ventas'] / cubo.total_ventas * 100).round(1)
+    df_productos = df_productos.sort_values("ventas", ascending=False)
+    df_productos['ranking'] = range(1, len(df_productos) + 1)
+    return df_productos[['ranking', 'producto', 'ventas', 'transacciones', 'ticket_promedio', 'porcentaje']]
+
+
+def resumen_productos(cubo):
+    """
+    Ranking de productos con su tendencia, en una sola pasada agrupada sobre la
+    serie diaria: ventas de la primera y la segunda mitad de los días de cada
+    producto y variación % entre ambas (0 si la primera mitad no vendió)
+    """
+    serie = cubo.por_fecha_producto
+    grupo = serie.groupby("producto", observed=True, sort=False)
+    posicion = grupo.cumcount().to_numpy()
+    mitad = grupo["ventas"].transform("size").to_numpy() // 2
+    ventas = serie["ventas"].to_numpy()
+    en_primera = posicion < mitad
+
+    mitades = pd.DataFrame({
+        "producto": serie["producto"],
+        "ventas_primera": np.where(en_primera, ventas, 0),
+        "ventas_segunda": np.where(en_primera, 0, ventas),
+    }).groupby("producto", observed=True)[["ventas_primera", "ventas_segunda"]].sum()
+
+    df_resumen = ranking_productos(cubo).merge(mitades, on="producto", how="left")
+    primera = df_resumen["ventas_primera"].to_numpy(dtype="float64")
+    segunda = df_resumen["ventas_segunda"].to_numpy(dtype="float64")
+    df_resumen["tendencia"] = np.divide(
+        segunda - primera, primera, out=np.zeros(len(df_resumen)), where=primera > 0
+    ) * 100
+    return df_resumen
+
+
+def resumen_tiendas(cubo):
+    """
+    Ventas, ticket promedio y participación por tienda, de mayor a menor venta
+    """
+    df_tiendas = cubo.por_tienda.copy()
+
+    df_tiendas['ticket_promedio'] = (df_tiendas['ventas'] / df_tiendas['transacciones']).round(2)
+    df_tiendas['porcentaje'] = (df_tiendas['ventas'] / cubo.total_ventas * 100).round(1)
+    return df_tiendas.sort_values("ventas", ascending=False)
+
+
+def matriz_con_total(matriz):
+    """
+    Matriz productos x tiendas (cubo.matriz) con una columna TOTAL, ordenada por ella
+    """
+    df_matriz = matriz.reset_index()
+
+    df_matriz['TOTAL'] = df_matriz.iloc[:, 1:].sum(axis=1)
+    return df_matriz.sort_values('TOTAL', ascending=False)
@@ -0,0 +1,43 @@
+import numpy as np
+
+from core.busqueda import IndiceCodigos
+
+
+def _buscar_recorriendo(codigos, texto):
+    texto = texto.strip().casefold()
+    return [i for i, codigo in enumerate(codigos) if texto in codigo.casefold()]
+
+
+# ============= ÍNDICE DE CÓDIGOS =============
+def test_igual_a_recorrer_la_tabla():
+    rng = np.random.default_rng(0)
+    alfabeto = list("ABC0123-")
+    codigos = ["".join(rng.choice(alfabeto, rng.integers(1, 9))) for _ in range(500)]
+    indice = IndiceCodigos(codigos)
+    for texto in ["A", "0", "-1", "AB", "C3-", "ZZ", "a", " b0 "] + [codigo[1:4] for codigo in codigos[:30]]:
+        assert indice.buscar(texto).tolist() == _buscar_recorriendo(codigos, texto), texto
+
+
+def test_una_fila_con_varias_coincidencias_aparece_una_vez():
+    indice = IndiceCodigos(["AAA", "BAB", "CCC"])
+    assert indice.buscar("A").tolist() == [0, 1]
+
+
+def test_texto_vacio_y_demasiado_largo():
+    indice = IndiceCodigos(["001011", "002"])
+    assert indice.buscar("").tolist() == [0, 1]
+    assert indice.buscar(None).tolist() == [0, 1]
+    assert indice.buscar("0010111").tolist() == []
+
+
+def test_sin_codigos():
+    indice = IndiceCodigos([])
+    assert indice.buscar("x").tolist() == []
+    assert indice.buscar("").tolist() == []
+
+
+def test_caracteres_especiales_sin_regex():
+    codigos = ["A.B", "AXB", "A*B"]
+    indice = IndiceCodigos(codigos)
+    assert indice.buscar(".").tolist() == [0]
+    assert indice.buscar("*").tolist() == [2]
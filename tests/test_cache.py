@@ -0,0 +1,219 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.cache import CacheCompartido, CacheDiario, CacheLRU, huella
+from core.filtros import ClaveFiltros
+
+
+class Reloj:
+    """
+    Reloj manual para probar el TTL sin esperar
+    """
+
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+# ============= CACHE LRU =============
+def test_ttl_expira_entradas():
+    reloj = Reloj()
+    cache = CacheLRU(max_entradas=4, ttl=10, reloj=reloj)
+    cache.guardar("a", 1)
+    reloj.ahora = 9.9
+    assert cache.obtener("a") == 1
+    reloj.ahora = 10
+    assert cache.obtener("a") is None
+    assert cache.expiradas == 1
+    assert len(cache) == 0
+
+
+def test_desaloja_la_menos_usada():
+    cache = CacheLRU(max_entradas=2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    cache.obtener("a")
+    cache.guardar("c", 3)
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.desalojadas == 1
+
+
+def test_desaloja_por_bytes_pero_conserva_la_nueva():
+    df = pd.DataFrame({"x": np.arange(1000, dtype=np.int64)})
+    cache = CacheLRU(max_entradas=10, max_bytes=int(df.memory_usage(deep=True).sum() * 1.5))
+    cache.guardar("a", df)
+    cache.guardar("b", df.copy())
+    assert "a" not in cache and "b" in cache
+    # Una entrada más grande que el límite se guarda igual (es la recién pedida)
+    cache.guardar("grande", pd.concat([df] * 5))
+    assert list(cache._entradas) == ["grande"]
+    assert cache.estadisticas()["bytes"] == cache._entradas["grande"][2]
+
+
+def test_estadisticas_de_aciertos():
+    cache = CacheLRU()
+    calculos = []
+    for _ in range(3):
+        cache.obtener_o_calcular("k", lambda: calculos.append(1) or "valor")
+    estadisticas = cache.estadisticas()
+    assert len(calculos) == 1
+    assert (estadisticas["aciertos"], estadisticas["fallos"]) == (2, 1)
+    assert estadisticas["tasa_aciertos"] == pytest.approx(2 / 3)
+
+
+# ============= CACHE DIARIO =============
+def _clave(inicio, fin):
+    return ClaveFiltros(fecha_inicio=inicio, fecha_fin=fin, tiendas=(101,))
+
+
+def test_diario_pide_solo_los_dias_faltantes():
+    pedidos = []
+
+    def cargar(clave):
+        pedidos.append((clave.fecha_inicio, clave.fecha_fin))
+        dias = pd.date_range(clave.fecha_inicio, clave.fecha_fin).strftime("%Y-%m-%d")
+        # El día 03 no tiene ventas
+        dias = [dia for dia in dias if not dia.endswith("-03")]
+        return pd.DataFrame({"fecha": dias, "ventas": range(len(dias))})
+
+    cache = CacheDiario(cargar)
+    primero = cache.obtener(_clave("2026-02-01", "2026-02-05"))
+    segundo = cache.obtener(_clave("2026-02-03", "2026-02-08"))
+    assert pedidos == [("2026-02-01", "2026-02-05"), ("2026-02-06", "2026-02-08")]
+    assert primero["fecha"].tolist() == ["2026-02-01", "2026-02-02", "2026-02-04", "2026-02-05"]
+    assert segundo["fecha"].tolist() == ["2026-02-04", "2026-02-05", "2026-02-06", "2026-02-07", "2026-02-08"]
+    assert cache.contiene(_clave("2026-02-01", "2026-02-08"))
+    assert not cache.contiene(_clave("2026-02-01", "2026-02-09"))
+
+
+# ============= CACHE COMPARTIDO =============
+def test_huella_por_contenido():
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    assert huella("x", df) == huella("x", df.copy())
+    assert huella("x", df) != huella("x", df.assign(a=[1, 2, 4]))
+    assert huella("x", df) != huella("y", df)
+    with pytest.raises(TypeError):
+        huella(object())
+
+
+def test_single_flight_calcula_una_vez():
+    cache = CacheCompartido()
+    llamadas = []
+    barrera = threading.Barrier(8)
+
+    def calcular():
+        llamadas.append(1)
+        time.sleep(0.2)
+        return pd.DataFrame({"x": [1]})
+
+    resultados = []
+
+    def pedir():
+        barrera.wait()
+        resultados.append(cache.obtener_o_calcular("clave", calcular))
+
+    hilos = [threading.Thread(target=pedir) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(llamadas) == 1
+    assert len(resultados) == 8 and all(resultado is resultados[0] for resultado in resultados)
+    assert cache.estadisticas()["esperas"] == 7
+
+
+def test_si_el_lider_falla_otro_calcula():
+    cache = CacheCompartido()
+    lider_calculando = threading.Event()
+    errores = []
+
+    def falla():
+        lider_calculando.set()
+        time.sleep(0.1)
+        raise RuntimeError("fuente caída")
+
+    def lider():
+        try:
+            cache.obtener_o_calcular("clave", falla)
+        except RuntimeError as error:
+            errores.append(error)
+
+    hilo = threading.Thread(target=lider)
+    hilo.start()
+    lider_calculando.wait()
+    assert cache.obtener_o_calcular("clave", lambda: "ok") == "ok"
+    hilo.join()
+    assert len(errores) == 1
+
+
+def test_si_el_lider_falla_se_reintenta_una_vez():
+    cache = CacheCompartido()
+    lider_calculando = threading.Event()
+    reintentos = []
+    errores = []
+    resultados = []
+
+    def falla():
+        lider_calculando.set()
+        time.sleep(0.3)
+        raise RuntimeError("fuente caída")
+
+    def reintentar():
+        reintentos.append(1)
+        time.sleep(0.1)
+        return "ok"
+
+    def lider():
+        try:
+            cache.obtener_o_calcular("clave", falla)
+        except RuntimeError as error:
+            errores.append(error)
+
+    def esperar():
+        resultados.append(cache.obtener_o_calcular("clave", reintentar))
+
+    hilo_lider = threading.Thread(target=lider)
+    hilo_lider.start()
+    lider_calculando.wait()
+    hilos = [threading.Thread(target=esperar) for _ in range(6)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in [hilo_lider, *hilos]:
+        hilo.join()
+    assert len(errores) == 1
+    assert len(reintentos) == 1
+    assert resultados == ["ok"] * 6
+
+
+def test_parquet_sobrevive_a_un_cache_nuevo(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"producto": ["A", "B"], "ventas": [10, 20]})
+    primero = CacheCompartido(directorio=tmp_path)
+    primero.derivar("tabla", lambda d: d.assign(doble=d["ventas"] * 2), df)
+    # Solo el archivo final: el temporal se renombró de forma atómica
+    assert [ruta.suffix for ruta in tmp_path.iterdir()] == [".parquet"]
+
+    segundo = CacheCompartido(directorio=tmp_path)
+    valor = segundo.derivar("tabla", lambda d: pytest.fail("no debería recalcular"), df)
+    assert valor["doble"].tolist() == [20, 40]
+    assert segundo.estadisticas()["lecturas_disco"] == 1
+
+
+def test_escritura_fallida_no_deja_temporales(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+
+    def falla(*_):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr("core.cache.os.replace", falla)
+    cache = CacheCompartido(directorio=tmp_path)
+    valor = cache.derivar("tabla", lambda: pd.DataFrame({"x": [1]}))
+    assert valor["x"].tolist() == [1]
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,83 @@
+from dataclasses import replace
+
+import pandas as pd
+
+from core.datos import Datasets
+from core.filtros import ClaveFiltros
+from core.simulador import get_inventory_data, get_sales_data
+
+
+CLAVE = ClaveFiltros.desde_dict({
+    "dates": {"fecha_inicio": "2026-02-01", "fecha_fin": "2026-02-10"},
+    "stores": [101, 201, 301],
+    "products": [],
+    "categories": [],
+})
+
+
+class FuenteViva:
+    """
+    Fuente cuyos datos cambian entre cargas, como una base SQL que recibe filas
+    """
+
+    def __init__(self):
+        self.version = 0
+
+    def ventas(self, filtros):
+        return get_sales_data(filtros, seed=self.version)
+
+    def inventario(self, filtros):
+        return get_inventory_data(filtros, seed=self.version)
+
+
+def _recargar(datasets, fuente):
+    # Expira lo cacheado y cambia los datos de la fuente
+    fuente.version += 1
+    datasets.caches["ventas"].limpiar()
+    datasets.caches["ventas_dias"].particiones.limpiar()
+    datasets.caches["inventario"].limpiar()
+
+
+def _esperado(df, tienda):
+    return df[df["tienda_id"] == tienda].reset_index(drop=True)
+
+
+def _comparar(obtenido, esperado):
+    pd.testing.assert_frame_equal(
+        obtenido.astype({c: str for c in obtenido.select_dtypes("category").columns}),
+        esperado.astype({c: str for c in esperado.select_dtypes("category").columns})
+    )
+
+
+# ============= DATASET + ÍNDICE EN UNA ENTRADA =============
+def test_recarga_trae_su_propio_indice():
+    fuente = FuenteViva()
+    datasets = Datasets(fuente)
+    viejo = datasets.indexado("ventas", CLAVE)
+    viejo.indice
+    _recargar(datasets, fuente)
+    nuevo = datasets.indexado("ventas", CLAVE)
+
+    assert nuevo is not viejo and len(nuevo.df) != len(viejo.df)
+    assert nuevo.indice.contar(CLAVE.seleccion()) == len(nuevo.df)
+    una_tienda = replace(CLAVE, tiendas=(201,))
+    _comparar(nuevo.filtrar(una_tienda), _esperado(nuevo.df, 201))
+    # Quien todavía tenga la carga anterior sigue viendo filas e índice coherentes
+    _comparar(viejo.filtrar(una_tienda), _esperado(viejo.df, 201))
+
+
+def test_ventas_e_indexado_son_la_misma_carga():
+    datasets = Datasets(FuenteViva())
+    indexado = datasets.indexado("ventas", CLAVE)
+    assert datasets.ventas(CLAVE) is indexado.df
+    assert datasets.indexado("inventario", CLAVE).df is datasets.inventario(CLAVE)
+
+
+def test_indice_y_filtrados_se_arman_una_vez():
+    datasets = Datasets(FuenteViva())
+    indexado = datasets.indexado("inventario", CLAVE)
+    assert indexado.indice is indexado.indice
+    una_tienda = replace(CLAVE, tiendas=(101,))
+    assert indexado.filtrar(una_tienda) is indexado.filtrar(una_tienda)
+    assert indexado.filtrar(CLAVE) is indexado.df
+    _comparar(indexado.filtrar(una_tienda), _esperado(indexado.df, 101))
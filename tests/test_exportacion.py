@@ -0,0 +1,67 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from core.esquema import normalizar_ventas
+from core.exportacion import exportar, exportar_bytes, formatos_disponibles
+from core.simulador import get_sales_data
+
+
+@pytest.fixture
+def df_ventas():
+    return get_sales_data({
+        "dates": {"fecha_inicio": "2026-02-01", "fecha_fin": "2026-02-10"},
+        "stores": [101, 201, 301],
+        "products": ["BOLSO EPONA - BLACK/GOLD - UNICA", "CARTERA MINIMAL - BLACK - S"],
+        "categories": [],
+    })
+
+
+# ============= IDA Y VUELTA POR FORMATO =============
+# Bloques chicos a propósito: el resultado no debe depender del corte
+@pytest.mark.parametrize("filas_por_bloque", [7, 1_000])
+def test_csv(df_ventas, filas_por_bloque):
+    contenido = exportar_bytes(df_ventas, "CSV", filas_por_bloque)
+    assert contenido.count(b"fecha,producto") == 1
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(contenido)), df_ventas, check_dtype=False)
+
+
+@pytest.mark.parametrize("filas_por_bloque", [7, 1_000])
+def test_csv_gzip(df_ventas, filas_por_bloque):
+    contenido = exportar_bytes(df_ventas, "CSV (gzip)", filas_por_bloque)
+    assert gzip.decompress(contenido) == exportar_bytes(df_ventas, "CSV")
+    pd.testing.assert_frame_equal(
+        pd.read_csv(io.BytesIO(contenido), compression="gzip"), df_ventas, check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("filas_por_bloque", [7, 1_000])
+def test_parquet_conserva_tipos(df_ventas, filas_por_bloque):
+    pytest.importorskip("pyarrow")
+    df = normalizar_ventas(df_ventas)
+    contenido = exportar_bytes(df, "Parquet", filas_por_bloque)
+    pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(contenido)), df)
+
+
+@pytest.mark.parametrize("formato", formatos_disponibles())
+def test_tabla_vacia(df_ventas, formato):
+    vacio = df_ventas.iloc[0:0]
+    contenido = exportar_bytes(vacio, formato)
+    if formato == "Parquet":
+        leido = pd.read_parquet(io.BytesIO(contenido))
+    else:
+        leido = pd.read_csv(io.BytesIO(contenido), compression="gzip" if formato == "CSV (gzip)" else None)
+    assert list(leido.columns) == list(df_ventas.columns) and leido.empty
+
+
+def test_formato_desconocido(df_ventas):
+    with pytest.raises(ValueError):
+        exportar(df_ventas, "XLSX")
+
+
+def test_exportar_devuelve_archivo_al_inicio(df_ventas):
+    with exportar(df_ventas, "CSV") as archivo:
+        assert archivo.tell() == 0
+        assert archivo.read() == exportar_bytes(df_ventas, "CSV")
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.esquema import normalizar_inventario, normalizar_ventas
+from core.filtros import ClaveFiltros, IndiceFiltros, filtrar, indice_filtros
+from core.simulador import catalogo_sintetico, get_inventory_data, get_sales_data
+
+
+FILTROS = {
+    "dates": {"fecha_inicio": "2026-02-01", "fecha_fin": "2026-02-10"},
+    "stores": [301, 101, 201],
+    "products": ["B", "A"],
+    "categories": [],
+}
+
+
+# ============= CLAVE CANÓNICA =============
+def test_orden_y_duplicados_dan_la_misma_clave():
+    otra = {**FILTROS, "stores": [101, 201, 301, 101], "products": ["A", "B", "B"]}
+    assert ClaveFiltros.desde_dict(FILTROS) == ClaveFiltros.desde_dict(otra)
+    assert hash(ClaveFiltros.desde_dict(FILTROS)) == hash(ClaveFiltros.desde_dict(otra))
+
+
+def test_listas_vacias_o_ausentes():
+    clave = ClaveFiltros.desde_dict({"dates": FILTROS["dates"], "stores": None})
+    assert (clave.tiendas, clave.productos, clave.categorias) == ((), (), ())
+
+
+def test_a_dict_ida_y_vuelta():
+    clave = ClaveFiltros.desde_dict(FILTROS)
+    assert clave.a_dict()["stores"] == [101, 201, 301]
+    assert ClaveFiltros.desde_dict(clave.a_dict()) == clave
+
+
+def test_sin_fechas_conserva_la_seleccion():
+    clave = ClaveFiltros.desde_dict(FILTROS)
+    otra = ClaveFiltros.desde_dict({**FILTROS, "dates": {"fecha_inicio": "2026-03-01", "fecha_fin": "2026-03-02"}})
+    assert clave != otra
+    assert clave.sin_fechas() == otra.sin_fechas()
+
+
+def test_es_inmutable():
+    with pytest.raises(AttributeError):
+        ClaveFiltros.desde_dict(FILTROS).tiendas = (1,)
+
+
+def test_seleccion_de_la_clave():
+    seleccion = ClaveFiltros.desde_dict(FILTROS).seleccion()
+    assert seleccion["fecha"] == slice("2026-02-01", "2026-02-10")
+    assert seleccion["tienda_id"] == (101, 201, 301)
+    assert seleccion["categoria"] == ()
+
+
+# ============= ÍNDICE DE FILTROS =============
+@pytest.fixture(scope="module")
+def ventas():
+    productos, tiendas = catalogo_sintetico(12, 5)
+    # Dos familias de productos para tener más de una categoría
+    productos = [p.replace("PRODUCTO", "BOLSO" if i % 3 else "MOCHILA") for i, p in enumerate(productos)]
+    df = normalizar_ventas(get_sales_data({
+        "dates": {"fecha_inicio": "2026-02-01", "fecha_fin": "2026-02-20"},
+        "stores": tiendas, "products": productos, "categories": [],
+    }))
+    # 65+ filas por combinación y un total que no es múltiplo de 64: cruza los bordes de palabra
+    assert len(df) % 64
+    return df.assign(categoria=df["producto"].astype(str).str.split().str[0])
+
+
+def _mascara(df, seleccion):
+    mascara = np.ones(len(df), dtype=bool)
+    for dimension, valores in seleccion.items():
+        if isinstance(valores, slice):
+            if valores.start is not None:
+                mascara &= df[dimension].between(valores.start, valores.stop).to_numpy()
+        elif valores:
+            mascara &= df[dimension].isin(valores).to_numpy()
+    return mascara
+
+
+def _indice(ventas):
+    return IndiceFiltros(ventas, ["fecha", "categoria", "tienda_id", "producto"])
+
+
+def test_seleccion_vacia_es_todo(ventas):
+    indice = _indice(ventas)
+    for seleccion in ({}, {"tienda_id": []}, {"producto": None}, {"fecha": slice(None, None)}):
+        assert indice.contar(seleccion) == len(ventas)
+        assert indice.posiciones(seleccion).tolist() == list(range(len(ventas)))
+    conteos = indice.conteos({})
+    for dimension in ("categoria", "tienda_id", "producto"):
+        assert conteos[dimension].to_dict() == ventas[dimension].value_counts().to_dict()
+
+
+def test_una_dimension(ventas):
+    indice = _indice(ventas)
+    for seleccion in (
+        {"tienda_id": [201]},
+        {"tienda_id": [101, 501]},
+        {"producto": [ventas["producto"].iloc[0]]},
+        {"categoria": ["MOCHILA"]},
+        {"fecha": slice("2026-02-05", "2026-02-07")},
+    ):
+        esperado = np.flatnonzero(_mascara(ventas, seleccion))
+        assert indice.posiciones(seleccion).tolist() == esperado.tolist(), seleccion
+        assert indice.contar(seleccion) == len(esperado)
+
+
+def test_valores_inexistentes_y_rangos_vacios(ventas):
+    indice = _indice(ventas)
+    assert indice.contar({"tienda_id": [999]}) == 0
+    assert indice.contar({"fecha": slice("2027-01-01", "2027-01-31")}) == 0
+    assert indice.posiciones({"producto": ["NO EXISTE"]}).tolist() == []
+
+
+def test_conteos_cruzados(ventas):
+    indice = _indice(ventas)
+    seleccion = {
+        "fecha": slice("2026-02-03", "2026-02-12"),
+        "categoria": ["BOLSO"],
+        "tienda_id": [101, 301],
+        "producto": [],
+    }
+    assert indice.contar(seleccion) == _mascara(ventas, seleccion).sum()
+    conteos = indice.conteos(seleccion)
+    # Cada opción cuenta con los filtros de las otras dimensiones, no con el de la suya
+    for dimension in ("categoria", "tienda_id", "producto"):
+        otras = {**seleccion, dimension: []}
+        esperado = ventas[_mascara(ventas, otras)][dimension].value_counts()
+        obtenido = conteos[dimension]
+        assert obtenido[obtenido > 0].to_dict() == esperado[esperado > 0].to_dict(), dimension
+    por_dia = ventas[_mascara(ventas, {**seleccion, "fecha": slice(None, None)})]["fecha"].value_counts()
+    assert conteos["fecha"][conteos["fecha"] > 0].to_dict() == por_dia.to_dict()
+
+
+def test_dimensiones_no_indexadas_se_ignoran(ventas):
+    indice = IndiceFiltros(ventas, ["tienda_id"])
+    assert indice.contar({"tienda_id": [201], "fecha": slice("2026-02-01", "2026-02-01")}) == (ventas["tienda_id"] == 201).sum()
+
+
+def test_filtrar_ventas_e_inventario():
+    filtros = {**FILTROS, "products": ["BOLSO EPONA - BLACK/GOLD - UNICA", "CARTERA MINIMAL - BLACK - S",
+                                       "MOCHILA URBAN - GREY - UNICA"]}
+    cargada = ClaveFiltros.desde_dict(filtros)
+    clave = ClaveFiltros.desde_dict({
+        **filtros, "dates": {"fecha_inicio": "2026-02-04", "fecha_fin": "2026-02-06"},
+        "stores": [201], "categories": ["BOLSO", "CARTERA"],
+    })
+    ventas = normalizar_ventas(get_sales_data(cargada.a_dict()))
+    filtradas = filtrar(ventas, indice_filtros(ventas), clave)
+    # Igual a pedirle a la fuente la selección (el simulador responde por identidad)
+    directas = normalizar_ventas(get_sales_data({**clave.a_dict(), "products": filtros["products"][:2]}))
+    pd.testing.assert_frame_equal(filtradas, directas, check_categorical=False)
+    assert list(filtradas["producto"].cat.categories) == sorted(filtros["products"][:2])
+
+    inventario = normalizar_inventario(get_inventory_data(cargada.a_dict()))
+    filtrado = filtrar(inventario, indice_filtros(inventario), clave)
+    assert filtrado["tienda_id"].unique().tolist() == [201]
+    assert len(filtrado) == 2
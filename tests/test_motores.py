@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.cubo import DIMENSIONES_BASE, METRICAS, ROLLUPS, construir_cubo
+from core.esquema import normalizar_ventas
+from core.motores import MOTORES, MotorPandas, crear_motor
+from core.simulador import catalogo_sintetico, get_sales_data
+
+
+@pytest.fixture(scope="module")
+def df_ventas():
+    productos, tiendas = catalogo_sintetico(30, 6)
+    return normalizar_ventas(get_sales_data({
+        "dates": {"fecha_inicio": "2026-02-01", "fecha_fin": "2026-02-20"},
+        "stores": tiendas,
+        "products": productos,
+        "categories": [],
+    }))
+
+
+def _motor(nombre):
+    if not MOTORES[nombre][1]():
+        pytest.skip(f"{nombre} no está instalado")
+    return crear_motor(nombre)
+
+
+# ============= CADA MOTOR CONTRA PANDAS =============
+@pytest.mark.parametrize("nombre", list(MOTORES))
+@pytest.mark.parametrize("dimensiones", [DIMENSIONES_BASE, *ROLLUPS.values()], ids=["base", *ROLLUPS])
+def test_igual_a_pandas(nombre, dimensiones, df_ventas):
+    motor = _motor(nombre)
+    assert motor.nombre == nombre
+    pd.testing.assert_frame_equal(
+        motor.sumar(df_ventas, dimensiones, METRICAS),
+        MotorPandas().sumar(df_ventas, dimensiones, METRICAS),
+        check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("nombre", list(MOTORES))
+def test_cubo_completo_igual_a_pandas(nombre, df_ventas):
+    cubo, esperado = construir_cubo(df_ventas, _motor(nombre)), construir_cubo(df_ventas)
+    for campo in ["base", *ROLLUPS]:
+        pd.testing.assert_frame_equal(getattr(cubo, campo), getattr(esperado, campo), check_dtype=False, obj=campo)
+    pd.testing.assert_frame_equal(cubo.matriz, esperado.matriz, check_dtype=False)
+
+
+@pytest.mark.parametrize("nombre", list(MOTORES))
+def test_nulos_y_tabla_vacia(nombre, df_ventas):
+    motor = _motor(nombre)
+    con_nulos = df_ventas.head(50).copy()
+    con_nulos.loc[con_nulos.index[:5], "producto"] = np.nan
+    for df in (con_nulos, df_ventas.iloc[0:0]):
+        pd.testing.assert_frame_equal(
+            motor.sumar(df, ["producto"], METRICAS),
+            MotorPandas().sumar(df, ["producto"], METRICAS),
+            check_dtype=False, check_index_type=False
+        )
+
+
+# ============= SELECCIÓN =============
+def test_auto_elige_uno_disponible():
+    assert crear_motor("auto").nombre in MOTORES
+
+
+def test_nombre_desconocido():
+    with pytest.raises(ValueError):
+        crear_motor("spark")
+
+
+def test_no_instalado_cae_a_pandas(monkeypatch):
+    monkeypatch.setitem(MOTORES, "duckdb", (MOTORES["duckdb"][0], lambda: False))
+    assert isinstance(crear_motor("duckdb"), MotorPandas)
@@ -0,0 +1,77 @@
+import json
+
+from core.perfil import Ejecucion, HistorialPerfil, linea_jsonl
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class Cache:
+    def __init__(self):
+        self.aciertos = 0
+        self.fallos = 0
+
+
+def _ejecucion(reloj, caches=None):
+    return Ejecucion(caches=caches, reloj=reloj, memoria=lambda: 0)
+
+
+# ============= EJECUCIÓN =============
+def test_tramos_anidados_en_orden():
+    reloj = Reloj()
+    ejecucion = _ejecucion(reloj)
+    with ejecucion.tramo("carga"):
+        reloj.ahora += 0.1
+        with ejecucion.tramo("ventas"):
+            reloj.ahora += 0.2
+    with ejecucion.tramo("cubo"):
+        reloj.ahora += 0.3
+    ejecucion.cerrar()
+    assert [(t["tramo"], t["nivel"], round(t["ms"])) for t in ejecucion.tramos] == [
+        ("carga", 0, 300), ("carga/ventas", 1, 200), ("cubo", 0, 300)
+    ]
+    assert round(ejecucion.ms_total) == 600
+
+
+def test_cerrar_dentro_de_un_tramo_lo_mide_hasta_ahi():
+    # Lo que pasa con st.stop() dentro de un tramo: se cierra antes de salir del bloque
+    reloj = Reloj()
+    ejecucion = _ejecucion(reloj)
+    try:
+        with ejecucion.tramo("carga"):
+            with ejecucion.tramo("ventas"):
+                reloj.ahora += 0.5
+                ejecucion.cerrar()
+                raise RuntimeError("detenido")
+    except RuntimeError:
+        pass
+    reloj.ahora += 10
+    assert ejecucion.cerrada
+    assert [round(t["ms"]) for t in ejecucion.tramos] == [500, 500]
+    assert round(ejecucion.ms_total) == 500
+
+
+def test_aciertos_y_fallos_del_rerun():
+    cache = Cache()
+    cache.aciertos, cache.fallos = 5, 2
+    ejecucion = _ejecucion(Reloj(), caches={"ventas": cache, "sin_contadores": object()})
+    cache.aciertos += 3
+    cache.fallos += 1
+    ejecucion.cerrar()
+    assert ejecucion.cache == {"ventas": {"aciertos": 3, "fallos": 1}}
+
+
+# ============= HISTORIAL =============
+def test_historial_acotado_y_jsonl():
+    historial = HistorialPerfil(max_ejecuciones=2)
+    for _ in range(3):
+        historial.agregar(_ejecucion(Reloj()))
+    assert len(historial.ejecuciones) == 2
+    lineas = historial.a_jsonl().splitlines()
+    assert len(lineas) == 2 and json.loads(lineas[0])["tipo"] == "rerun"
+    assert json.loads(linea_jsonl(historial.ejecuciones[0]))["ms_total"] == 0
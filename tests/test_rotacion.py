@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.rotacion import DIAS_SIN_VENTAS, _redondear, calcular_rotacion
+
+
+# ============= IMPLEMENTACIÓN ORIGINAL (REFERENCIA) =============
+def calcular_rotacion_fila_a_fila(df_ventas, df_inventario, dias_periodo):
+    """
+    calcular_rotacion tal como estaba en app.py, con apply por fila
+    """
+    df_unidades = df_ventas.groupby(['producto', 'tienda_nombre'])['transacciones'].sum().reset_index()
+    df_unidades.rename(columns={'transacciones': 'unidades_vendidas'}, inplace=True)
+    df_rotacion = df_inventario.merge(df_unidades, on=['producto', 'tienda_nombre'], how='left')
+    df_rotacion['unidades_vendidas'] = df_rotacion['unidades_vendidas'].fillna(0)
+    df_rotacion['venta_diaria_promedio'] = (df_rotacion['unidades_vendidas'] / dias_periodo).round(2)
+    df_rotacion['dias_inventario'] = df_rotacion.apply(
+        lambda row: round(row['stock_actual'] / row['venta_diaria_promedio'], 1)
+        if row['venta_diaria_promedio'] > 0 else 999,
+        axis=1
+    )
+    df_rotacion['indice_rotacion'] = df_rotacion.apply(
+        lambda row: round(row['unidades_vendidas'] / row['stock_actual'], 2)
+        if row['stock_actual'] > 0 else 0,
+        axis=1
+    )
+
+    def clasificar_stock(row):
+        if row['stock_actual'] == 0:
+            return "SIN STOCK"
+        elif row['stock_actual'] < row['stock_minimo']:
+            return "CRÍTICO"
+        elif row['stock_actual'] >= row['stock_maximo']:
+            return "EXCESO"
+        else:
+            return "NORMAL"
+
+    df_rotacion['nivel_stock'] = df_rotacion.apply(clasificar_stock, axis=1)
+    df_rotacion['cantidad_reponer'] = df_rotacion.apply(
+        lambda row: max(0, row['stock_maximo'] - row['stock_actual'])
+        if row['nivel_stock'] in ['SIN STOCK', 'CRÍTICO'] else 0,
+        axis=1
+    )
+    df_rotacion['costo_reposicion'] = df_rotacion['cantidad_reponer'] * df_rotacion['costo_unitario']
+    return df_rotacion
+
+
+# ============= DATOS =============
+def _datos(rng, n_productos=40, tiendas=(101, 201, 301, 401), n_dias=7, prob_venta=0.6):
+    productos = [f"PRODUCTO {i:03d} - UNICA" for i in range(n_productos)]
+    celdas = pd.MultiIndex.from_product([productos, list(tiendas)], names=["producto", "tienda_id"]).to_frame(index=False)
+    n = len(celdas)
+    stock_minimo = rng.integers(5, 20, n)
+    stock_maximo = stock_minimo + rng.integers(0, 40, n)
+    df_inventario = celdas.assign(
+        tienda_nombre=[f"Tienda {tienda}" for tienda in celdas["tienda_id"]],
+        # Incluye a propósito ceros y valores justo en el mínimo y el máximo
+        stock_actual=np.select(
+            [rng.random(n) < 0.15, rng.random(n) < 0.15, rng.random(n) < 0.15],
+            [0, stock_minimo, stock_maximo],
+            default=rng.integers(0, 80, n)
+        ),
+        stock_minimo=stock_minimo,
+        stock_maximo=stock_maximo,
+        costo_unitario=rng.integers(50, 200, n),
+    )
+    df_inventario["valor_inventario"] = df_inventario["stock_actual"] * df_inventario["costo_unitario"]
+
+    dias = pd.date_range("2026-02-01", periods=n_dias).strftime("%Y-%m-%d")
+    df_ventas = pd.MultiIndex.from_product([dias, productos, list(tiendas)], names=["fecha", "producto", "tienda_id"]).to_frame(index=False)
+    df_ventas = df_ventas[rng.random(len(df_ventas)) < prob_venta].reset_index(drop=True)
+    df_ventas["tienda_nombre"] = [f"Tienda {tienda}" for tienda in df_ventas["tienda_id"]]
+    df_ventas["ventas"] = rng.integers(500, 4000, len(df_ventas))
+    df_ventas["transacciones"] = rng.integers(1, 30, len(df_ventas))
+    return df_ventas, df_inventario
+
+
+def _comparar(df_ventas, df_inventario, dias_periodo):
+    nuevo = calcular_rotacion(df_ventas, df_inventario, dias_periodo)
+    referencia = calcular_rotacion_fila_a_fila(df_ventas, df_inventario, dias_periodo)
+    for columna in ["unidades_vendidas", "venta_diaria_promedio", "dias_inventario", "indice_rotacion",
+                    "cantidad_reponer", "costo_reposicion"]:
+        np.testing.assert_array_equal(
+            nuevo[columna].to_numpy(dtype="float64"), referencia[columna].to_numpy(dtype="float64"), err_msg=columna
+        )
+    assert nuevo["nivel_stock"].astype(str).tolist() == referencia["nivel_stock"].tolist()
+    return nuevo
+
+
+# ============= REGRESIÓN CONTRA apply =============
+@pytest.mark.parametrize("semilla", range(5))
+@pytest.mark.parametrize("dias_periodo", [1, 7, 30])
+def test_igual_a_la_version_fila_a_fila(semilla, dias_periodo):
+    df_ventas, df_inventario = _datos(np.random.default_rng(semilla))
+    _comparar(df_ventas, df_inventario, dias_periodo)
+
+
+def test_sin_ventas_da_el_centinela():
+    df_ventas, df_inventario = _datos(np.random.default_rng(0), prob_venta=0)
+    nuevo = _comparar(df_ventas, df_inventario, 7)
+    assert (nuevo["dias_inventario"] == DIAS_SIN_VENTAS).all()
+    assert (nuevo["unidades_vendidas"] == 0).all()
+
+
+def test_casos_limite_de_clasificacion():
+    df_ventas, df_inventario = _datos(np.random.default_rng(1), n_productos=1, tiendas=(101, 201, 301, 401, 501))
+    # Stock 0, justo en el mínimo, justo en el máximo, uno debajo del mínimo, entre ambos
+    df_inventario["stock_minimo"] = 10
+    df_inventario["stock_maximo"] = 40
+    df_inventario["stock_actual"] = [0, 10, 40, 9, 25]
+    nuevo = _comparar(df_ventas, df_inventario, 7)
+    assert nuevo["nivel_stock"].astype(str).tolist() == ["SIN STOCK", "NORMAL", "EXCESO", "CRÍTICO", "NORMAL"]
+    assert nuevo["cantidad_reponer"].tolist() == [40, 0, 0, 31, 0]
+    assert nuevo.loc[0, "indice_rotacion"] == 0
+
+
+def test_solo_tiendas_sin_stock_ni_ventas():
+    df_ventas, df_inventario = _datos(np.random.default_rng(2), prob_venta=0)
+    df_inventario["stock_actual"] = 0
+    nuevo = _comparar(df_ventas, df_inventario.assign(valor_inventario=0), 7)
+    assert (nuevo["nivel_stock"] == "SIN STOCK").all()
+
+
+# ============= REDONDEO =============
+def test_redondear_igual_a_round_en_empates():
+    # Empates binarios exactos y casi-empates decimales donde np.round difiere de round()
+    valores = np.array([0.5, 1.5, 2.5, -0.5, 0.125, 0.375, 2.675, 1.005, 0.045, 10.05, 3.15, 1e-9, 999.95])
+    for decimales in (0, 1, 2):
+        esperado = [round(float(v), decimales) for v in valores]
+        assert _redondear(valores.copy(), decimales).tolist() == esperado
+
+
+def test_redondear_cocientes_aleatorios():
+    rng = np.random.default_rng(3)
+    stock = rng.integers(1, 200, 20_000).astype("float64")
+    venta = np.round(rng.integers(1, 3000, 20_000) / rng.integers(1, 31, 20_000), 2)
+    cocientes = stock / venta
+    assert _redondear(cocientes.copy(), 1).tolist() == [round(float(v), 1) for v in cocientes]
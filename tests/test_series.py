@@ -0,0 +1,168 @@
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.cubo import construir_cubo
+from core.esquema import normalizar_ventas
+from core.series import SeriesDiarias
+from core.simulador import get_sales_data
+
+
+PRODUCTOS = [
+    "BOLSO EPONA - BLACK/GOLD - UNICA",
+    "CARTERA MINIMAL - BLACK - S",
+    "MOCHILA URBAN - GREY - UNICA",
+]
+TIENDAS = [101, 201]
+INICIO = date(2026, 2, 1)
+
+
+def _dia(n):
+    return (INICIO + timedelta(days=int(n))).isoformat()
+
+
+def _ventas(desde, hasta, productos=PRODUCTOS):
+    return normalizar_ventas(get_sales_data({
+        "dates": {"fecha_inicio": _dia(desde), "fecha_fin": _dia(hasta)},
+        "stores": TIENDAS,
+        "products": productos,
+        "categories": [],
+    }))
+
+
+def _comparar_cubos(obtenido, esperado):
+    for campo in ["base", "por_producto", "por_tienda", "por_fecha", "por_fecha_producto",
+                  "por_tienda_producto", "por_producto_tienda"]:
+        a, b = getattr(obtenido, campo), getattr(esperado, campo)
+        pd.testing.assert_frame_equal(
+            a.astype({c: str for c in a.select_dtypes("category").columns}).reset_index(drop=True),
+            b.astype({c: str for c in b.select_dtypes("category").columns}).reset_index(drop=True),
+            check_dtype=False, obj=campo
+        )
+    pd.testing.assert_frame_equal(obtenido.matriz, esperado.matriz, check_dtype=False, check_names=False,
+                                  check_categorical=False, check_index_type=False, check_column_type=False)
+
+
+def _cubo_directo(desde, hasta):
+    return construir_cubo(_ventas(desde, hasta))
+
+
+# ============= RANGOS DESDE LOS ACUMULADOS =============
+def test_ventanas_aleatorias_igual_a_construir_cubo():
+    series = SeriesDiarias()
+    series.extender(_ventas(0, 29), _dia(0), _dia(29))
+    rng = np.random.default_rng(0)
+    for _ in range(8):
+        desde, hasta = sorted(rng.integers(0, 30, 2))
+        assert series.cubre(_dia(desde), _dia(hasta))
+        _comparar_cubos(series.cubo(_dia(desde), _dia(hasta)), _cubo_directo(desde, hasta))
+
+
+def test_fuera_de_lo_cargado():
+    series = SeriesDiarias()
+    series.extender(_ventas(5, 9), _dia(5), _dia(9))
+    assert not series.cubre(_dia(4), _dia(9))
+    assert not series.cubre(_dia(5), _dia(10))
+    with pytest.raises(KeyError):
+        series.totales(_dia(4), _dia(9))
+
+
+# ============= EXTENSIONES =============
+def test_anexar_dias_siguientes():
+    series = SeriesDiarias()
+    series.extender(_ventas(0, 9), _dia(0), _dia(9))
+    series.extender(_ventas(10, 14), _dia(10), _dia(14))
+    _comparar_cubos(series.cubo(_dia(0), _dia(14)), _cubo_directo(0, 14))
+    _comparar_cubos(series.cubo(_dia(8), _dia(12)), _cubo_directo(8, 12))
+
+
+def test_anteponer_dias_previos():
+    series = SeriesDiarias()
+    series.extender(_ventas(10, 19), _dia(10), _dia(19))
+    series.extender(_ventas(3, 9), _dia(3), _dia(9))
+    _comparar_cubos(series.cubo(_dia(3), _dia(19)), _cubo_directo(3, 19))
+
+
+def test_hueco_entre_rangos():
+    series = SeriesDiarias()
+    series.extender(_ventas(0, 4), _dia(0), _dia(4))
+    series.extender(_ventas(10, 14), _dia(10), _dia(14))
+    # Los días del hueco no están cargados: no se confunden con días sin ventas
+    assert series.cubre(_dia(10), _dia(14))
+    assert not series.cubre(_dia(0), _dia(14))
+    assert not series.cubre(_dia(5), _dia(9))
+    _comparar_cubos(series.cubo(_dia(10), _dia(14)), _cubo_directo(10, 14))
+
+    series.extender(_ventas(5, 9), _dia(5), _dia(9))
+    assert series.cubre(_dia(0), _dia(14))
+    _comparar_cubos(series.cubo(_dia(0), _dia(14)), _cubo_directo(0, 14))
+
+
+def test_extender_con_dias_solapados_no_duplica():
+    series = SeriesDiarias()
+    series.extender(_ventas(0, 9), _dia(0), _dia(9))
+    series.extender(_ventas(5, 14), _dia(5), _dia(14))
+    _comparar_cubos(series.cubo(_dia(0), _dia(14)), _cubo_directo(0, 14))
+
+
+def test_series_nuevas_en_dias_siguientes():
+    series = SeriesDiarias()
+    series.extender(_ventas(0, 4, PRODUCTOS[:2]), _dia(0), _dia(4))
+    series.extender(_ventas(5, 9), _dia(5), _dia(9))
+    esperado = construir_cubo(pd.concat([_ventas(0, 4, PRODUCTOS[:2]), _ventas(5, 9)]).pipe(normalizar_ventas))
+    _comparar_cubos(series.cubo(_dia(0), _dia(9)), esperado)
+
+
+# ============= CONCURRENCIA =============
+class _LecturasContadas(SeriesDiarias):
+    """
+    Cuenta las lecturas de _estado: cada lectura puede ver un estado distinto
+    si otro hilo extiende la serie entre una y la siguiente
+    """
+
+    lecturas = 0
+
+    @property
+    def _estado(self):
+        self.lecturas += 1
+        return self.__dict__["_estado_real"]
+
+    @_estado.setter
+    def _estado(self, valor):
+        self.__dict__["_estado_real"] = valor
+
+
+@pytest.mark.parametrize("metodo", ["cubo", "totales"])
+def test_un_rango_lee_el_estado_una_vez(metodo):
+    series = _LecturasContadas()
+    series.extender(_ventas(0, 9), _dia(0), _dia(9))
+    series.lecturas = 0
+    getattr(series, metodo)(_dia(2), _dia(7))
+    assert series.lecturas == 1
+
+
+def test_cubrir_carga_una_sola_vez_con_sesiones_concurrentes():
+    series = SeriesDiarias()
+    cargas = []
+    barrera = threading.Barrier(4)
+
+    def cargar():
+        cargas.append(1)
+        time.sleep(0.1)
+        return _ventas(0, 9), _dia(0), _dia(9)
+
+    def pedir():
+        barrera.wait()
+        series.cubrir(_dia(2), _dia(7), cargar)
+
+    hilos = [threading.Thread(target=pedir) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(cargas) == 1
+    _comparar_cubos(series.cubo(_dia(2), _dia(7)), _cubo_directo(2, 7))
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.variantes import expandir_variantes
+
+
+# ============= DATOS =============
+def _tabla_base(tiendas, seed=0):
+    rng = np.random.default_rng(seed)
+    n = len(tiendas)
+    return pd.DataFrame({
+        "tienda_id": tiendas,
+        "tienda_nombre": [f"Tienda {tienda}" for tienda in tiendas],
+        "producto": "BOLSO EPONA - BLACK/GOLD - UNICA",
+        "stock_actual": rng.integers(0, 50, n),
+        "transacciones": rng.integers(0, 30, n),
+        "ventas": rng.integers(0, 4000, n),
+        "unidades_vendidas": rng.integers(0, 30, n),
+        "indice_rotacion": rng.uniform(0, 3, n).round(2),
+    })
+
+
+def _filas_tienda(df, tienda_id):
+    return df[df["Tienda"] == f"Tienda {tienda_id}"].reset_index(drop=True)
+
+
+# ============= REPARTO POR TIENDA =============
+@pytest.mark.parametrize("quitada", [101, 201, 301])
+def test_quitar_una_tienda_no_cambia_las_demas(quitada):
+    df_base = _tabla_base([101, 201, 301])
+    completa = expandir_variantes(df_base, 1)
+    parcial = expandir_variantes(df_base[df_base["tienda_id"] != quitada], 1)
+
+    assert f"Tienda {quitada}" not in set(parcial["Tienda"])
+    for tienda in {101, 201, 301} - {quitada}:
+        pd.testing.assert_frame_equal(_filas_tienda(parcial, tienda), _filas_tienda(completa, tienda))
+
+
+def test_orden_de_entrada_no_cambia_el_reparto():
+    df_base = _tabla_base([101, 201, 301, 401])
+    pd.testing.assert_frame_equal(
+        expandir_variantes(df_base, 7),
+        expandir_variantes(df_base.iloc[::-1], 7)
+    )
+
+
+def test_variantes_suman_el_total_de_la_tienda():
+    df_base = _tabla_base(list(range(101, 2001, 100)), seed=3)
+    df = expandir_variantes(df_base, 12, n_variantes=4)
+    sumas = df.groupby("Tienda", sort=False)[["Stock", "Ventas", "Ventas $", "Compras"]].sum()
+    esperado = df_base.set_index("tienda_nombre")[["stock_actual", "transacciones", "ventas", "unidades_vendidas"]]
+    np.testing.assert_array_equal(sumas.loc[esperado.index].to_numpy(), esperado.to_numpy())
+
+
+def test_productos_distintos_reparten_distinto():
+    df_base = _tabla_base([101, 201, 301])
+    assert not expandir_variantes(df_base, 1)["Stock"].equals(expandir_variantes(df_base, 2)["Stock"])
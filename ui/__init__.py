@@ -0,0 +1,3 @@
+"""
+Componentes de Streamlit reutilizados por las secciones del dashboard
+"""
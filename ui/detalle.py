@@ -0,0 +1,146 @@
+import math
+
+import streamlit as st
+
+from core.busqueda import IndiceCodigos
+from core.variantes import catalogo_codigos, tabla_detallada_producto
+from ui.perfil import perfilado, tramo
+from ui.tablas import tabla_paginada
+
+
+# ============= DETALLE POR PRODUCTO =============
+@st.fragment
+@perfilado("detalle_producto")
+def render_tabla_producto(idx, producto, df_rotacion, df_tiendas_prod, derivados=None):
+    """
+    Tabla por tienda y variante de un producto, con sus filtros.
+    Es un fragmento: cambiar sus filtros solo re-ejecuta este bloque.
+    Con derivados (CacheCompartido) la tabla se calcula una vez para todas las sesiones
+    """
+    # Datos de inventario y rotación de este producto, expandidos en 3 variantes (sizes)
+    with tramo("variantes"):
+        entradas = (df_rotacion, producto, df_tiendas_prod, idx)
+        if derivados is not None:
+            df_tabla_detallada = derivados.derivar("variantes", tabla_detallada_producto, *entradas)
+            indice = derivados.derivar("indice_codigos", IndiceCodigos, df_tabla_detallada["Código Producto"])
+        else:
+            df_tabla_detallada = tabla_detallada_producto(*entradas)
+            indice = IndiceCodigos(df_tabla_detallada["Código Producto"])
+    # ================= FILTROS TABLA DETALLADA =================
+    st.markdown("### Filtros")
+
+    colf1, colf2 = st.columns(2)
+
+    with colf1:
+        tiendas_disponibles = sorted(df_tabla_detallada["Tienda"].unique())
+        key_tiendas = f"tiendas_filter_{idx}_{producto}"  # Key única por producto
+        tiendas_seleccionadas = st.multiselect(
+            "Filtrar por Tienda",
+            options=tiendas_disponibles,
+            # Si ya hay estado guardado, no pisarlo con el default
+            default=None if key_tiendas in st.session_state else tiendas_disponibles,
+            key=key_tiendas
+        )
+
+    with colf2:
+        codigo_busqueda = st.text_input(
+            "Filtrar por Código",
+            placeholder="Ej: 001010",
+            key=f"codigo_filter_{idx}_{producto}"  # Key única por producto
+        )
+
+    # Aplicar filtros. La tabla ya viene ordenada por tienda y código y los
+    # filtros conservan ese orden: no hace falta reordenar
+    df_filtrado = df_tabla_detallada
+
+    if codigo_busqueda:
+        df_filtrado = df_filtrado.take(indice.buscar(codigo_busqueda))
+
+    if tiendas_seleccionadas:
+        df_filtrado = df_filtrado[
+            df_filtrado["Tienda"].isin(tiendas_seleccionadas)
+        ]
+
+    df_filtrado = df_filtrado.reset_index(drop=True)
+
+    # Mostrar tabla CON EL DATAFRAME FILTRADO (paginada)
+    tabla_paginada(
+        df_filtrado,
+        key=f"detalle_{idx}_{producto}",
+        gradiente=['Ventas $'],
+        cmap='YlGn',
+        column_config={
+            'Código Producto': st.column_config.TextColumn(
+                'Código Producto',
+                width='small'
+            ),
+            'Tienda': st.column_config.TextColumn(
+                'Tienda',
+                width='small'
+            ),
+            'Nombre Producto': st.column_config.TextColumn(
+                'Nombre Producto',
+                width='large'
+            ),
+            'Compras': st.column_config.NumberColumn(
+                'Compras',
+                help='Unidades compradas/recibidas',
+                format='%d'
+            ),
+            'Ventas': st.column_config.NumberColumn(
+                'Ventas',
+                help='Unidades vendidas',
+                format='%d'
+            ),
+            'Ventas $': st.column_config.NumberColumn(
+                'Ventas $',
+                help='Monto en dinero',
+                format='$%d'
+            ),
+            'Stock': st.column_config.NumberColumn(
+                'Stock',
+                format='%d'
+            ),
+            'Porcentaje Rotación': st.column_config.NumberColumn(
+                '% Rotación',
+                format='%.2f'
+            )
+        }
+    )
+
+
+# ============= BÚSQUEDA GLOBAL DE CÓDIGOS =============
+def render_busqueda_codigos(df_rotacion, df_productos, productos_por_pagina, derivados=None):
+    """
+    Busca un código de variante en todos los productos del detalle e indica
+    en qué producto, tienda y página de productos está
+    """
+    codigo = st.text_input(
+        "🔎 Buscar código en todos los productos",
+        placeholder="Ej: 001010",
+        key="detalle_codigo_global"
+    )
+    if not codigo:
+        return
+
+    with tramo("busqueda_codigos"):
+        if derivados is not None:
+            df_catalogo = derivados.derivar("catalogo_codigos", catalogo_codigos, df_rotacion, df_productos)
+            indice = derivados.derivar("indice_codigos", IndiceCodigos, df_catalogo["Código Producto"])
+        else:
+            df_catalogo = catalogo_codigos(df_rotacion, df_productos)
+            indice = IndiceCodigos(df_catalogo["Código Producto"])
+        df_encontrados = df_catalogo.take(indice.buscar(codigo)).reset_index(drop=True)
+
+    if df_encontrados.empty:
+        st.info(f"Ningún código contiene '{codigo.strip()}'")
+        return
+    df_encontrados["Página"] = [math.ceil(ranking / productos_por_pagina) for ranking in df_encontrados["ranking"]]
+    tabla_paginada(
+        df_encontrados.rename(columns={"ranking": "Ranking"}),
+        key="detalle_codigo_global",
+        column_config={
+            'Código Producto': st.column_config.TextColumn('Código Producto', width='small'),
+            'Ranking': st.column_config.NumberColumn('Ranking', format='#%d'),
+        }
+    )
@@ -0,0 +1,25 @@
+import streamlit as st
+
+from core.exportacion import FORMATOS, exportar_bytes, formatos_disponibles
+
+
+# ============= BOTÓN DE DESCARGA =============
+def boton_descarga(df, nombre, key, label="📥 Descargar"):
+    """
+    Selector de formato + st.download_button diferido: el archivo se genera
+    por bloques solo cuando el usuario hace clic, no en cada rerun.
+    df se usa tal cual (por ejemplo el DataFrame ya filtrado de la sección) y
+    nombre es el nombre del archivo sin extensión.
+    Límite: Streamlit no transmite la descarga por partes, la guarda completa
+    en su media storage. La memoria de una descarga es la del archivo final;
+    para exportaciones muy grandes conviene gzip o Parquet
+    """
+    formato = st.selectbox("Formato", options=formatos_disponibles(), key=f"descarga_{key}_formato")
+    st.download_button(
+        label=label,
+        data=lambda: exportar_bytes(df, formato),
+        file_name=f"{nombre}{FORMATOS[formato]['extension']}",
+        mime=FORMATOS[formato]["mime"],
+        key=f"boton_descarga_{key}",
+        on_click="ignore"
+    )
@@ -0,0 +1,101 @@
+from datetime import date
+
+import streamlit as st
+
+
+# Filtros de la barra lateral: (dimensión del índice, clave en el dict de filtros, etiqueta)
+FILTROS_LATERALES = [
+    ("categoria", "categories", "Categoría"),
+    ("tienda_id", "stores", "Tienda"),
+    ("producto", "products", "Producto"),
+]
+
+
+# ============= FILTROS DE LA BARRA LATERAL =============
+def _rango_fechas(filtros):
+    """
+    Rango elegido con el filtro por fecha, o el periodo de los filtros si está
+    desactivado
+    """
+    inicio = date.fromisoformat(filtros["dates"]["fecha_inicio"])
+    fin = date.fromisoformat(filtros["dates"]["fecha_fin"])
+    if st.sidebar.checkbox("Filtro por fecha", key="filtro_fecha_activo"):
+        rango = st.sidebar.date_input("Rango de fechas", value=(inicio, fin), key="filtro_fechas")
+        # Mientras se elige el rango el widget devuelve una sola fecha
+        if len(rango) == 2:
+            inicio, fin = rango
+    return inicio.isoformat(), fin.isoformat()
+
+
+def render_periodo(filtros):
+    """
+    Filtro por fecha, antes de cargar: devuelve (filtros con el rango elegido,
+    periodo a cargar). Un rango dentro del periodo ya cargado se resuelve con
+    los bitmaps por día; uno que se sale pasa a ser el nuevo periodo cargado,
+    así los periodos vecinos que precarga la app se pueden pedir
+    """
+    fecha_inicio, fecha_fin = _rango_fechas(filtros)
+    periodo = st.session_state.get("periodo_cargado")
+    if periodo is None or not (periodo[0] <= fecha_inicio and fecha_fin <= periodo[1]):
+        periodo = st.session_state["periodo_cargado"] = (fecha_inicio, fecha_fin)
+    rango = {"fecha_inicio": fecha_inicio, "fecha_fin": fecha_fin}
+    return {**filtros, "dates": rango}, {"fecha_inicio": periodo[0], "fecha_fin": periodo[1]}
+
+
+def render_filtros(filtros, indice, nombres_tienda):
+    """
+    Filtros de la barra lateral sobre los datos ya cargados, con el rango de
+    fechas ya elegido en render_periodo: cada filtro activado reemplaza su
+    valor. indice es el IndiceFiltros de esas ventas; con él cada opción
+    muestra cuántos registros quedan al elegirla (con los demás filtros
+    aplicados). Devuelve (filtros, registros que cumplen la combinación)
+    """
+    fecha_inicio, fecha_fin = filtros["dates"]["fecha_inicio"], filtros["dates"]["fecha_fin"]
+
+    activos = {}
+    for dimension, campo, etiqueta in FILTROS_LATERALES:
+        activos[dimension] = st.sidebar.checkbox(f"Filtro por {etiqueta.lower()}", key=f"filtro_{dimension}_activo")
+
+    # Selección vigente antes de dibujar: los conteos de cada filtro dependen de los demás
+    seleccion = {
+        dimension: st.session_state.get(f"filtro_{dimension}", filtros[campo]) if activos[dimension] else filtros[campo]
+        for dimension, campo, _ in FILTROS_LATERALES
+    }
+    seleccion["fecha"] = slice(fecha_inicio, fecha_fin)
+    conteos = indice.conteos(seleccion)
+
+    for dimension, campo, etiqueta in FILTROS_LATERALES:
+        if not activos[dimension]:
+            continue
+        opciones = indice.valores[dimension].tolist()
+        cantidades = conteos[dimension]
+        seleccion[dimension] = st.sidebar.multiselect(
+            etiqueta,
+            options=opciones,
+            default=None if f"filtro_{dimension}" in st.session_state else [
+                valor for valor in filtros[campo] if valor in opciones
+            ],
+            format_func=lambda valor, cantidades=cantidades, dimension=dimension: (
+                f"{nombres_tienda.get(valor, valor) if dimension == 'tienda_id' else valor} "
+                f"· {cantidades.get(valor, 0):,}"
+            ),
+            key=f"filtro_{dimension}"
+        )
+
+    # Las categorías también se traducen a sus productos, para mostrar la selección real
+    productos = list(seleccion["producto"])
+    if seleccion["categoria"]:
+        en_categorias = indice.conteos({**seleccion, "producto": None})["producto"]
+        candidatos = productos or indice.valores["producto"].tolist()
+        productos = [producto for producto in candidatos if en_categorias.get(producto, 0) > 0]
+
+    # Sin productos en las categorías elegidas no queda nada (una lista vacía sería "todos")
+    registros = indice.contar({**seleccion, "producto": productos}) if productos or not seleccion["categoria"] else 0
+    st.sidebar.caption(f"{registros:,} registros con estos filtros")
+    filtros_elegidos = {
+        "dates": {"fecha_inicio": fecha_inicio, "fecha_fin": fecha_fin},
+        "stores": list(seleccion["tienda_id"]),
+        "products": productos,
+        "categories": list(seleccion["categoria"]),
+    }
+    return filtros_elegidos, registros
@@ -0,0 +1,119 @@
+import functools
+import os
+from contextlib import contextmanager, nullcontext
+
+import streamlit as st
+
+from core.perfil import EJECUCIONES_HISTORIAL, Ejecucion, HistorialPerfil, guardar_jsonl
+
+
+# Si está definida, cada ejecución se agrega como una línea a este archivo JSON lines
+RUTA_JSONL = os.environ.get("DASHBOARD_PERFIL_JSONL")
+
+
+# ============= REGISTRO POR SESIÓN =============
+def _historial():
+    return st.session_state.setdefault("perfil_historial", HistorialPerfil(EJECUCIONES_HISTORIAL))
+
+
+def _ejecucion_abierta():
+    ejecucion = st.session_state.get("perfil_ejecucion")
+    return ejecucion if ejecucion is not None and not ejecucion.cerrada else None
+
+
+def iniciar_ejecucion(caches=None, tipo="rerun"):
+    """
+    Abre la medición del rerun. Si el anterior quedó abierto (una excepción
+    lo interrumpió) se descarta
+    """
+    st.session_state["perfil_ejecucion"] = Ejecucion(tipo=tipo, caches=caches)
+
+
+def cerrar_ejecucion():
+    ejecucion = _ejecucion_abierta()
+    if ejecucion is None:
+        return
+    _historial().agregar(ejecucion)
+    if RUTA_JSONL:
+        guardar_jsonl(ejecucion, RUTA_JSONL)
+
+
+def detener():
+    """
+    st.stop() que antes registra la ejecución en curso: los reruns que
+    terminan antes de tiempo también quedan en el historial y el JSON lines
+    """
+    cerrar_ejecucion()
+    st.stop()
+
+
+def tramo(nombre):
+    """
+    Mide un bloque dentro del rerun en curso (sin medición abierta no hace nada)
+    """
+    ejecucion = _ejecucion_abierta()
+    return ejecucion.tramo(nombre) if ejecucion is not None else nullcontext()
+
+
+def perfilado(nombre):
+    """
+    Decorador para fragmentos: dentro de un rerun completo es un tramo más; si
+    el fragmento se re-ejecuta solo, registra su propia ejecución
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with _tramo_o_ejecucion(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+@contextmanager
+def _tramo_o_ejecucion(nombre):
+    if _ejecucion_abierta() is not None:
+        with tramo(nombre):
+            yield
+        return
+    iniciar_ejecucion(tipo=f"fragmento {nombre}")
+    try:
+        with tramo(nombre):
+            yield
+    finally:
+        cerrar_ejecucion()
+
+
+# ============= PANEL =============
+def render_panel_perfil():
+    """
+    Panel opcional en la barra lateral con los últimos reruns de la sesión
+    """
+    if not st.sidebar.toggle("⏱️ Perfil de ejecución", key="perfil_panel"):
+        return
+    historial = _historial()
+    with st.sidebar.expander(f"Últimas {historial.ejecuciones.maxlen} ejecuciones", expanded=True):
+        st.dataframe(
+            historial.resumen(),
+            hide_index=True,
+            column_config={
+                "ms": st.column_config.NumberColumn("ms", format="%.0f"),
+                "MB": st.column_config.NumberColumn("Δ MB", format="%.1f"),
+            }
+        )
+        st.caption("Tramos de la última ejecución")
+        st.dataframe(
+            historial.tramos(),
+            hide_index=True,
+            column_config={
+                "ms": st.column_config.NumberColumn("ms", format="%.1f"),
+                "mb_delta": st.column_config.NumberColumn("Δ MB", format="%.1f"),
+            }
+        )
+        st.download_button(
+            "📥 Exportar JSON lines",
+            data=historial.a_jsonl,
+            file_name="perfil_ejecuciones.jsonl",
+            mime="application/jsonl",
+            key="boton_perfil_jsonl",
+            on_click="ignore"
+        )
@@ -0,0 +1,66 @@
+import streamlit as st
+
+from core.tablas import filtrar_texto, ordenar_pagina, total_paginas
+from ui.perfil import tramo
+
+
+SIN_ORDEN = "(orden original)"
+TAMANOS_PAGINA = [25, 50, 100, 250]
+
+
+# ============= TABLA PAGINADA =============
+def tabla_paginada(df, key, column_config=None, gradiente=None, cmap="YlGn",
+                   orden=SIN_ORDEN, ascendente=True, height="auto"):
+    """
+    st.dataframe paginado: búsqueda, orden y paginación se resuelven en el
+    servidor y al navegador solo viaja la página visible. El formato numérico va
+    por column_config y el degradé se calcula sobre la página, con la escala
+    de la columna completa para que los colores sean comparables entre páginas
+    """
+    opciones = [SIN_ORDEN] + list(df.columns)
+    # Valores iniciales vía session_state: el estado se conserva entre secciones
+    st.session_state.setdefault(f"tabla_{key}_orden", orden if orden in opciones else SIN_ORDEN)
+    st.session_state.setdefault(f"tabla_{key}_asc", ascendente)
+
+    col_buscar, col_orden, col_sentido, col_tamano, col_pagina = st.columns([3, 3, 1, 1, 1])
+    with col_buscar:
+        texto = st.text_input("Buscar", key=f"tabla_{key}_buscar", placeholder="Texto en cualquier columna")
+    with col_orden:
+        ordenar_por = st.selectbox("Ordenar por", options=opciones, key=f"tabla_{key}_orden")
+    with col_sentido:
+        asc = st.toggle("Asc.", key=f"tabla_{key}_asc")
+    with col_tamano:
+        tamano = st.selectbox("Filas", options=TAMANOS_PAGINA, key=f"tabla_{key}_tamano")
+
+    df_filtrado = filtrar_texto(df, texto)
+    paginas = total_paginas(len(df_filtrado), tamano)
+    with col_pagina:
+        pagina = st.number_input("Página", min_value=1, max_value=paginas, step=1, key=f"tabla_{key}_pagina")
+
+    df_pagina = ordenar_pagina(
+        df_filtrado,
+        columna=None if ordenar_por == SIN_ORDEN else ordenar_por,
+        ascendente=asc,
+        pagina=pagina,
+        tamano=tamano
+    )
+
+    datos = df_pagina
+    if gradiente and not df_pagina.empty:
+        datos = df_pagina.style
+        for columna in gradiente:
+            datos = datos.background_gradient(
+                subset=[columna], cmap=cmap, vmin=df[columna].min(), vmax=df[columna].max()
+            )
+
+    inicio = (min(pagina, paginas) - 1) * tamano
+    st.caption(f"Filas {min(inicio + 1, len(df_filtrado)):,}–{inicio + len(df_pagina):,} de {len(df_filtrado):,}")
+    # Con degradé, aquí se renderiza el Styler
+    with tramo(f"tabla_{key}"):
+        st.dataframe(
+            datos,
+            use_container_width=True,
+            hide_index=True,
+            height=height,
+            column_config=column_config
+        )